@@ -17,7 +17,15 @@ import subprocess
 import time
 from pathlib import Path
 from urllib.parse import quote
-from urllib import request, error
+
+# Gemeinsamer GitHub-Client (skills/codex-bridge-main/scripts)
+import sys
+for _scripts in (Path(__file__).resolve().parent / "skills" / "codex-bridge-main" / "scripts",
+                 Path.home() / ".openclaw" / "skills" / "codex-bridge-main" / "scripts"):
+    if _scripts.is_dir():
+        sys.path.insert(0, str(_scripts))
+        break
+from github_client import client
 
 LOG_PATH = Path.home() / ".openclaw" / "codex_bridge_main.log"
 
@@ -55,30 +63,8 @@ def load_token():
     return ""
 
 def gh_api(method, path, token, body=None):
-    url = "https://api.github.com" + path
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "openclaw-codex-bridge-main",
-    }
-    data = None
-    if body is not None:
-        data = json.dumps(body).encode("utf-8")
-        headers["Content-Type"] = "application/json"
-    
-    req = request.Request(url, data=data, headers=headers, method=method)
-    try:
-        with request.urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8", errors="replace")
-            return resp.status, json.loads(raw) if raw else {}
-    except error.HTTPError as e:
-        raw = e.read().decode("utf-8", errors="replace")
-        try:
-            return e.code, json.loads(raw)
-        except Exception:
-            return e.code, {"message": raw[:500]}
-    except Exception as e:
-        return 0, {"message": str(e)}
+    """(status, data) über den geteilten Client (Keep-Alive, Retry, ETag)"""
+    return client(token).request(method, path, body)
 
 
 def api_get_ref(repo: str, token: str, branch: str):
@@ -473,28 +459,12 @@ def github_request(method, endpoint, data=None, token=None):
         token = load_token()
     if not token:
         return {"error": "No GitHub token"}
-    
-    import urllib.request
-    import urllib.parse
-    
-    url = f"https://api.github.com{endpoint}"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json",
-        "Content-Type": "application/json"
-    }
-    
-    req = urllib.request.Request(url, headers=headers, method=method)
-    if data:
-        req.data = json.dumps(data).encode("utf-8")
-    
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            return {"status": resp.status, "data": json.loads(resp.read().decode("utf-8"))}
-    except urllib.error.HTTPError as e:
-        return {"error": f"HTTP {e.code}", "details": e.read().decode("utf-8")[:500]}
-    except Exception as e:
-        return {"error": str(e)}
+    status, body = client(token).request(method, endpoint, data)
+    if status == 0:
+        return {"error": body.get("message", "network error")}
+    if status < 400:
+        return {"status": status, "data": body}
+    return {"error": f"HTTP {status}", "details": json.dumps(body, ensure_ascii=False)[:500]}
 
 def get_default_branch(repo):
     result = github_request("GET", f"/repos/{repo}")
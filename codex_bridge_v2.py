@@ -8,7 +8,7 @@ Workflow:
 1. Agent erkennt "mit Codex" Befehl
 2. Erstellt Branch + pusht Code nach GitHub
 3. Erstellt Issue mit @codex Tag -> Codex Cloud arbeitet
-4. Pollt auf Aenderungen (Commits/PR)
+4. Wartet auf Aenderungen (Commits/PR): Webhook-Events (--events) oder adaptives Polling
 5. Liest Ergebnisse zurueck und liefert an User
 
 Nutzung:
@@ -24,10 +24,22 @@ import json
 import base64
 import time
 import subprocess
-import requests
 from pathlib import Path
 from datetime import datetime
 
+# Gemeinsame Bridge-Module (GitHub-Client, Git Data API Push, ...)
+# Im Repo neben diesem Skript, installiert unter ~/.openclaw/skills (Skript liegt dann im workspace)
+for _scripts in (Path(__file__).resolve().parent / 'skills' / 'codex-bridge-main' / 'scripts',
+                 Path.home() / '.openclaw' / 'skills' / 'codex-bridge-main' / 'scripts'):
+    if _scripts.is_dir():
+        sys.path.insert(0, str(_scripts))
+        break
+from git_data import push_tree
+from github_client import client
+import bridge_events
+from repo_archive import download_tree, download_files
+from task_store import store
+
 # ============ CONFIG ============
 
 CONFIG = {
@@ -35,12 +47,20 @@ CONFIG = {
     'github_user': 'SellTekk',
     'default_repo': 'SellTekk/Jarvis-Scripts',
     'default_branch': 'main',
-    'poll_interval': 30,
+    'poll_interval': 30,          # laengstes Poll-Intervall (adaptiv ab poll_min)
+    'poll_min': 5,
+    'event_poll_interval': 120,   # Fallback-Polling, solange Webhook-Events aktiv sind
+    'event_port': int(os.environ.get('CODEX_BRIDGE_EVENT_PORT') or 0),
+    'webhook_secret': os.environ.get('GITHUB_WEBHOOK_SECRET', ''),
     'max_wait': 600,
     'log_file': str(Path.home() / '.codex_bridge' / 'codex_bridge.log'),
-    'status_file': str(Path.home() / '.codex_bridge' / 'codex_bridge_status.json'),
+    'result_dir': str(Path.home() / '.codex_bridge' / 'results'),
 }
 
+CODE_EXTENSIONS = ['.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css',
+                   '.json', '.md', '.txt', '.sh', '.bat', '.sql', '.yaml', '.yml',
+                   '.php', '.xml', '.toml', '.cfg', '.ini', '.env']
+
 
 def _ensure_parent_dir(file_path):
     Path(file_path).parent.mkdir(parents=True, exist_ok=True)
@@ -96,25 +116,23 @@ def load_auth():
 def github(method, endpoint, data=None):
     if not CONFIG['github_token']:
         return {'error': 'GitHub Token fehlt'}
-    url = f'https://api.github.com{endpoint}'
-    headers = {
-        'Authorization': f'token {CONFIG["github_token"]}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    try:
-        r = requests.request(method, url, headers=headers, json=data)
-        if r.status_code < 400:
-            return {'status': r.status_code, 'data': r.json()}
-        else:
-            return {'error': f'HTTP {r.status_code}', 'details': r.text[:300]}
-    except Exception as e:
-        return {'error': str(e)}
+    status, body = client(CONFIG['github_token']).request(method, endpoint, data)
+    if status == 0:
+        return {'error': body.get('message', 'Netzwerkfehler')}
+    if status < 400:
+        return {'status': status, 'data': body}
+    return {'error': f'HTTP {status}', 'details': json.dumps(body, ensure_ascii=False)[:300]}
+
+_DEFAULT_BRANCHES = {}
 
 def get_default_branch(repo):
+    if repo in _DEFAULT_BRANCHES:
+        return _DEFAULT_BRANCHES[repo]
     result = github('GET', f'/repos/{repo}')
     if 'error' in result:
         return 'main'
-    return result.get('data', {}).get('default_branch', 'main')
+    _DEFAULT_BRANCHES[repo] = result.get('data', {}).get('default_branch', 'main')
+    return _DEFAULT_BRANCHES[repo]
 
 def create_branch(repo, branch_name, base_branch=None):
     if not base_branch:
@@ -139,27 +157,36 @@ def push_file(repo, branch, filepath, content, commit_msg):
         data['sha'] = sha
     return github('PUT', f'/repos/{repo}/contents/{filepath}', data)
 
-def push_local_folder(repo, branch, local_path, commit_msg):
-    """Pusht alle Dateien aus einem lokalen Ordner nach GitHub"""
-    results = []
+def _git_data_api(method, endpoint, body=None):
+    """(status, data)-Format fuer git_data.push_tree"""
+    return client(CONFIG['github_token']).request(method, endpoint, body)
+
+def folder_files(local_path):
+    """{rel_pfad: bytes} aller Code-Dateien eines lokalen Ordners"""
     local_path = Path(local_path)
-    
-    code_extensions = ['.py', '.js', '.ts', '.jsx', '.tsx', '.html', '.css', 
-                       '.json', '.md', '.txt', '.sh', '.bat', '.sql', '.yaml', '.yml',
-                       '.php', '.xml', '.toml', '.cfg', '.ini', '.env']
-    
+    files = {}
     for file in local_path.rglob('*'):
-        if file.is_file() and file.suffix.lower() in code_extensions:
-            rel_path = file.relative_to(local_path).as_posix()
-            try:
-                content = file.read_text(encoding='utf-8')
-                result = push_file(repo, branch, rel_path, content, commit_msg)
-                results.append({'file': rel_path, 'ok': 'error' not in result})
-                log(f"  Pushed: {rel_path}")
-            except:
-                results.append({'file': rel_path, 'ok': False})
-    
-    return results
+        if file.is_file() and file.suffix.lower() in CODE_EXTENSIONS:
+            files[file.relative_to(local_path).as_posix()] = file.read_bytes()
+    return files
+
+def push_files(repo, branch, files, commit_msg, base_branch=None):
+    """Alle Dateien als EIN Commit (Git Data API), legt den Branch bei Bedarf an"""
+    base_branch = base_branch or get_default_branch(repo)
+    res = push_tree(_git_data_api, repo, branch, files, commit_msg, base=base_branch)
+    log(f"  Commit {(res['commit'] or '-')[:7]}: {len(res['files'])} Dateien")
+    return res
+
+def push_local_folder(repo, branch, local_path, commit_msg):
+    """Pusht alle Dateien aus einem lokalen Ordner nach GitHub (ein Commit)"""
+    files = folder_files(local_path)
+    try:
+        push_files(repo, branch, files, commit_msg)
+        ok = True
+    except RuntimeError as e:
+        log(f"  [ERROR] Push: {e}")
+        ok = False
+    return [{'file': rel_path, 'ok': ok} for rel_path in sorted(files)]
 
 def create_codex_issue(repo, branch, task):
     """Erstellt ein GitHub Issue das Codex triggert"""
@@ -199,7 +226,8 @@ def check_for_changes(repo, branch, base_branch=None):
         'behind_by': data.get('behind_by', 0),
         'total_commits': data.get('total_commits', 0),
         'files_changed': len(data.get('files', [])),
-        'files': [f.get('filename') for f in data.get('files', [])]
+        'files': [f.get('filename') for f in data.get('files', [])],
+        'removed': [f.get('filename') for f in data.get('files', []) if f.get('status') == 'removed']
     }
 
 def check_for_pr(repo, branch):
@@ -233,29 +261,6 @@ def read_file_from_branch(repo, filepath, branch):
     except:
         return {'error': 'Decode fehlgeschlagen'}
 
-def get_all_files_from_branch(repo, branch, path=''):
-    """Liest alle Dateien aus einem Branch"""
-    result = github('GET', f'/repos/{repo}/contents/{path}?ref={branch}')
-    if 'error' in result:
-        return result
-    
-    items = result.get('data', [])
-    if not isinstance(items, list):
-        items = [items]
-    
-    files = {}
-    for item in items:
-        if item['type'] == 'file':
-            file_content = read_file_from_branch(repo, item['path'], branch)
-            if 'content' in file_content:
-                files[item['path']] = file_content['content']
-        elif item['type'] == 'dir':
-            sub_files = get_all_files_from_branch(repo, branch, item['path'])
-            if isinstance(sub_files, dict) and 'error' not in sub_files:
-                files.update(sub_files)
-    
-    return files
-
 # ============ WORKFLOWS ============
 
 def send_to_codex(repo, task, local_folder=None):
@@ -271,26 +276,22 @@ def send_to_codex(repo, task, local_folder=None):
     log(f"  Task: {task}")
     log(f"  Lokal: {local_folder or 'keiner'}")
     
-    # Branch erstellen
+    # Branch + Code + Task-Beschreibung als ein Commit (Branch wird dabei angelegt)
     branch = f"codex-{int(time.time())}"
     log(f"  Branch erstellen: {branch}")
     
-    br = create_branch(repo, branch)
-    if 'error' in br:
-        log(f"  [ERROR] Branch: {br['error']}")
-        return {'error': br['error']}
-    log(f"  [OK] Branch erstellt")
-    
-    # Code pushen wenn lokaler Ordner angegeben
+    files = {}
     if local_folder and os.path.exists(local_folder):
         log(f"  Code pushen aus: {local_folder}")
-        push_results = push_local_folder(repo, branch, local_folder, f"Codex Task: {task}")
-        pushed = sum(1 for r in push_results if r['ok'])
-        log(f"  [OK] {pushed}/{len(push_results)} Dateien gepusht")
-    
-    # Task-Beschreibung als README in den Branch
+        files = folder_files(local_folder)
     task_readme = f"# Codex Task\n\n{task}\n\nBranch: {branch}\nErstellt: {datetime.now()}\n"
-    push_file(repo, branch, 'CODEX_TASK.md', task_readme, f"Codex Task: {task}")
+    files['CODEX_TASK.md'] = task_readme.encode('utf-8')
+    try:
+        push_files(repo, branch, files, f"Codex Task: {task}")
+    except RuntimeError as e:
+        log(f"  [ERROR] Branch: {e}")
+        return {'error': str(e)}
+    log(f"  [OK] Branch erstellt, {len(files)} Dateien gepusht")
     
     # Issue erstellen mit @codex
     log(f"  Issue erstellen mit @codex...")
@@ -298,7 +299,9 @@ def send_to_codex(repo, task, local_folder=None):
     if 'error' in issue:
         log(f"  [WARN] Issue: {issue['error']}")
         issue_url = 'nicht erstellt'
+        issue_number = None
     else:
+        issue_number = issue.get('data', {}).get('number')
         issue_url = issue.get('data', {}).get('html_url', 'unbekannt')
         log(f"  [OK] Issue: {issue_url}")
     
@@ -308,6 +311,7 @@ def send_to_codex(repo, task, local_folder=None):
         'branch': branch,
         'task': task,
         'issue_url': issue_url,
+        'issue_number': issue_number,
         'github_url': f'https://github.com/{repo}/tree/{branch}',
         'codex_url': 'https://chatgpt.com/codex'
     }
@@ -317,14 +321,13 @@ def send_to_codex(repo, task, local_folder=None):
     log(f"  Codex:  {result['codex_url']}")
     log("=" * 50)
     
-    # Status-Datei schreiben
-    status_file = r'C:\Users\no\Desktop\codex_bridge_status.json'
-    with open(status_file, 'w') as f:
-        json.dump(result, f, indent=2, default=str)
+    # Im Task-Store festhalten (status/history in bridge_main sehen den Task ebenfalls)
+    store().add_task(repo, None, branch, task, status='sent', source='v2',
+                     issue_no=issue_number, issue_url=issue_url if issue_number else None)
     
     return result
 
-def check_codex_status(repo, branch):
+def check_codex_status(repo, branch, base_branch=None):
     """
     SCHRITT 2: Codex Status pruefen
     - Hat Codex Aenderungen gemacht?
@@ -336,7 +339,7 @@ def check_codex_status(repo, branch):
     log(f"  Branch: {branch}")
     
     # Aenderungen pruefen
-    changes = check_for_changes(repo, branch)
+    changes = check_for_changes(repo, branch, base_branch)
     log(f"  Commits: {changes.get('total_commits', 0)}")
     log(f"  Dateien geaendert: {changes.get('files_changed', 0)}")
     
@@ -356,10 +359,12 @@ def check_codex_status(repo, branch):
     log("=" * 50)
     return result
 
-def get_codex_result(repo, branch):
+def get_codex_result(repo, branch, only_diff=False):
     """
     SCHRITT 3: Ergebnisse holen
-    - Alle Dateien aus dem Branch lesen
+    - Branch als EIN Tarball laden und beim Lesen nach result_dir entpacken
+      (only_diff: nur die laut Compare geaenderten Dateien)
+    - 'files' ist ein FileIndex: Pfade sofort, Inhalt erst beim Zugriff
     - Diff anzeigen
     """
     log("=" * 50)
@@ -367,54 +372,89 @@ def get_codex_result(repo, branch):
     log(f"  Repo: {repo}")
     log(f"  Branch: {branch}")
     
-    # Alle Dateien holen
-    files = get_all_files_from_branch(repo, branch)
-    if isinstance(files, dict) and 'error' not in files:
-        log(f"  [OK] {len(files)} Dateien gelesen")
-        
-        # Diff holen
-        changes = check_for_changes(repo, branch)
-        
-        result = {
-            'files': files,
-            'changes': changes,
-            'file_list': list(files.keys())
-        }
-        
-        log(f"  Geaenderte Dateien: {changes.get('files', [])}")
-        log("=" * 50)
-        return result
-    else:
-        log(f"  [ERROR] Konnte Dateien nicht lesen")
-        return {'error': 'Konnte Dateien nicht lesen', 'details': files}
+    changes = check_for_changes(repo, branch)
+    dest = Path(CONFIG['result_dir']) / repo.replace('/', '_') / branch
+    gh = client(CONFIG['github_token'])
+    try:
+        if only_diff:
+            if 'error' in changes:
+                raise RuntimeError(f"compare: {changes['error']}")
+            removed = set(changes.get('removed', []))
+            files = download_files(gh, repo, branch, [f for f in changes.get('files', []) if f not in removed], dest)
+        else:
+            files = download_tree(gh, repo, branch, dest)
+    except RuntimeError as e:
+        log(f"  [ERROR] Konnte Dateien nicht lesen: {e}")
+        return {'error': 'Konnte Dateien nicht lesen', 'details': str(e)}
+    
+    log(f"  [OK] {len(files)} Dateien nach {dest}")
+    log(f"  Geaenderte Dateien: {changes.get('files', [])}")
+    log("=" * 50)
+    return {
+        'files': files,
+        'changes': changes,
+        'file_list': list(files.keys()),
+        'path': str(dest)
+    }
 
-def full_workflow(repo, task, local_folder=None, wait=True):
+def _start_events(event_port=None, replay_file=None):
+    """EventHub mit Webhook-Listener und/oder Replay-Datei, None wenn beides fehlt"""
+    event_port = event_port or CONFIG['event_port']
+    if not event_port and not replay_file:
+        return None, None
+    hub = bridge_events.EventHub()
+    server = None
+    if event_port:
+        server = bridge_events.listen(hub, event_port, secret=CONFIG['webhook_secret'])
+        log(f"[EVENT] Webhook-Listener auf Port {event_port}")
+    return hub, server
+
+def full_workflow(repo, task, local_folder=None, wait=True, event_port=None, replay_file=None):
     """
     KOMPLETTER WORKFLOW:
     1. Senden
-    2. Warten (optional)
+    2. Warten (optional) - auf Webhook-Events (event_port/replay_file),
+       sonst adaptives Polling (poll_min -> poll_interval)
     3. Ergebnis holen
     """
     log("\n" + "#" * 60)
     log("# CODEX BRIDGE - VOLLSTAENDIGER WORKFLOW")
     log("#" * 60)
     
-    # 1. Senden
-    send_result = send_to_codex(repo, task, local_folder)
-    if 'error' in send_result:
-        return send_result
-    
+    # Listener vor dem Senden starten, damit kein Event verloren geht
+    hub, server = _start_events(event_port, replay_file) if wait else (None, None)
+    try:
+        # 1. Senden
+        send_result = send_to_codex(repo, task, local_folder)
+        if 'error' in send_result or not wait:
+            return send_result
+        if replay_file:
+            # Erst jetzt stehen Branch und Issue fest ({branch}/{issue} in der Datei)
+            values = {'branch': send_result['branch'], 'issue': send_result.get('issue_number')}
+            log(f"[EVENT] {bridge_events.replay(hub, replay_file, values)} Events aus {replay_file}")
+        return _wait_for_codex(repo, send_result, hub)
+    finally:
+        if server:
+            server.shutdown()
+
+def _wait_for_codex(repo, send_result, hub=None):
     branch = send_result['branch']
+    base_branch = get_default_branch(repo)
+    numbers = {send_result.get('issue_number')} - {None}
     
-    if not wait:
-        return send_result
+    def relevant(info):
+        return info['branch'] == branch or info['number'] in numbers
     
     # 2. Warten auf Codex
-    log(f"\n[WAIT] Warte auf Codex (max {CONFIG['max_wait']}s)...")
+    mode = 'Events + Fallback-Polling' if hub else 'adaptives Polling'
+    log(f"\n[WAIT] Warte auf Codex (max {CONFIG['max_wait']}s, {mode})...")
+    maximum = CONFIG['event_poll_interval'] if hub else CONFIG['poll_interval']
+    interval = bridge_events.AdaptiveInterval(CONFIG['poll_min'], maximum)
     start = time.time()
+    last = None
     
     while time.time() - start < CONFIG['max_wait']:
-        status = check_codex_status(repo, branch)
+        status = check_codex_status(repo, branch, base_branch)
         
         if status.get('codex_done'):
             log("[OK] Codex hat gearbeitet!")
@@ -423,13 +463,30 @@ def full_workflow(repo, task, local_folder=None, wait=True):
             result = get_codex_result(repo, branch)
             result['send'] = send_result
             result['status'] = 'completed'
+            result['wait_seconds'] = round(time.time() - start, 1)
+            store().set_status(repo, branch, 'completed', pr_no=status['pr'].get('number'))
             return result
         
-        remaining = int(CONFIG['max_wait'] - (time.time() - start))
-        log(f"  Noch {remaining}s... (naechster Check in {CONFIG['poll_interval']}s)")
-        time.sleep(CONFIG['poll_interval'])
+        if status['pr'].get('found'):
+            numbers.add(status['pr']['number'])
+        current = (status['changes'].get('total_commits'), status['pr'].get('found'))
+        if current != last:
+            interval.reset()
+            last = current
+        
+        remaining = CONFIG['max_wait'] - (time.time() - start)
+        pause = min(interval.next(), max(remaining, 0))
+        if hub:
+            log(f"  Noch {int(remaining)}s... (Event oder Check in {pause:.0f}s)")
+            info = hub.wait(relevant, pause)
+            if info:
+                log(f"[EVENT] {info['event']} {info['action'] or ''} -> neu pruefen")
+        else:
+            log(f"  Noch {int(remaining)}s... (naechster Check in {pause:.0f}s)")
+            time.sleep(pause)
     
     log("[TIMEOUT] Codex hat nicht rechtzeitig geantwortet")
+    store().set_status(repo, branch, 'timeout', detail=f"{CONFIG['max_wait']}s")
     return {
         'status': 'timeout',
         'send': send_result,
@@ -444,6 +501,15 @@ def full_workflow(repo, task, local_folder=None, wait=True):
 
 # ============ CLI ============
 
+def _pop_option(name):
+    """'--name WERT' aus sys.argv entfernen und WERT liefern (None wenn nicht angegeben)"""
+    if name in sys.argv[:-1]:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return value
+    return None
+
 if __name__ == '__main__':
     load_auth()
     
@@ -451,6 +517,8 @@ if __name__ == '__main__':
         print("[ERROR] GitHub Token nicht gefunden!")
         sys.exit(1)
     
+    event_port = _pop_option('--events')
+    replay_file = _pop_option('--replay')
     cmd = sys.argv[1] if len(sys.argv) > 1 else 'help'
     
     if cmd == 'test':
@@ -478,19 +546,21 @@ if __name__ == '__main__':
     elif cmd == 'result' and len(sys.argv) > 3:
         repo = sys.argv[2]
         branch = sys.argv[3]
-        result = get_codex_result(repo, branch)
+        result = get_codex_result(repo, branch, only_diff='--nur-diff' in sys.argv)
         # Nur Dateiliste und Changes anzeigen (nicht den ganzen Code)
         display = {
             'file_list': result.get('file_list', []),
-            'changes': result.get('changes', {})
-        }
+            'changes': result.get('changes', {}),
+            'path': result.get('path'),
+        } if 'error' not in result else result
         print(json.dumps(display, indent=2, default=str))
     
     elif cmd == 'workflow' and len(sys.argv) > 3:
         repo = sys.argv[2]
         task = sys.argv[3]
         folder = sys.argv[4] if len(sys.argv) > 4 else None
-        result = full_workflow(repo, task, folder, wait=True)
+        result = full_workflow(repo, task, folder, wait=True,
+                               event_port=int(event_port) if event_port else None, replay_file=replay_file)
         print(json.dumps(result, indent=2, default=str))
     
     elif cmd == 'help':
@@ -503,8 +573,10 @@ Befehle:
   test                              GitHub Verbindung testen
   send <repo> "<task>" [ordner]     Code an Codex senden
   status <repo> <branch>            Codex Status pruefen
-  result <repo> <branch>            Ergebnisse holen
+  result <repo> <branch> [--nur-diff]  Ergebnisse holen (Tarball nach ~/.codex_bridge/results)
   workflow <repo> "<task>" [ordner]  Kompletter Workflow (senden + warten + holen)
+           [--events PORT]            Webhook-Listener (pull_request/push/issue_comment) statt nur Polling
+           [--replay DATEI]           Webhook-Events aus Datei einspielen (JSON-Lines, {branch}/{issue} als Platzhalter)
 
 Beispiele:
 
@@ -514,6 +586,7 @@ Beispiele:
   python codex_bridge_v2.py status SellTekk/Jarvis-Scripts codex-1740012345
   python codex_bridge_v2.py result SellTekk/Jarvis-Scripts codex-1740012345
   python codex_bridge_v2.py workflow SellTekk/Jarvis-Scripts "Hello World"
+  python codex_bridge_v2.py workflow SellTekk/Jarvis-Scripts "Hello World" --events 8787
         """)
     
     else:
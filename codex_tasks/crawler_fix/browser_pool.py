@@ -0,0 +1,73 @@
+"""
+Gemeinsamer Browser-Pool für parallele Crawls
+
+Mehrere Produkt-Typen (Threads) teilen sich N Chrome-Instanzen. Ein Browser
+wird pro Produkt ausgeliehen (lease) und nach MAX_USES Produkten neu gestartet
+(Memory Leak verhindern) - das war vorher pro Crawler-Script eigener Code.
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class BrowserPool:
+    def __init__(self, size, factory, max_uses=30):
+        """
+        size: Anzahl Browser
+        factory: () -> (driver, wait)
+        max_uses: Neustart nach so vielen Ausleihen
+        """
+        self.factory = factory
+        self.max_uses = max_uses
+        self._slots = queue.Queue()
+        self._lock = threading.Lock()
+        self._alle = []
+        # Slots starten leer - Browser wird erst bei erster Ausleihe gestartet
+        for _ in range(max(1, size)):
+            self._slots.put(None)
+
+    def _start(self):
+        driver, wait = self.factory()
+        slot = {"driver": driver, "wait": wait, "uses": 0}
+        with self._lock:
+            self._alle.append(slot)
+        return slot
+
+    def _stop(self, slot):
+        with self._lock:
+            if slot in self._alle:
+                self._alle.remove(slot)
+        try:
+            slot["driver"].quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self):
+        """with pool.lease() as (driver, wait): ..."""
+        slot = self._slots.get()
+        try:
+            if slot is None:
+                slot = self._start()
+                print(f"[*] Browser gestartet ({len(self._alle)} aktiv)")
+            yield slot["driver"], slot["wait"]
+            slot["uses"] += 1
+            if slot["uses"] >= self.max_uses:
+                print(f"\n🔄 Browser-Neustart nach {slot['uses']} Produkten (Memory Leak verhindern)...")
+                self._stop(slot)
+                slot = None
+        except Exception:
+            # Browser in unbekanntem Zustand -> beim nächsten Mal frisch starten
+            if slot is not None:
+                self._stop(slot)
+            slot = None
+            raise
+        finally:
+            self._slots.put(slot)
+
+    def close_all(self):
+        with self._lock:
+            alle = list(self._alle)
+        for slot in alle:
+            self._stop(slot)
@@ -0,0 +1,86 @@
+"""
+VK Preis-Crawler - gemeinsamer Einstieg für alle Produkt-Typen
+
+Beispiele:
+    python crawler_cli.py                        # handy (wie früher crawler_handy.py)
+    python crawler_cli.py tablet
+    python crawler_cli.py handy tablet --browsers 2
+    python crawler_cli.py smartwatch --data-dir D:/crawler
+    python crawler_cli.py --plugin meine_typen konsole   # eigener Typ aus meine_typen.py
+    python crawler_cli.py --list
+
+Mehrere Typen laufen parallel (ein Thread pro Typ) auf einem gemeinsamen
+Browser-Pool statt nacheinander in getrennten Aufrufen.
+"""
+
+import argparse
+import importlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import produkt_typen
+import crawler_handy
+from browser_pool import BrowserPool
+from dedupe import ZielCache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="VK Preis-Crawler (handy, tablet, ...)")
+    parser.add_argument("typen", nargs="*", default=["handy"], help="Produkt-Typen (Default: handy)")
+    parser.add_argument("--browsers", type=int, default=None,
+                        help="Anzahl Browser im Pool (Default: ein Browser pro Typ)")
+    parser.add_argument("--data-dir", default=None, help=f"Ordner mit den Excel-Dateien (Default: {produkt_typen.DATA_DIR})")
+    parser.add_argument("--plugin", action="append", default=[],
+                        help="Python-Modul laden, das weitere Typen per register_produkt_typ() anmeldet")
+    parser.add_argument("--list", action="store_true", help="Verfügbare Produkt-Typen anzeigen")
+    args = parser.parse_args(argv)
+
+    for modul in args.plugin:
+        importlib.import_module(modul)
+
+    if args.data_dir:
+        produkt_typen.set_data_dir(args.data_dir)
+
+    if args.list:
+        for name, typ in sorted(produkt_typen.PRODUKT_TYPEN.items()):
+            print(f"  {name:12} /{typ.url_pfad}/  {typ.input_file}")
+        return 0
+
+    try:
+        typen = [produkt_typen.get_produkt_typ(name) for name in dict.fromkeys(args.typen)]
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    crawler_handy.install_signal_handlers()
+
+    pool = BrowserPool(
+        size=args.browsers or len(typen),
+        factory=crawler_handy.create_browser,
+        max_uses=crawler_handy.MAX_PRODUCTS_BEFORE_BROWSER_RESTART,
+    )
+    print(f"[*] Typen: {', '.join(t.name for t in typen)} | Browser: {args.browsers or len(typen)}")
+
+    # Ein Cache für alle Typen: identische Ziele werden nur einmal gecrawlt
+    ziele = ZielCache()
+    fehler = 0
+    try:
+        with ThreadPoolExecutor(max_workers=len(typen)) as ex:
+            futures = {ex.submit(crawler_handy.crawl_kategorie, typ, pool, ziele): typ for typ in typen}
+            for fut, typ in futures.items():
+                try:
+                    anzahl = fut.result()
+                    print(f"[{typ.name}] ✅ {anzahl} Ergebnisse")
+                except Exception as e:
+                    print(f"[{typ.name}] ❌ Abgebrochen: {e}")
+                    fehler += 1
+    finally:
+        pool.close_all()
+        print(f"[*] {ziele.bericht()}")
+        print("[*] Browser geschlossen. Auf Wiedersehen!")
+
+    return 1 if fehler else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
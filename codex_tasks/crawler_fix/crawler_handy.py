@@ -18,14 +18,19 @@ import subprocess
 import re
 import signal
 import sys
+import json
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.options import Options
 
+from variant_matcher import VariantIndex, MIN_CONFIDENCE
+from produkt_typen import VERKAUFEN_BASE
+from eingabe import lese_produkte, lese_ergebnisse
+from dedupe import ZielCache, ziel_key
+
 # === ROBUSTNESS KONFIGURATION ===
 MAX_PRODUCTS_BEFORE_BROWSER_RESTART = 30  # Browser alle 30 Produkte neu starten
-CHECKPOINT_FILE = "F:/crawlerv5/crawler_checkpoint.txt"
 SHUTDOWN_REQUESTED = False
 
 # Signal Handler für Graceful Shutdown
@@ -33,45 +38,35 @@ def signal_handler(signum, frame):
     global SHUTDOWN_REQUESTED
     print("\n⚠️ Signal erhalten - speichere Fortschritt und beende...")
     SHUTDOWN_REQUESTED = True
-    
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
 
-# === KONFIGURATION ===
-# Wähle: "handy" oder "tablet"
-PRODUKT_TYP = "handy"
 
-if PRODUKT_TYP == "handy":
-    INPUT_FILE = "F:/crawlerv5/RELEASE_handy.xlsx"  # ALLE Produkte!
-    OUTPUT_FILE = "F:/crawlerv5/RELEASE_handy_ergebnis.xlsx"
-elif PRODUKT_TYP == "tablet":
-    INPUT_FILE = "F:/crawlerv5/RELEASE_tablet.xlsx"
-    OUTPUT_FILE = "F:/crawlerv5/RELEASE_tablet_ergebnis.xlsx"
+def install_signal_handlers():
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+# Heartbeat für crawler_wrapper.py (Stall-Erkennung) - wird pro SKU geschrieben
+HEARTBEAT_FILE = os.environ.get("CRAWLER_HEARTBEAT_FILE")
 
-VERKAUFEN_BASE = "https://www.verkaufen.de"
+
+def heartbeat(typ_name, **info):
+    """Schreibt Zeitstempel + aktuelle SKU/URL atomar in die Heartbeat-Datei"""
+    if not HEARTBEAT_FILE:
+        return
+    try:
+        tmp = f"{HEARTBEAT_FILE}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"ts": time.time(), "typ": typ_name, **info}, f, default=str)
+        os.replace(tmp, HEARTBEAT_FILE)
+    except Exception:
+        pass
+
+# === KONFIGURATION ===
+# Produkt-Typ (handy/tablet/...) + Dateien kommen aus produkt_typen.py,
+# Start über crawler_cli.py
 
 # Proxy - auskommentieren wenn nicht benoetigt
 PROXY = "localhost:9999"  # proxy-chain Server
 
-# URL-Mapping für Modelle die nicht mehr unter alter URL existieren
-# Format: "alter_model_name": "neue_url_suffix"
-MODEL_URL_MAP = {
-    # Galaxy Z Fold Serie - KORREKTE URLs (keine Bindestriche!)
-    "galaxyzfold4": "galaxyzfold45g",  # 5G Version
-    "galaxyzfold44g": "galaxyzfold44g",  # 4G Version
-    "galaxyzfold3": "galaxyzfold35g",
-    "galaxyzfold2": "galaxyzfold25g",
-    "galaxyzfold": "galaxyzfold5g",
-    # Galaxy Z Flip Serie - KORREKTE URLs
-    "galaxyzflip4": "galaxyzflip4",
-    "galaxyzflip3": "galaxyzflip3",
-    "galaxyzflip": "galaxyzflip",
-    # Apple iPhone Plus Serie - "+" -> "plus"
-    "iphone14+": "iphone14plus",
-    "iphone13+": "iphone13plus",
-    "iphone12+": "iphone12plus",
-}
-
 MIN_PAUSE = 2
 MAX_PAUSE = 5
 
@@ -80,242 +75,34 @@ def human_pause():
     time.sleep(random.uniform(MIN_PAUSE, MAX_PAUSE))
 
 
-def extract_all_from_url(url):
-    """
-    Extrahiert: Marke, Modell, GB, Farbe aus handyverkauf.net URL
-    Bsp: https://www.handyverkauf.net/apple-iphone-14-128gb-blau_h_10788
-    -> brand=apple, model=iphone14, gb=128gb, color=blau
-    """
-    match = re.search(r'net/([a-z0-9-]+)_h_', url)
-    if not match:
-        return None, None, None, None
-    
-    name = match.group(1)  # apple-iphone-14-128gb-blau
-    parts = name.split('-')
-    
-    brand = parts[0]
-    model = None
-    gb = None
-    color = None
-    
-    # Farben-Mapping
-    color_map = {
-        'blau': 'Blau',
-        'mitternacht': 'Mitternacht',
-        'polarstern': 'Polarstern',
-        'rot': '(PRODUCT) Red Special Edition',
-        'violett': 'Violett',
-        'gelb': 'Gelb',
-        'schwarz': 'Schwarz',
-        'weiss': 'Weiss',
-        'grau': 'Grau',
-        'silber': 'Silber',
-        'gold': 'Gold',
-        'rose': 'Rose',
-        'gruen': 'Gruen',
-        'space': 'Space Schwarz',
-        'graphit': 'Graphit',
-    }
-    
-    for i, p in enumerate(parts):
-        # Auch Modelle mit Buchstaben erkennen (s22, a54, etc.)
-        if p.isdigit() or (any(c.isalpha() for c in p) and any(c.isdigit() for c in p)):
-            # Modell
-            if i > 0:
-                model_base = parts[i-1]
-                
-                # SPEZIALFALL: "thinkphone256gb" - GB ist im gleichen Wort wie Zahl
-                # Extrahiere Zahl und GB aus dem Teil
-                if 'gb' in p.lower() or 'tb' in p.lower():
-                    # Trenne "256gb" in "256" und "gb"
-                    num_match = re.search(r'(\d+)', p)
-                    if num_match:
-                        model_num = num_match.group(1)
-                        has_gb = True  # GB ist in diesem Teil
-                    else:
-                        model_num = p
-                        has_gb = False
-                else:
-                    model_num = p
-                    has_gb = False
-                
-                suffix = '-'.join(parts[i+1:]) if i+1 < len(parts) else ''
-                
-                model = model_base + model_num
-                
-                # Wenn GB im model_num war, als suffix merken für später
-                if has_gb:
-                    suffix = 'gb' + ('-' + suffix if suffix else '')
-                
-                # Spezielle Modelle: flip, z, fold erkennen (auch im model_base!)
-                if model_base in ['flip', 'z'] or 'flip' in model_base:
-                    model = 'galaxyzflip' + model_num
-                elif 'fold' in model_base:
-                    model = 'galaxyzfold' + model_num
-                elif model_base in ['ultra']:
-                    # ultra ist schon im model_base (z.B. von "s22ultra"), nichts tun
-                    pass
-                elif model_base in ['duo', 'surface'] and 'duo' in model_base:
-                    # Surface Duo - nur "duo" als Modellname!
-                    model = 'duo'
-                elif model_base in ['xiaomi', 'mi'] and brand in ['xiaomi', 'mi']:
-                    # Xiaomi/MI特殊情况: "xiaomi 13 pro" -> "mi13pro" NICHT "xiaomi13pro"
-                    model = 'mi' + model_num
-                elif 'ultra' in suffix:
-                    model += 'ultra'
-                elif 'pro' in suffix:
-                    if 'max' in suffix:
-                        model += 'promax'
-                    else:
-                        model += 'pro'
-                elif 'max' in suffix:
-                    model += 'max'
-                elif 'plus' in suffix:
-                    model += '+'  # "plus" wird zu "+"!
-                elif 'mini' in suffix:
-                    model += 'mini'
-                elif 'flip' in suffix:
-                    model = 'galaxyzflip' + model_num  # flip -> galaxyzflip!
-                elif 'plus' in suffix:
-                    model += 'plus'
-                elif 'air' in suffix:
-                    model += 'air'
-                
-                # GB und Farbe finden (alle in einem Durchlauf!)
-                remaining = parts[i+1:] if i+1 < len(parts) else []
-                
-                # ALLE Modell-Suffixes aus remaining entfernen!
-                # Diese Wörter sind Teil des Modellnamens, keine Farben!
-                model_suffix = ['pro', 'max', 'mini', 'plus', 'air', 'ultra', 'promax', 'flip', 'z', '5g', '4g', '5g+', '4g+', 'se', 'fe', 'ee', 'sm', 'sm-a', 'sm-', 'a0', 'a1', 'a2', 'a3', 'a4', 'a5', 'a6', 'a7', 'a8', 'a9', 'gb', 'tb', 'lite', 'lite5g', 'pro5g']
-                remaining = [p for p in remaining if p.lower() not in model_suffix and not p.lower().startswith('sm-') and not p.lower().startswith('sm-a')]
-                
-                # SPEZIALFALL: GB im Modellnamen (z.B. "thinkphone256gb")
-                # Extrahiere GB aus model_num falls vorhanden
-                if has_gb and not gb:
-                    num_match = re.search(r'(\d+)\s*(gb|tb)', p.lower())
-                    if num_match:
-                        gb = num_match.group(1).upper() + num_match.group(2).upper()
-                        model = model  # Modell ohne GB behalten
-                
-                for part in remaining:
-                    part_lower = part.lower()
-                    
-                    # GB finden (aber NICHT abbrechen!)
-                    if not gb:
-                        if 'gb' in part_lower:
-                            gb = part.upper()
-                        elif 'tb' in part_lower:
-                            gb = part.upper()
-                    
-                    # Farbe finden - erst aus Map, sonst aus URL (dynamisch)
-                    # WICHTIG: Nur Farbe setzen wenn es KEIN GB/TB ist!
-                    if not color and 'gb' not in part_lower and 'tb' not in part_lower:
-                        # Versuche erst die color_map
-                        for color_key, color_value in color_map.items():
-                            if color_key in part_lower:
-                                color = color_value
-                                break
-                        # Wenn nicht in Map: nimm den Teil direkt (z.B. "graphit" -> "Graphit")
-                        if not color and not part.isdigit():
-                            color = part.capitalize()
-            
-            break
-    
-    return brand, model, gb, color
-
-
-def get_vk_url(brand, model):
-    # Prüfe ob Modell ein Mapping hat
-    url_model = MODEL_URL_MAP.get(model, model)
-    return f"{VERKAUFEN_BASE}/handy-verkaufen/{brand}/{url_model}/"
-
-
 def click_variation(driver, gb, color):
     """Klickt nur die spezifische GB + Farbe Kombination"""
     try:
         human_pause()
         all_btns = driver.find_elements(By.CSS_SELECTOR, "button.configuration-option")
         
-        gb_btn = None
-        color_btn = None
+        # Buttons EINMAL pro Seite indexieren (Speicher exakt, Farbe kanonisch)
+        index = VariantIndex.from_buttons(all_btns)
+        gb_match = index.resolve_storage(gb) if gb else None
+        color_match = index.resolve_color(color) if color else None
         
-        for btn in all_btns:
-            btn_text = btn.text.strip()
-            
-            # GB-Button (nur Storage >= 32GB)
-            if gb:
-                gb_clean = gb.replace('GB', '').replace('TB', '').strip()
-                if gb_clean.isdigit():
-                    num = int(gb_clean)
-                    # Check for both "256" and "256GB" and "256 GB" and "256TB" / "256 TB"
-                    if num >= 32 and (
-                        f'{num}' in btn_text or 
-                        f'{num}GB' in btn_text or 
-                        f'{num} GB' in btn_text or
-                        f'{num}TB' in btn_text or
-                        f'{num} TB' in btn_text or
-                        f'{num}gb' in btn_text.lower() or
-                        f'{num}tb' in btn_text.lower()
-                    ):
-                        gb_btn = btn
-            
-            # Farbe-Button - mit dynamischer Erkennung UND Alias-Mapping
-            if color:
-                # Farb-Alias-Mapping (Deutsch -> Deutsch + Englisch Synonyme)
-                color_aliases = {
-                    'schwarz': ['schwarz', 'black', 'phantom black', 'midnight', 'onyx'],
-                    'weiss': ['weiss', 'white', 'pearl', 'glacier', 'polar'],
-                    'blau': ['blau', 'blue', 'ocean', 'sky', 'navy', 'pacific', 'azure'],
-                    'grau': ['grau', 'gray', 'grey', 'graphite', 'titanium', 'space grey'],
-                    'silber': ['silber', 'silver', 'platinum'],
-                    'gold': ['gold', 'golden', 'champagne'],
-                    'rot': ['rot', 'red', '(product) red', 'coral', 'burgundy', 'bordeaux'],
-                    'gruen': ['gruen', 'green', 'mint', 'olive', 'forest', 'emerald'],
-                    'violett': ['violett', 'purple', 'violet', 'lavender', 'aurora'],
-                    'gelb': ['gelb', 'yellow'],
-                    'rose': ['rose', 'pink', 'rose gold', 'blush'],
-                    'lime': ['lime', 'lime green'],
-                    'orange': ['orange', 'apricot', 'sunset'],
-                    'beige': ['beige', 'cream', 'ivory', 'pearl'],
-                    'braun': ['braun', 'brown', 'bronze', 'copper'],
-                    'cyan': ['cyan', 'turquoise', 'teal'],
-                }
-                
-                btn_lower = btn_text.lower()
-                color_lower = color.lower()
-                
-                # Prüfe Farbe matchen - nur wenn unser gesuchtes Farbwort im Button ODER Button-Farbe in unseren bekannten Farben
-                matched = False
-                
-                # Hole die Alias-Liste für die gesuchte Farbe
-                target_aliases = None
-                for main_color, aliases in color_aliases.items():
-                    if color_lower in aliases:
-                        target_aliases = aliases
-                        break
-                
-                if target_aliases:
-                    # Prüfe ob einer der Ziel-Aliasse im Button-Text vorkommt
-                    for alias in target_aliases:
-                        if alias in btn_lower:
-                            color_btn = btn
-                            matched = True
-                            break
-                
-                # Fallback: einfache Teilstring-Suche (wenn kein Alias match)
-                if not matched:
-                    if color_lower in btn_lower or btn_lower in color_lower:
-                        color_btn = btn
+        # Unsichere Farb-Treffer NICHT klicken - falsche Variante = teurer Retry
+        if color_match and color_match.confidence < MIN_CONFIDENCE:
+            print(f"      ⚠️ Farbe unsicher: {color_match} - klicke nicht")
+            color_match = None
+        
+        gb_btn = gb_match.element if gb_match else None
+        color_btn = color_match.element if color_match else None
         
         print(f"      Suche GB={gb}, Farbe={color}")
         
         if gb_btn:
-            print(f"      Klicke GB: {gb_btn.text}")
+            print(f"      Klicke GB: {gb_match.label}")
             driver.execute_script("arguments[0].click();", gb_btn)
             time.sleep(2)  # Warten bis Preis lädt
         
         if color_btn:
-            print(f"      Klicke Farbe: {color_btn.text}")
+            print(f"      Klicke Farbe: {color_match.label} ({color_match.method}, {color_match.confidence:.2f})")
             driver.execute_script("arguments[0].click();", color_btn)
             time.sleep(3)  # Warten bis Preis lädt (wichtig für React!)
         
@@ -528,159 +315,194 @@ def search_product_fallback(driver, brand, model, gb, color):
         return None
 
 
-def main():
-    print("=== VK Preis-Crawler v5.0 ===")
+def create_browser():
+    """Neuer Chrome (Factory für den BrowserPool)"""
+    options = Options()
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
     
-    df = pd.read_excel(INPUT_FILE)
-    print(f"Zeilen: {len(df)}")
+    # Proxy verwenden
+    if PROXY:
+        options.add_argument(f"--proxy-server={PROXY}")
     
-    # Alle 837 Zeilen verarbeiten
-    # df = df.head(10)  # Debug: nur erste 10
+    driver = webdriver.Chrome(options=options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver, WebDriverWait(driver, 15)
+
+
+def crawl_produkt(driver, typ, url_scrape, max_retries=3):
+    """
+    Ein Produkt crawlen: URL parsen, VK-Seite öffnen, Variante klicken.
+    Returns: (preis, vk_link, gb, color) - preis -1 = 404, -2 = kein Ankauf, 0 = nicht gefunden
+    """
+    preis = 0
+    vk_link = ""
+    gb = color = None
     
-    # Browser erstellen (wird bei Bedarf neu gestartet)
-    def create_browser():
-        options = Options()
-        options.add_argument("--start-maximized")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-        
-        # Proxy verwenden
-        if PROXY:
-            options.add_argument(f"--proxy-server={PROXY}")
-        
-        driver = webdriver.Chrome(options=options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        return driver, WebDriverWait(driver, 15)
+    for retry in range(max_retries):
+        heartbeat(typ.name, url=url_scrape, retry=retry)
+        try:
+            brand, model, gb, color = typ.parser(url_scrape)
+            print(f"    Extrahiert: brand={brand}, model={model}, gb={gb}, color={color}")
+            
+            if not brand or not model:
+                print(f"    FEHLER: Modell nicht erkannt")
+                break
+            
+            vk_link = typ.vk_url(brand, model)
+            print(f"    VK URL: {vk_link}")
+            
+            driver.get(vk_link)
+            human_pause()
+            
+            preis = click_variation(driver, gb, color)
+            
+            # Erfolgreich! Retry-Schleife verlassen
+            if preis > 0:
+                break
+            elif preis == -1:
+                # Seite existiert nicht - Such-Fallback versuchen
+                print(f"      🔄 Versuche Such-Fallback...")
+                fallback_url = search_product_fallback(driver, brand, model, gb, color)
+                if fallback_url:
+                    print(f"      ✅ Fallback URL gefunden: {fallback_url}")
+                    # Erneut versuchen mit der neuen URL
+                    human_pause()
+                    preis = click_variation(driver, gb, color)
+                    if preis > 0:
+                        vk_link = fallback_url  # Update VK-Link mit gefundener URL
+                        break
+                    elif preis == -1:
+                        print(f"    FEHLER: Fallback auch 404 - überspringe")
+                        break
+                    elif preis == -2:
+                        print(f"    FEHLER: Fallback hat keine Angebote - überspringe")
+                        break
+                else:
+                    print(f"    FEHLER: Kein Fallback gefunden - überspringe")
+                    break
+            elif preis == -2:
+                # Keine Angebote - sofort überspringen
+                print(f"    ℹ️ Keine Angebote - überspringe")
+                break
+            else:
+                # preis == 0.0 - Preis nicht gefunden
+                # Nach 2 Versuchen: annehmen dass Gerät zu alt ist
+                if retry >= 1:
+                    print(f"    ℹ️ Kein Preis nach {retry+1} Versuchen - Gerät zu alt/not supported")
+                    preis = -2  # Als "keine Angebote" markieren
+                    break
+                print(f"    Preis nicht gefunden - Versuch {retry+2}/{max_retries}")
+                time.sleep(5)
+                
+        except Exception as e:
+            print(f"    FEHLER: {e} - Versuch {retry+2}/{max_retries}")
+            time.sleep(5)
+            continue
+    
+    return preis, vk_link, gb, color
+
+
+def crawl_dedupliziert(typ, pool, ziele, url_scrape, max_retries=3):
+    """
+    crawl_produkt über den ZielCache: identische (VK URL, GB, Farbe) werden nur
+    einmal besucht, weitere SKUs bekommen das Ergebnis ohne Seitenaufruf.
+    Returns: ((preis, vk_link, gb, color), neu_gecrawlt)
+    """
+    def crawl():
+        # Browser aus dem Pool leihen (Neustart alle N Produkte macht der Pool)
+        with pool.lease() as (driver, wait):
+            return crawl_produkt(driver, typ, url_scrape, max_retries=max_retries)
+    
+    try:
+        brand, model, gb, color = typ.parser(url_scrape)
+    except Exception as e:
+        # Ohne Ziel kein Dedupe - crawl_produkt behandelt den Fehler wie bisher (Retries, Preis 0)
+        print(f"    FEHLER: {e} - crawle ohne Dedupe")
+        return crawl(), True
+    if not brand or not model:
+        return crawl(), True
+    
+    key = ziel_key(typ.vk_url(brand, model), gb, color)
+    # Preis 0 = nicht gefunden -> nicht behalten, nächste SKU versucht es erneut
+    ergebnis, neu = ziele.hole_oder_crawle(key, crawl, endgueltig=lambda e: e[0] != 0)
+    if not neu:
+        print(f"    ♻️ Gleiches Ziel schon gecrawlt - übernehme Ergebnis ({ergebnis[1]})")
+    return ergebnis, neu
+
+
+def crawl_kategorie(typ, pool, ziele=None):
+    """
+    Kompletter Crawl für einen Produkt-Typ (läuft ggf. parallel zu anderen Typen).
+    ziele: gemeinsamer ZielCache (Dedupe über Typen hinweg)
+    """
+    ziele = ziele if ziele is not None else ZielCache()
+    print(f"=== VK Preis-Crawler v5.0 [{typ.name}] ===")
+    heartbeat(typ.name, phase="start")
     
-    driver, wait = create_browser()
-    print(f"[*] Browser gestartet")
+    # Eingabe wird gestreamt (eingabe.py) - kein komplettes Sheet im Speicher
+    print(f"[{typ.name}] Eingabe: {typ.input_file}")
     
     # Checkpoint laden
     start_index = 0
-    if os.path.exists(CHECKPOINT_FILE):
+    if os.path.exists(typ.checkpoint_file):
         try:
-            with open(CHECKPOINT_FILE, 'r') as f:
+            with open(typ.checkpoint_file, 'r') as f:
                 start_index = int(f.read().strip())
-            print(f"[*] Checkpoint gefunden - starte bei Index {start_index}")
+            print(f"[{typ.name}] Checkpoint gefunden - starte bei Index {start_index}")
         except:
             pass
     
     # Bestehende Ergebnisse laden (falls vorhanden)
     all_results = []
     processed_skus = set()
-    if os.path.exists(OUTPUT_FILE):
+    if os.path.exists(typ.output_file):
         try:
-            existing_df = pd.read_excel(OUTPUT_FILE)
-            for _, r in existing_df.iterrows():
+            for r in lese_ergebnisse(typ.output_file):
                 # NUR überspringen wenn Preis > 0!
                 # Produkte mit Preis=0 werden neu gecrawlt
-                preis = r["Preis (-10%)"]
-                if preis > 0:
+                if r.preis and float(r.preis) > 0:
                     all_results.append({
-                        "VK LINK": r["VK LINK"],
-                        "SKU": r["SKU"],
-                        "Preis (-10%)": preis,
-                        "Variation": r["Variation"]
+                        "VK LINK": r.vk_link,
+                        "SKU": r.sku,
+                        "Preis (-10%)": float(r.preis),
+                        "Variation": r.variation
                     })
-                    processed_skus.add(r["SKU"])
-            print(f"[*] {len(processed_skus)} bereits verarbeitete SKUs mit Preis gefunden")
+                    processed_skus.add(r.sku)
+            print(f"[{typ.name}] {len(processed_skus)} bereits verarbeitete SKUs mit Preis gefunden")
         except:
             pass
     
-    products_processed = 0
-    
     # Bei Index starten (für Resume nach Crash)
-    df_reset = df.reset_index(drop=True)
     if start_index > 0:
-        print(f"[*] Überspringe erste {start_index} Produkte...")
+        print(f"[{typ.name}] Überspringe erste {start_index} Produkte...")
     
-    for df_idx, row in df_reset.iterrows():
+    for produkt in lese_produkte(typ.input_file):
         # Checkpoint-basiert überspringen
-        if df_idx < start_index:
+        if produkt.index < start_index:
             continue
             
-        idx = df_idx
-        sku = row['sku']
+        idx = produkt.index
+        sku = produkt.sku
         
         # Überspringe bereits verarbeitete
         if sku in processed_skus:
             continue
-        products_processed += 1
         
         # Graceful Shutdown Check am Anfang jedes Produkts
         if SHUTDOWN_REQUESTED:
-            print(f"\n⚠️ Shutdown bei Produkt {df_idx+1} - speichere Fortschritt...")
+            print(f"\n⚠️ Shutdown bei Produkt {idx+1} - speichere Fortschritt...")
             break
         
-        name = row['Name']
-        url_scrape = str(row['url scrape'])
+        name = produkt.name
+        url_scrape = str(produkt.url_scrape)
         
-        print(f"\n[{idx+1}] {name}")
+        print(f"\n[{typ.name}][{idx+1}] {name}")
+        heartbeat(typ.name, sku=sku, index=int(idx))
         
-        # Retry-Logik: Produkt bis zu 3x versuchen
-        max_retries = 3
-        preis = 0
-        
-        for retry in range(max_retries):
-            try:
-                brand, model, gb, color = extract_all_from_url(url_scrape)
-                print(f"    Extrahiert: brand={brand}, model={model}, gb={gb}, color={color}")
-                
-                if not brand or not model:
-                    print(f"    FEHLER: Modell nicht erkannt")
-                    break
-                
-                vk_link = get_vk_url(brand, model)
-                print(f"    VK URL: {vk_link}")
-                
-                driver.get(vk_link)
-                human_pause()
-                
-                preis = click_variation(driver, gb, color)
-                
-                # Erfolgreich! Retry-Schleife verlassen
-                if preis > 0:
-                    break
-                elif preis == -1:
-                    # Seite existiert nicht - Such-Fallback versuchen
-                    print(f"      🔄 Versuche Such-Fallback...")
-                    fallback_url = search_product_fallback(driver, brand, model, gb, color)
-                    if fallback_url:
-                        print(f"      ✅ Fallback URL gefunden: {fallback_url}")
-                        # Erneut versuchen mit der neuen URL
-                        human_pause()
-                        preis = click_variation(driver, gb, color)
-                        if preis > 0:
-                            vk_link = fallback_url  # Update VK-Link mit gefundener URL
-                            break
-                        elif preis == -1:
-                            print(f"    FEHLER: Fallback auch 404 - überspringe")
-                            break
-                        elif preis == -2:
-                            print(f"    FEHLER: Fallback hat keine Angebote - überspringe")
-                            break
-                    else:
-                        print(f"    FEHLER: Kein Fallback gefunden - überspringe")
-                        break
-                elif preis == -2:
-                    # Keine Angebote - sofort überspringen
-                    print(f"    ℹ️ Keine Angebote - überspringe")
-                    break
-                else:
-                    # preis == 0.0 - Preis nicht gefunden
-                    # Nach 2 Versuchen: annehmen dass Gerät zu alt ist
-                    if retry >= 1:
-                        print(f"    ℹ️ Kein Preis nach {retry+1} Versuchen - Gerät zu alt/not supported")
-                        preis = -2  # Als "keine Angebote" markieren
-                        break
-                    print(f"    Preis nicht gefunden - Versuch {retry+2}/{max_retries}")
-                    time.sleep(5)
-                    
-            except Exception as e:
-                print(f"    FEHLER: {e} - Versuch {retry+2}/{max_retries}")
-                time.sleep(5)
-                continue
+        (preis, vk_link, gb, color), neu = crawl_dedupliziert(typ, pool, ziele, url_scrape)
         
         if preis > 0:
             preis_mindert = round(preis * 0.9, 2)
@@ -712,103 +534,84 @@ def main():
         # Sofort in Excel speichern (nach jedem Produkt)
         if all_results:
             result_df = pd.DataFrame(all_results)
-            result_df.to_excel(OUTPUT_FILE, index=False)
+            result_df.to_excel(typ.output_file, index=False)
         
         # Checkpoint speichern
-        with open(CHECKPOINT_FILE, 'w') as f:
+        with open(typ.checkpoint_file, 'w') as f:
             f.write(str(idx))
         
-        # Browser-Neustart alle N Produkte (Memory Leak verhindern)
-        products_processed += 1
-        if products_processed >= MAX_PRODUCTS_BEFORE_BROWSER_RESTART:
-            print(f"\n🔄 Browser-Neustart nach {products_processed} Produkten (Memory Leak verhindern)...")
-            driver.quit()
-            driver, wait = create_browser()
-            products_processed = 0
-        
         # Graceful Shutdown prüfen
         if SHUTDOWN_REQUESTED:
             print("\n⚠️ Shutdown Signal erkannt - speichere und beende...")
             break
         
-        time.sleep(random.uniform(5, 10))
+        # Pause nur nach echtem Seitenaufruf
+        if neu:
+            time.sleep(random.uniform(5, 10))
     
     # Zweiter Durchgang: Fehlgeschlagene Produkte nochmal versuchen
-    print("\n[*] Zweiter Durchgang für fehlgeschlagene Produkte...")
+    print(f"\n[{typ.name}] Zweiter Durchgang für fehlgeschlagene Produkte...")
     failed_skus = set()
     for r in all_results:
         if r["Preis (-10%)"] == 0 or r["Preis (-10%)"] == 0.0:
             failed_skus.add(r["SKU"])
     
-    if failed_skus:
+    if failed_skus and not SHUTDOWN_REQUESTED:
         print(f"    {len(failed_skus)} Produkte werden erneut versucht...")
+        # Eigener Cache: Ergebnisse des 1. Durchgangs sollen hier neu geholt werden
+        retry_ziele = ZielCache()
         
-        for idx, row in df.iterrows():
-            sku = row['sku']
+        for produkt in lese_produkte(typ.input_file):
+            sku = produkt.sku
             if sku not in failed_skus:
                 continue
             
-            name = row['Name']
-            url_scrape = str(row['url scrape'])
+            name = produkt.name
+            url_scrape = str(produkt.url_scrape)
             
-            print(f"\n[2. Versuch] {name}")
+            print(f"\n[{typ.name}][2. Versuch] {name}")
             
-            for retry in range(2):  # 2 weitere Versuche
-                try:
-                    brand, model, gb, color = extract_all_from_url(url_scrape)
-                    if not brand or not model:
-                        break
-                    
-                    vk_link = get_vk_url(brand, model)
-                    driver.get(vk_link)
-                    human_pause()
-                    
-                    preis = click_variation(driver, gb, color)
-                    
-                    if preis > 0:
-                        preis_mindert = round(preis * 0.9, 2)
-                        variation = f"{color} {gb}" if color and gb else gb or color
-                        print(f"    Preis: {preis} EUR -> {preis_mindert} EUR [{variation}]")
-                        
-                        # Suchen und aktualisieren oder hinzufügen
-                        found = False
-                        for i, r in enumerate(all_results):
-                            if r["SKU"] == sku:
-                                all_results[i]["Preis (-10%)"] = preis_mindert
-                                all_results[i]["Variation"] = variation
-                                found = True
-                                break
-                        
-                        if not found:
-                            all_results.append({
-                                "VK LINK": vk_link,
-                                "SKU": sku,
-                                "Preis (-10%)": preis_mindert,
-                                "Variation": variation
-                            })
-                        
-                        # Sofort speichern
-                        result_df = pd.DataFrame(all_results)
-                        result_df.to_excel(OUTPUT_FILE, index=False)
+            # 2 weitere Versuche
+            (preis, vk_link, gb, color), _ = crawl_dedupliziert(typ, pool, retry_ziele, url_scrape, max_retries=2)
+            
+            if preis > 0:
+                preis_mindert = round(preis * 0.9, 2)
+                variation = f"{color} {gb}" if color and gb else gb or color
+                print(f"    Preis: {preis} EUR -> {preis_mindert} EUR [{variation}]")
+                
+                # Suchen und aktualisieren oder hinzufügen
+                found = False
+                for i, r in enumerate(all_results):
+                    if r["SKU"] == sku:
+                        all_results[i]["Preis (-10%)"] = preis_mindert
+                        all_results[i]["Variation"] = variation
+                        found = True
                         break
-                    else:
-                        time.sleep(3)
-                except Exception as e:
-                    print(f"    FEHLER: {e}")
-                    time.sleep(3)
-                    continue
+                
+                if not found:
+                    all_results.append({
+                        "VK LINK": vk_link,
+                        "SKU": sku,
+                        "Preis (-10%)": preis_mindert,
+                        "Variation": variation
+                    })
+                
+                # Sofort speichern
+                result_df = pd.DataFrame(all_results)
+                result_df.to_excel(typ.output_file, index=False)
     
     if all_results:
         result_df = pd.DataFrame(all_results)
-        result_df.to_excel(OUTPUT_FILE, index=False)
-        print(f"\nFertig! {len(all_results)} Ergebnisse: {OUTPUT_FILE}")
+        result_df.to_excel(typ.output_file, index=False)
+        print(f"\n[{typ.name}] Fertig! {len(all_results)} Ergebnisse: {typ.output_file}")
     
-    # Cleanup
-    if os.path.exists(CHECKPOINT_FILE):
-        os.remove(CHECKPOINT_FILE)  # Erfolgreich beendet - Checkpoint löschen
-    driver.quit()
-    print("[*] Browser geschlossen. Auf Wiedersehen!")
+    # Cleanup - Checkpoint nur bei vollständigem Durchlauf löschen
+    if not SHUTDOWN_REQUESTED and os.path.exists(typ.checkpoint_file):
+        os.remove(typ.checkpoint_file)
+    return len(all_results)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Alter Aufruf `python crawler_handy.py` -> gleicher Einstieg wie crawler_cli.py
+    from crawler_cli import main
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Deduplizierung identischer Crawl-Ziele
+
+Verschiedene SKUs (z.B. Dubletten in Handy- und Tablet-Sheet oder
+Listing-Varianten) landen oft auf exakt derselben (VK URL, GB, Farbe).
+Jedes Ziel wird nur EINMAL gecrawlt; alle weiteren SKUs bekommen das
+Ergebnis ohne Seitenaufruf. Thread-sicher, damit parallel laufende
+Produkt-Typen denselben Cache teilen (läuft ein Ziel gerade in einem anderen
+Thread, wird auf dessen Ergebnis gewartet statt doppelt zu crawlen).
+"""
+
+import threading
+from concurrent.futures import Future
+
+from variant_matcher import normalize_label, parse_storage_gb
+
+
+def ziel_key(vk_url, gb, color):
+    """(VK URL, GB, Farbe) normalisiert - '128GB' == '128 GB', 'Weiß' == 'weiss'"""
+    gb_norm = parse_storage_gb(str(gb or '').replace(' ', '')) if gb else None
+    return (vk_url.rstrip('/').lower(), gb_norm, normalize_label(color))
+
+
+class ZielCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ziele = {}
+        self.seitenaufrufe = 0   # tatsächlich gecrawlte Ziele
+        self.gespart = 0         # SKUs die ein vorhandenes Ergebnis bekamen
+
+    def hole_oder_crawle(self, key, crawl_fn, endgueltig=lambda ergebnis: True):
+        """
+        Ergebnis für `key` liefern - nur der erste Aufrufer führt crawl_fn() aus.
+        Returns: (ergebnis, neu_gecrawlt)
+
+        Ergebnisse für die endgueltig(ergebnis) False ist (z.B. Preis nicht
+        gefunden) werden nicht behalten - die nächste SKU versucht es erneut.
+        """
+        with self._lock:
+            fut = self._ziele.get(key)
+            eigener = fut is None
+            if eigener:
+                fut = Future()
+                self._ziele[key] = fut
+                self.seitenaufrufe += 1
+
+        if not eigener:
+            ergebnis = fut.result()
+            with self._lock:
+                self.gespart += 1
+            return ergebnis, False
+
+        try:
+            ergebnis = crawl_fn()
+        except BaseException as e:
+            with self._lock:
+                self._ziele.pop(key, None)
+            fut.set_exception(e)
+            raise
+        if not endgueltig(ergebnis):
+            with self._lock:
+                self._ziele.pop(key, None)
+        fut.set_result(ergebnis)
+        return ergebnis, True
+
+    def bericht(self):
+        return f"Dedupe: {self.seitenaufrufe} Ziele gecrawlt, {self.gespart} Seitenaufrufe gespart"
@@ -0,0 +1,104 @@
+"""
+Streaming-Eingabe für große Produkt-Listen
+
+Statt pd.read_excel() + iterrows() (ganzes Sheet im Speicher, jede Zeile als
+Series) werden die Zeilen einzeln gelesen und nur die benötigten Spalten in
+kompakte Records (namedtuple) projiziert. Der Crawl-Loop konsumiert lazy.
+
+Formate (nach Dateiendung):
+- .xlsx / .xlsm  -> openpyxl read_only
+- .csv           -> csv-Modul (, ; oder Tab)
+- .parquet       -> pyarrow, batchweise nur die benötigten Spalten
+"""
+
+import csv
+import os
+from collections import namedtuple
+
+# Feld im Record -> Spaltenname im Sheet
+PRODUKT_SPALTEN = {"sku": "sku", "name": "Name", "url_scrape": "url scrape"}
+ERGEBNIS_SPALTEN = {"vk_link": "VK LINK", "sku": "SKU", "preis": "Preis (-10%)", "variation": "Variation"}
+
+Produkt = namedtuple("Produkt", ["index"] + list(PRODUKT_SPALTEN))
+Ergebnis = namedtuple("Ergebnis", ["index"] + list(ERGEBNIS_SPALTEN))
+
+
+def _spalten_index(header, spalten, pfad):
+    """Spaltennamen (case-insensitiv) -> Positionen in der Kopfzeile"""
+    positionen = {str(h).strip().lower(): i for i, h in enumerate(header) if h is not None}
+    fehlend = [name for name in spalten.values() if name.lower() not in positionen]
+    if fehlend:
+        raise ValueError(f"{os.path.basename(pfad)}: Spalte(n) fehlen: {', '.join(fehlend)}")
+    return [positionen[name.lower()] for name in spalten.values()]
+
+
+def _zeilen_xlsx(pfad):
+    from openpyxl import load_workbook
+    wb = load_workbook(pfad, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _zeilen_csv(pfad):
+    with open(pfad, newline='', encoding='utf-8-sig') as f:
+        # Trennzeichen aus der Kopfzeile (Excel-DE exportiert mit ";")
+        kopf = f.readline()
+        f.seek(0)
+        trenner = max(",;\t", key=kopf.count)
+        yield from csv.reader(f, delimiter=trenner)
+
+
+def _zeilen_parquet(pfad, spalten):
+    import pyarrow.parquet as pq
+    datei = pq.ParquetFile(pfad)
+    # Nur die benötigten Spalten lesen (Namen wie im Schema, Groß/Klein egal)
+    schema = {name.lower(): name for name in datei.schema_arrow.names}
+    gewuenscht = [schema.get(name.lower(), name) for name in spalten.values()]
+    yield gewuenscht
+    for batch in datei.iter_batches(columns=gewuenscht, batch_size=2048):
+        yield from zip(*(batch.column(i).to_pylist() for i in range(batch.num_columns)))
+
+
+def lese_zeilen(pfad, spalten, record=None):
+    """
+    Generator über die Zeilen von `pfad`, projiziert auf `spalten`
+    (dict feld -> Spaltenname). Leere Zeilen werden übersprungen, der index
+    zählt sie aber mit (Zeilennummer im Sheet = index + 2).
+    """
+    record = record or namedtuple("Zeile", ["index"] + list(spalten))
+    endung = os.path.splitext(pfad)[1].lower()
+    if endung in (".xlsx", ".xlsm"):
+        zeilen = _zeilen_xlsx(pfad)
+    elif endung == ".csv":
+        zeilen = _zeilen_csv(pfad)
+    elif endung == ".parquet":
+        zeilen = _zeilen_parquet(pfad, spalten)
+    else:
+        raise ValueError(f"Nicht unterstütztes Eingabeformat: {endung} ({pfad})")
+
+    try:
+        header = next(zeilen, None)
+        if header is None:
+            return
+        positionen = _spalten_index(header, spalten, pfad)
+        # index = physische Datenzeile (0 = erste Zeile unter dem Header); leere Zeilen
+        # zählen mit, damit Checkpoints beim Fortsetzen auf dieselbe Zeile zeigen
+        for index, zeile in enumerate(zeilen):
+            werte = [zeile[i] if i < len(zeile) else None for i in positionen]
+            if all(w is None or w == "" for w in werte):
+                continue
+            yield record(index, *werte)
+    finally:
+        zeilen.close()
+
+
+def lese_produkte(pfad):
+    """Produkt(index, sku, name, url_scrape) - lazy"""
+    return lese_zeilen(pfad, PRODUKT_SPALTEN, Produkt)
+
+
+def lese_ergebnisse(pfad):
+    """Ergebnis(index, vk_link, sku, preis, variation) - lazy"""
+    return lese_zeilen(pfad, ERGEBNIS_SPALTEN, Ergebnis)
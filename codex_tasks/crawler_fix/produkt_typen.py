@@ -0,0 +1,86 @@
+"""
+Produkt-Typen (Plugins) für den VK Preis-Crawler
+
+Jeder Typ deklariert:
+- Input-/Output-Excel (relativ zum Daten-Ordner)
+- URL-Pfad auf verkaufen.de (/handy-verkaufen/, /tablet-verkaufen/, ...)
+- Parser für die "url scrape" Spalte -> (brand, model, gb, color)
+
+Neuer Typ = ein register_produkt_typ(...) Aufruf, z.B. in einem eigenen Modul
+das per `crawler_cli.py --plugin mein_modul` geladen wird. Kein Editieren von
+PRODUKT_TYP / F:-Pfaden im Crawler mehr.
+"""
+
+import os
+
+from url_parser import extract_all_from_url, MODEL_URL_MAP
+
+VERKAUFEN_BASE = "https://www.verkaufen.de"
+
+# Daten-Ordner: per --data-dir oder Umgebungsvariable überschreibbar
+DATA_DIR = os.environ.get("CRAWLER_DATA_DIR", "F:/crawlerv5")
+
+PRODUKT_TYPEN = {}
+
+
+class ProduktTyp:
+    """Ein Produkt-Typ (handy, tablet, ...) mit Dateien, URL-Schema und Parser"""
+
+    def __init__(self, name, input_name, output_name, url_pfad, parser,
+                 url_map=None, checkpoint_name=None):
+        self.name = name
+        self.input_name = input_name
+        self.output_name = output_name
+        self.url_pfad = url_pfad.strip("/")
+        self.parser = parser
+        self.url_map = url_map or {}
+        self.checkpoint_name = checkpoint_name or f"crawler_checkpoint_{name}.txt"
+
+    @property
+    def input_file(self):
+        return os.path.join(DATA_DIR, self.input_name)
+
+    @property
+    def output_file(self):
+        return os.path.join(DATA_DIR, self.output_name)
+
+    @property
+    def checkpoint_file(self):
+        return os.path.join(DATA_DIR, self.checkpoint_name)
+
+    def vk_url(self, brand, model):
+        # Prüfe ob Modell ein Mapping hat
+        url_model = self.url_map.get(model, model)
+        return f"{VERKAUFEN_BASE}/{self.url_pfad}/{brand}/{url_model}/"
+
+    def __repr__(self):
+        return f"ProduktTyp({self.name!r}, /{self.url_pfad}/)"
+
+
+def register_produkt_typ(name, input_name, output_name, url_pfad, parser=extract_all_from_url, **kwargs):
+    typ = ProduktTyp(name, input_name, output_name, url_pfad, parser, **kwargs)
+    PRODUKT_TYPEN[name] = typ
+    return typ
+
+
+def get_produkt_typ(name):
+    try:
+        return PRODUKT_TYPEN[name]
+    except KeyError:
+        raise ValueError(f"Unbekannter Produkt-Typ '{name}' (verfügbar: {', '.join(sorted(PRODUKT_TYPEN))})")
+
+
+def set_data_dir(path):
+    global DATA_DIR
+    DATA_DIR = path
+
+
+# === Eingebaute Typen ===
+# handy behält den alten Checkpoint-Namen (crawler_wrapper.py liest ihn)
+register_produkt_typ("handy", "RELEASE_handy.xlsx", "RELEASE_handy_ergebnis.xlsx",
+                     "/handy-verkaufen/", url_map=MODEL_URL_MAP,
+                     checkpoint_name="crawler_checkpoint.txt")
+register_produkt_typ("tablet", "RELEASE_tablet.xlsx", "RELEASE_tablet_ergebnis.xlsx",
+                     "/tablet-verkaufen/")
+register_produkt_typ("smartwatch", "RELEASE_smartwatch.xlsx", "RELEASE_smartwatch_ergebnis.xlsx",
+                     "/smartwatch-verkaufen/")
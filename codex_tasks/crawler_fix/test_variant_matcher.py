@@ -0,0 +1,20 @@
+from variant_matcher import MIN_CONFIDENCE, VariantIndex
+
+
+def _resolve(labels, color):
+    match = VariantIndex([(label, label) for label in labels]).resolve_color(color)
+    return match if match and match.confidence >= MIN_CONFIDENCE else None
+
+
+def test_gemeinsames_serienwort_ist_kein_treffer():
+    assert _resolve(['Titan Weiss', 'Titan Blau'], 'Titan Schwarz') is None
+
+
+def test_andere_kanonische_farbe_wird_verworfen():
+    assert _resolve(['Sierra Gold', 'Graphit'], 'Sierra Blau') is None
+
+
+def test_alias_und_fuzzy_treffen_weiterhin():
+    assert _resolve(['Sierra Blue', 'Gold'], 'Sierra Blau').label == 'Sierra Blue'
+    assert _resolve(['Titan Wuestengold', 'Titan Natur'], 'Titan Wüstengold').label == 'Titan Wuestengold'
+    assert _resolve(['Titan Natur'], 'Titan Naturell').label == 'Titan Natur'
@@ -0,0 +1,171 @@
+"""
+URL-Parser für handyverkauf.net Links
+
+Extrahiert Marke, Modell, GB und Farbe aus der "url scrape" Spalte.
+Ohne Selenium/pandas - wird von allen Produkt-Typen (produkt_typen.py) genutzt.
+"""
+
+import re
+
+# URL-Mapping für Modelle die nicht mehr unter alter URL existieren
+# Format: "alter_model_name": "neue_url_suffix"
+MODEL_URL_MAP = {
+    # Galaxy Z Fold Serie - KORREKTE URLs (keine Bindestriche!)
+    "galaxyzfold4": "galaxyzfold45g",  # 5G Version
+    "galaxyzfold44g": "galaxyzfold44g",  # 4G Version
+    "galaxyzfold3": "galaxyzfold35g",
+    "galaxyzfold2": "galaxyzfold25g",
+    "galaxyzfold": "galaxyzfold5g",
+    # Galaxy Z Flip Serie - KORREKTE URLs
+    "galaxyzflip4": "galaxyzflip4",
+    "galaxyzflip3": "galaxyzflip3",
+    "galaxyzflip": "galaxyzflip",
+    # Apple iPhone Plus Serie - "+" -> "plus"
+    "iphone14+": "iphone14plus",
+    "iphone13+": "iphone13plus",
+    "iphone12+": "iphone12plus",
+}
+
+
+def extract_all_from_url(url):
+    """
+    Extrahiert: Marke, Modell, GB, Farbe aus handyverkauf.net URL
+    Bsp: https://www.handyverkauf.net/apple-iphone-14-128gb-blau_h_10788
+    -> brand=apple, model=iphone14, gb=128gb, color=blau
+    """
+    match = re.search(r'net/([a-z0-9-]+)_h_', url)
+    if not match:
+        return None, None, None, None
+    
+    name = match.group(1)  # apple-iphone-14-128gb-blau
+    parts = name.split('-')
+    
+    brand = parts[0]
+    model = None
+    gb = None
+    color = None
+    
+    # Farben-Mapping
+    color_map = {
+        'blau': 'Blau',
+        'mitternacht': 'Mitternacht',
+        'polarstern': 'Polarstern',
+        'rot': '(PRODUCT) Red Special Edition',
+        'violett': 'Violett',
+        'gelb': 'Gelb',
+        'schwarz': 'Schwarz',
+        'weiss': 'Weiss',
+        'grau': 'Grau',
+        'silber': 'Silber',
+        'gold': 'Gold',
+        'rose': 'Rose',
+        'gruen': 'Gruen',
+        'space': 'Space Schwarz',
+        'graphit': 'Graphit',
+    }
+    
+    for i, p in enumerate(parts):
+        # Auch Modelle mit Buchstaben erkennen (s22, a54, etc.)
+        if p.isdigit() or (any(c.isalpha() for c in p) and any(c.isdigit() for c in p)):
+            # Modell
+            if i > 0:
+                model_base = parts[i-1]
+                
+                # SPEZIALFALL: "thinkphone256gb" - GB ist im gleichen Wort wie Zahl
+                # Extrahiere Zahl und GB aus dem Teil
+                if 'gb' in p.lower() or 'tb' in p.lower():
+                    # Trenne "256gb" in "256" und "gb"
+                    num_match = re.search(r'(\d+)', p)
+                    if num_match:
+                        model_num = num_match.group(1)
+                        has_gb = True  # GB ist in diesem Teil
+                    else:
+                        model_num = p
+                        has_gb = False
+                else:
+                    model_num = p
+                    has_gb = False
+                
+                suffix = '-'.join(parts[i+1:]) if i+1 < len(parts) else ''
+                
+                model = model_base + model_num
+                
+                # Wenn GB im model_num war, als suffix merken für später
+                if has_gb:
+                    suffix = 'gb' + ('-' + suffix if suffix else '')
+                
+                # Spezielle Modelle: flip, z, fold erkennen (auch im model_base!)
+                if model_base in ['flip', 'z'] or 'flip' in model_base:
+                    model = 'galaxyzflip' + model_num
+                elif 'fold' in model_base:
+                    model = 'galaxyzfold' + model_num
+                elif model_base in ['ultra']:
+                    # ultra ist schon im model_base (z.B. von "s22ultra"), nichts tun
+                    pass
+                elif model_base in ['duo', 'surface'] and 'duo' in model_base:
+                    # Surface Duo - nur "duo" als Modellname!
+                    model = 'duo'
+                elif model_base in ['xiaomi', 'mi'] and brand in ['xiaomi', 'mi']:
+                    # Xiaomi/MI特殊情况: "xiaomi 13 pro" -> "mi13pro" NICHT "xiaomi13pro"
+                    model = 'mi' + model_num
+                elif 'ultra' in suffix:
+                    model += 'ultra'
+                elif 'pro' in suffix:
+                    if 'max' in suffix:
+                        model += 'promax'
+                    else:
+                        model += 'pro'
+                elif 'max' in suffix:
+                    model += 'max'
+                elif 'plus' in suffix:
+                    model += '+'  # "plus" wird zu "+"!
+                elif 'mini' in suffix:
+                    model += 'mini'
+                elif 'flip' in suffix:
+                    model = 'galaxyzflip' + model_num  # flip -> galaxyzflip!
+                elif 'plus' in suffix:
+                    model += 'plus'
+                elif 'air' in suffix:
+                    model += 'air'
+                
+                # GB und Farbe finden (alle in einem Durchlauf!)
+                remaining = parts[i+1:] if i+1 < len(parts) else []
+                
+                # ALLE Modell-Suffixes aus remaining entfernen!
+                # Diese Wörter sind Teil des Modellnamens, keine Farben!
+                model_suffix = ['pro', 'max', 'mini', 'plus', 'air', 'ultra', 'promax', 'flip', 'z', '5g', '4g', '5g+', '4g+', 'se', 'fe', 'ee', 'sm', 'sm-a', 'sm-', 'a0', 'a1', 'a2', 'a3', 'a4', 'a5', 'a6', 'a7', 'a8', 'a9', 'gb', 'tb', 'lite', 'lite5g', 'pro5g']
+                remaining = [p for p in remaining if p.lower() not in model_suffix and not p.lower().startswith('sm-') and not p.lower().startswith('sm-a')]
+                
+                # SPEZIALFALL: GB im Modellnamen (z.B. "thinkphone256gb")
+                # Extrahiere GB aus model_num falls vorhanden
+                if has_gb and not gb:
+                    num_match = re.search(r'(\d+)\s*(gb|tb)', p.lower())
+                    if num_match:
+                        gb = num_match.group(1).upper() + num_match.group(2).upper()
+                        model = model  # Modell ohne GB behalten
+                
+                for part in remaining:
+                    part_lower = part.lower()
+                    
+                    # GB finden (aber NICHT abbrechen!)
+                    if not gb:
+                        if 'gb' in part_lower:
+                            gb = part.upper()
+                        elif 'tb' in part_lower:
+                            gb = part.upper()
+                    
+                    # Farbe finden - erst aus Map, sonst aus URL (dynamisch)
+                    # WICHTIG: Nur Farbe setzen wenn es KEIN GB/TB ist!
+                    if not color and 'gb' not in part_lower and 'tb' not in part_lower:
+                        # Versuche erst die color_map
+                        for color_key, color_value in color_map.items():
+                            if color_key in part_lower:
+                                color = color_value
+                                break
+                        # Wenn nicht in Map: nimm den Teil direkt (z.B. "graphit" -> "Graphit")
+                        if not color and not part.isdigit():
+                            color = part.capitalize()
+            
+            break
+    
+    return brand, model, gb, color
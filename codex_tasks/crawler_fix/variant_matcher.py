@@ -0,0 +1,184 @@
+"""
+Varianten-Matcher für die verkaufen.de Konfigurations-Buttons
+
+Statt bei jedem Button per Teilstring zu raten ("128" in "1128"), werden die
+Button-Texte EINMAL pro Seite normalisiert und in einen Index gelegt:
+- Speicher: exakte GB-Zahl (1 TB = 1024 GB)
+- Farbe: normalisierter Text + kanonische Farbe (über Alias-Tabelle)
+
+Auflösung: erst exakter Lookup, dann gewichteter Fuzzy-Fallback mit Konfidenz.
+"""
+
+import re
+from difflib import SequenceMatcher
+
+# Farb-Alias-Mapping (kanonisch -> Deutsch + Englisch Synonyme)
+COLOR_ALIASES = {
+    'schwarz': ['schwarz', 'black', 'phantom black', 'midnight', 'mitternacht', 'onyx', 'space schwarz'],
+    'weiss': ['weiss', 'white', 'pearl', 'glacier', 'polar', 'polarstern', 'starlight'],
+    'blau': ['blau', 'blue', 'ocean', 'sky', 'navy', 'pacific', 'azure'],
+    'grau': ['grau', 'gray', 'grey', 'graphit', 'graphite', 'titanium', 'space grey', 'space grau'],
+    'silber': ['silber', 'silver', 'platinum'],
+    'gold': ['gold', 'golden', 'champagne'],
+    'rot': ['rot', 'red', '(product) red', 'product red', 'coral', 'burgundy', 'bordeaux'],
+    'gruen': ['gruen', 'green', 'mint', 'olive', 'forest', 'emerald'],
+    'violett': ['violett', 'purple', 'violet', 'lavender', 'aurora', 'lila'],
+    'gelb': ['gelb', 'yellow'],
+    'rose': ['rose', 'pink', 'rose gold', 'blush', 'rosa'],
+    'lime': ['lime', 'lime green'],
+    'orange': ['orange', 'apricot', 'sunset'],
+    'beige': ['beige', 'cream', 'ivory', 'pearl'],
+    'braun': ['braun', 'brown', 'bronze', 'copper'],
+    'cyan': ['cyan', 'turquoise', 'teal'],
+}
+
+# Unter diesen Werten wird NICHT geklickt (lieber kein Klick als falsche Variante)
+MIN_CONFIDENCE = 0.6
+MIN_STORAGE_GB = 32
+
+_UMLAUTE = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+_STORAGE_RE = re.compile(r'^(\d+(?:[.,]\d+)?)\s*(gb|tb)?$')
+
+
+def normalize_label(text):
+    """'Weiß (Product) RED ' -> 'weiss (product) red'"""
+    text = (text or '').lower().translate(_UMLAUTE)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def parse_storage_gb(text):
+    """
+    '128 GB' -> 128, '1TB' -> 1024, '256' -> 256, sonst None.
+    Nur wenn der GANZE Text eine Speicherangabe ist - "iPhone 12" ist keine.
+    """
+    match = _STORAGE_RE.match(normalize_label(text))
+    if not match:
+        return None
+    num = float(match.group(1).replace(',', '.'))
+    if match.group(2) == 'tb':
+        num *= 1024
+    gb = int(num)
+    return gb if gb >= MIN_STORAGE_GB else None
+
+
+def _words(text):
+    return re.findall(r'[a-z0-9()]+', text)
+
+
+# Alias (als Wort-Tupel) -> kanonische Farbe, einmal beim Import gebaut.
+# Erster Eintrag gewinnt ('pearl' -> weiss), wie in der alten Schleife.
+_ALIAS_INDEX = {}
+for _canon, _aliases in COLOR_ALIASES.items():
+    for _alias in _aliases:
+        _ALIAS_INDEX.setdefault(tuple(_words(normalize_label(_alias))), _canon)
+_MAX_ALIAS_LEN = max(len(k) for k in _ALIAS_INDEX)
+
+
+def canonical_color(text):
+    """
+    Kanonische Farbe über Wort-Grenzen (kein Teilstring!).
+    'Space Schwarz' -> schwarz, 'Sierra Blue' -> blau, 'Rotgold' -> None
+    """
+    words = _words(normalize_label(text))
+    # Längste Alias-Folge zuerst ("phantom black" vor "black")
+    for size in range(min(_MAX_ALIAS_LEN, len(words)), 0, -1):
+        for i in range(len(words) - size + 1):
+            canon = _ALIAS_INDEX.get(tuple(words[i:i + size]))
+            if canon:
+                return canon
+    return None
+
+
+class VariantMatch:
+    """Ergebnis einer Auflösung: Button + Text + Konfidenz (0..1)"""
+
+    def __init__(self, element, label, confidence, method):
+        self.element = element
+        self.label = label
+        self.confidence = confidence
+        self.method = method
+
+    def __repr__(self):
+        return f"VariantMatch({self.label!r}, {self.confidence:.2f}, {self.method})"
+
+
+class VariantIndex:
+    """
+    Index über die Konfigurations-Buttons EINER Seite.
+
+    Einmal pro Seite bauen (VariantIndex.from_buttons), dann beliebig oft
+    resolve_storage/resolve_color aufrufen - keine verschachtelten Schleifen mehr.
+    """
+
+    def __init__(self, options):
+        # options: Liste von (label, element)
+        self.storage = {}    # gb -> (label, element)
+        self.colors = {}     # normalisierter Text -> (label, element)
+        self.canonical = {}  # kanonische Farbe -> [(label, element), ...]
+        self.canon_of = {}   # normalisierter Text -> kanonische Farbe (oder None)
+        for label, element in options:
+            label = (label or '').strip()
+            if not label:
+                continue
+            gb = parse_storage_gb(label)
+            if gb is not None:
+                self.storage.setdefault(gb, (label, element))
+                continue
+            norm = normalize_label(label)
+            self.colors.setdefault(norm, (label, element))
+            canon = canonical_color(label)
+            self.canon_of.setdefault(norm, canon)
+            if canon:
+                self.canonical.setdefault(canon, []).append((label, element))
+
+    @classmethod
+    def from_buttons(cls, buttons):
+        """Selenium-Buttons -> Index (btn.text wird genau einmal gelesen)"""
+        return cls([(btn.text, btn) for btn in buttons])
+
+    def resolve_storage(self, gb):
+        """'128GB' / '1TB' / 128 -> VariantMatch oder None (nur exakt!)"""
+        target = gb if isinstance(gb, int) else parse_storage_gb(str(gb or '').replace(' ', ''))
+        if target is None or target not in self.storage:
+            return None
+        label, element = self.storage[target]
+        return VariantMatch(element, label, 1.0, 'exakt')
+
+    def resolve_color(self, color):
+        """Farbe -> VariantMatch oder None. Exakt > Alias > Fuzzy."""
+        norm = normalize_label(color)
+        if not norm:
+            return None
+
+        # 1) Exakter Text
+        if norm in self.colors:
+            label, element = self.colors[norm]
+            return VariantMatch(element, label, 1.0, 'exakt')
+
+        # 2) Gleiche kanonische Farbe - bei mehreren den ähnlichsten Text nehmen
+        canon = canonical_color(color)
+        candidates = self.canonical.get(canon, []) if canon else []
+        if candidates:
+            label, element = max(candidates, key=lambda c: _ratio(norm, c[0]))
+            confidence = 0.9 if len(candidates) == 1 else 0.75 + 0.15 * _ratio(norm, label)
+            return VariantMatch(element, label, confidence, 'alias')
+
+        # 3) Fuzzy-Fallback über alle Farb-Texte. Ein gemeinsames Modell-/Serienwort
+        # ("Titan", "Sierra", "Pro") reicht nicht: nur die Textähnlichkeit zählt, und
+        # eine andere kanonische Farbe scheidet ganz aus ("Titan Schwarz" != "Titan Weiss")
+        best = None
+        best_score = 0.0
+        for option_norm, (label, element) in self.colors.items():
+            option_canon = self.canon_of.get(option_norm)
+            if canon and option_canon and option_canon != canon:
+                continue
+            score = _ratio(norm, option_norm)
+            if score > best_score:
+                best, best_score = (label, element), score
+        if best is None:
+            return None
+        return VariantMatch(best[1], best[0], round(best_score * 0.85, 2), 'fuzzy')
+
+
+def _ratio(a, b):
+    return SequenceMatcher(None, normalize_label(a), normalize_label(b)).ratio()
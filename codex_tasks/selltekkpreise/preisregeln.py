@@ -0,0 +1,210 @@
+"""
+Preisregeln: deklarativ in preisregeln.json, einmal kompiliert, spaltenweise angewendet
+
+    Preis = Basis x Zustand x Marke x Speicher-Stufe -> Grenzen (min/max) -> Rundung
+    Basis = Idealo-Preis x rabatt_faktor, ohne Idealo-Preis die Fallback-Staffel
+            basis + ((GB - basis_gb) // stufe_gb) * stufe_preis
+
+Rundung:
+    "cent"   auf 2 Nachkommastellen (bisheriges Verhalten)
+    "ganz"   auf volle Euro abrunden
+    "charm"  auf die nächstkleinere Zahl mit Endziffer `endung` (283,40 -> 279 bei endung 9)
+
+Die mitgelieferte preisregeln.json entspricht exakt den bisherigen Preisen
+(30% Rabatt, alle Zustände gleich). Der Crawler (Preis -10%) ist davon getrennt.
+
+Vorschau der Preisverteilung vor dem Upload:
+    python preisregeln.py preview output/test_variable.json
+    python preisregeln.py preview output/test_variable.json --regeln preisregeln_test.json
+"""
+
+import os
+import sys
+import json
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STANDARD_DATEI = os.path.join(BASE_DIR, "preisregeln.json")
+
+STANDARD_REGELN = {
+    "rabatt_faktor": 0.7,
+    "zustand": {},
+    "marken": {"default": 1.0},
+    "speicher_stufen": [],
+    "fallback": {"basis": 500, "basis_gb": 256, "stufe_gb": 256, "stufe_preis": 100, "default_gb": 256},
+    "grenzen": {"min": None, "max": None},
+    "rundung": {"modus": "cent", "endung": 9},
+}
+RUNDUNGEN = ("cent", "ganz", "charm")
+
+
+class PreisEvaluator:
+    """Kompilierte Preisregeln - preise() arbeitet auf ganzen Spalten"""
+
+    def __init__(self, regeln: dict, quelle: str = "eingebaut"):
+        r = {**STANDARD_REGELN, **{k: v for k, v in regeln.items() if not k.startswith("_")}}
+        self.quelle = quelle
+        self.rabatt = float(r["rabatt_faktor"])
+        self.zustand = {str(k): float(v) for k, v in r["zustand"].items()}
+        marken = {str(k).lower(): float(v) for k, v in r["marken"].items()}
+        self.marke_default = marken.pop("default", 1.0)
+        self.marken = marken
+
+        stufen = sorted(r["speicher_stufen"], key=lambda s: s["ab_gb"])
+        self.stufen_gb = np.array([s["ab_gb"] for s in stufen], dtype=float)
+        self.stufen_faktor = np.array([1.0] + [float(s["faktor"]) for s in stufen])
+
+        self.fallback = {**STANDARD_REGELN["fallback"], **r["fallback"]}
+        grenzen = {**STANDARD_REGELN["grenzen"], **(r["grenzen"] or {})}
+        self.min = grenzen["min"]
+        self.max = grenzen["max"]
+        rundung = {**STANDARD_REGELN["rundung"], **(r["rundung"] or {})}
+        self.rundung = rundung["modus"]
+        self.endung = int(rundung["endung"])
+
+        if self.rundung not in RUNDUNGEN:
+            raise ValueError(f"Preisregeln ({quelle}): Rundung '{self.rundung}' unbekannt ({', '.join(RUNDUNGEN)})")
+        faktoren = [self.rabatt, self.marke_default, *self.zustand.values(), *self.marken.values(),
+                    *self.stufen_faktor]
+        if any(f <= 0 for f in faktoren):
+            raise ValueError(f"Preisregeln ({quelle}): Faktoren müssen > 0 sein")
+        if self.min is not None and self.max is not None and self.min > self.max:
+            raise ValueError(f"Preisregeln ({quelle}): min > max")
+        if not 0 <= self.endung <= 9:
+            raise ValueError(f"Preisregeln ({quelle}): endung muss 0-9 sein")
+
+    def _runden(self, preis: np.ndarray) -> np.ndarray:
+        if self.rundung == "ganz":
+            return np.floor(preis)
+        if self.rundung == "charm":
+            charm = np.floor((preis - self.endung) / 10) * 10 + self.endung
+            return np.where(charm > 0, charm, np.floor(preis))
+        return np.round(preis, 2)
+
+    def preise(self, idealo, gb, zustand, marke) -> dict:
+        """
+        Alle Eingaben als gleich lange Arrays/Series.
+        Returns: {"preis", "fallback" (bool), "begrenzt" (bool)} als numpy-Arrays
+        """
+        idealo = np.asarray(idealo, dtype=float)
+        gb = np.asarray(gb, dtype=float)
+        gb = np.where(np.isnan(gb), self.fallback["default_gb"], gb)
+
+        fb = self.fallback
+        fallback_preis = fb["basis"] + ((gb - fb["basis_gb"]) // fb["stufe_gb"]) * fb["stufe_preis"]
+        ist_fallback = ~(idealo > 0)
+        basis = np.where(ist_fallback, fallback_preis, idealo * self.rabatt)
+
+        f_zustand = pd.Series(zustand).map(self.zustand).fillna(1.0).to_numpy()
+        f_marke = pd.Series(marke).astype(str).str.lower().map(self.marken).fillna(self.marke_default).to_numpy()
+        f_stufe = self.stufen_faktor[np.searchsorted(self.stufen_gb, gb, side="right")]
+
+        preis = basis * f_zustand * f_marke * f_stufe
+        roh = preis
+        if self.min is not None or self.max is not None:
+            preis = np.clip(preis, self.min, self.max)
+        preis = self._runden(preis)
+        if self.min is not None:
+            preis = np.maximum(preis, self.min)
+        return {"preis": preis, "fallback": ist_fallback, "begrenzt": preis != self._runden(roh)}
+
+    def anwenden(self, df: pd.DataFrame) -> pd.Series:
+        """Preis-Spalte für die Planungs-Matrix (idealo_preis, speicher_gb, zustand, marke)"""
+        ergebnis = self.preise(df["idealo_preis"], df["speicher_gb"], df["zustand"], df["marke"])
+        return pd.Series(ergebnis["preis"], index=df.index)
+
+
+_cache = {}
+_aktive_datei = None
+
+
+def laden(pfad: str) -> PreisEvaluator:
+    """Regeldatei kompilieren (gecacht bis sich die Datei ändert)"""
+    stempel = os.path.getmtime(pfad)
+    if pfad not in _cache or _cache[pfad][0] != stempel:
+        with open(pfad, "r", encoding="utf-8") as f:
+            _cache[pfad] = (stempel, PreisEvaluator(json.load(f), quelle=os.path.basename(pfad)))
+    return _cache[pfad][1]
+
+
+def set_regeln_datei(pfad: str):
+    global _aktive_datei
+    if not os.path.exists(pfad):
+        raise ValueError(f"Preisregeln nicht gefunden: {pfad}")
+    laden(pfad)  # Fehler in der Datei sofort melden, nicht erst mitten im Upload
+    _aktive_datei = pfad
+
+
+def standard() -> PreisEvaluator:
+    """Aktive Regeln: set_regeln_datei() > preisregeln.json > eingebaute Defaults"""
+    pfad = _aktive_datei or STANDARD_DATEI
+    if os.path.exists(pfad):
+        return laden(pfad)
+    return _cache.setdefault(None, (0, PreisEvaluator(STANDARD_REGELN)))[1]
+
+
+# ============================================================
+# VORSCHAU
+# ============================================================
+
+def _histogramm(preise: pd.Series, breite: int = 40, klassen: int = 10) -> list:
+    if preise.empty:
+        return []
+    zaehler, kanten = np.histogram(preise, bins=klassen)
+    groesste = max(zaehler.max(), 1)
+    return [f"  {kanten[i]:8.2f} - {kanten[i+1]:8.2f} | {'#' * int(round(z / groesste * breite)):<{breite}} {z}"
+            for i, z in enumerate(zaehler)]
+
+
+def preview(produkte: list, evaluator: PreisEvaluator):
+    from woo_plan import baue_matrix
+    df = baue_matrix(produkte, [f"P{i}" for i in range(len(produkte))], evaluator)
+    details = evaluator.preise(df["idealo_preis"], df["speicher_gb"], df["zustand"], df["marke"])
+
+    print(f"[PREISE] Regeln: {evaluator.quelle} | {len(produkte)} Produkte, {len(df)} Variationen")
+    print(f"[PREISE] Fallback-Staffel (kein Idealo-Preis): {int(details['fallback'].sum())} | "
+          f"durch min/max begrenzt: {int(details['begrenzt'].sum())}")
+    mit_idealo = df[df["idealo_preis"] > 0]
+    if len(mit_idealo):
+        verhaeltnis = (mit_idealo["preis"] / mit_idealo["idealo_preis"]).mean()
+        print(f"[PREISE] Ø Preis / Idealo: {verhaeltnis:.1%}")
+
+    stats = df.groupby("zustand", sort=False)["preis"].describe(percentiles=[.25, .5, .75])
+    print()
+    print(stats[["count", "min", "25%", "50%", "75%", "max", "mean"]].round(2).to_string())
+    print("\nVerteilung (alle Zustände):")
+    print("\n".join(_histogramm(df["preis"])))
+    if df["marke"].nunique() > 1:
+        print()
+        print(df.groupby("marke")["preis"].describe()[["count", "min", "50%", "max"]].round(2).to_string())
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Preisregeln prüfen und Preisverteilung anzeigen")
+    sub = parser.add_subparsers(dest="befehl", required=True)
+    p = sub.add_parser("preview", help="Preisverteilung für eine Upload-Datei anzeigen")
+    p.add_argument("input", help="JSON mit 'produkte' (wie für woo_variable_uploader.py)")
+    p.add_argument("--regeln", default=None, help=f"Regeldatei (Default: {STANDARD_DATEI})")
+    p.add_argument("--hersteller", default=None, help="Marke für Produkte ohne erkennbare Marke")
+    args = parser.parse_args(argv)
+
+    try:
+        evaluator = laden(args.regeln) if args.regeln else standard()
+    except (ValueError, OSError, json.JSONDecodeError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+    if args.hersteller:
+        import woo_plan
+        woo_plan.STANDARD_HERSTELLER = args.hersteller
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        produkte = json.load(f).get("produkte", [])
+    preview(produkte, evaluator)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
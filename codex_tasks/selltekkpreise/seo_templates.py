@@ -0,0 +1,200 @@
+"""
+SEO-Texte aus vorkompilierten Templates (string.Template) mit Inhalts-Hash
+
+Parent:    Titel/Beschreibung/Keywords/schema.org über ALLE Farben + Speicher
+           (vorher nur die erste Farbe und der erste Speicher)
+Variation: eigener SEO-Titel + Beschreibung pro Farbe/Speicher/Zustand
+
+Jeder SEO-Block bekommt einen Hash über Template-Texte + Eingabewerte, der als
+meta "seo_hash" mit in den Shop geht. Beim Sync wird nur der Hash verglichen
+(aus dem Spiegel): gleich -> nichts rendern, nichts senden. Texte ändern sich
+nur, wenn sich Name/Farben/Speicher/EAN oder die Templates hier ändern.
+"""
+
+import re
+import json
+import hashlib
+from functools import lru_cache
+from string import Template
+
+HASH_META = "seo_hash"
+
+TEMPLATES = {
+    "parent_titel": (
+        "$name $farbe $speicher verkaufen | Top-Ankaufpreise Deutschland + Bremen | "
+        "Sofortauszahlung in 6 Stunden | größte Plattform Norddeutschland"
+    ),
+    "parent_meta_desc": (
+        "$name $farbe $speicher verkaufen? Wir bieten die höchsten Ankaufpreise in ganz Deutschland! "
+        "Sofortauszahlung innerhalb 6 Stunden, kostenloser Versand. "
+        "Die größte Ankaufsplattform in Bremen, Hamburg, Hannover & Norddeutschland. "
+        "Jetzt verkaufen - innerhalb 6 Stunden Geld auf dein Konto!"
+    ),
+    "parent_og_desc": "$name $farbe $speicher verkaufen - Sofortauszahlung 6Std - Top-Preise",
+    "parent_beschreibung": """
+Verkaufe dein $name $farbe mit $speicher Speicher jetzt einfach und sicher an SellTekk.
+
+✅ Sofortauszahlung innerhalb von 6 Stunden
+✅ Kostenloser Versand mit DHL
+✅ Faire Bewertung
+✅ Sicherer Datentransfer
+✅ Größte Ankaufsplattform Bremen, Hamburg, Hannover
+✅ Über 10.000 zufriedene Kunden
+
+Bremen | Hamburg | Hannover | Deutschlandweite Top-Preise
+""",
+    "keywords": ("$name, $name verkaufen, $name $farbe, $name $speicher, "
+                 "Smartphone verkaufen, Handy verkaufen, Ankauf, Sofortauszahlung, Deutschland"),
+    "variante_titel": "$name $farbe $speicher ($zustand) verkaufen | Sofortauszahlung in 6 Stunden",
+    "variante_beschreibung": (
+        "$name $farbe mit $speicher Speicher im Zustand $zustand verkaufen: "
+        "Sofortauszahlung innerhalb von 6 Stunden, kostenloser Versand mit DHL."
+    ),
+}
+
+# Einmal kompilieren - beim Rendern nur noch substitute()
+_KOMPILIERT = {name: Template(text) for name, text in TEMPLATES.items()}
+# Template-Änderung = neuer Hash für alles -> SEO wird einmal neu gesendet
+TEMPLATE_VERSION = hashlib.sha1(json.dumps(TEMPLATES, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+
+MAX_KEYWORDS = 12
+
+
+def _render(template: str, werte: dict) -> str:
+    text = _KOMPILIERT[template].substitute(werte)
+    # Leere Platzhalter (keine Farbe/kein Speicher) hinterlassen doppelte Leerzeichen
+    return re.sub(r"[ \t]{2,}", " ", text).strip()
+
+
+def _speicher_gb(speicher: str) -> float:
+    m = re.search(r"(\d+(?:[.,]\d+)?)\s*(TB|GB|MB)?", speicher or "", re.IGNORECASE)
+    if not m:
+        return float("inf")
+    zahl = float(m.group(1).replace(",", "."))
+    einheit = (m.group(2) or "GB").upper()
+    return zahl * {"TB": 1024, "GB": 1, "MB": 1 / 1024}[einheit]
+
+
+def basisname(name) -> str:
+    return (name or "").replace(" verkaufen", "").strip()
+
+
+def inhalt_hash(art: str, werte: dict) -> str:
+    roh = json.dumps([TEMPLATE_VERSION, art, werte], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(roh.encode("utf-8")).hexdigest()[:16]
+
+
+def shop_hash(objekt: dict):
+    """seo_hash aus den meta_data eines Shop-Produkts/einer Variation (None wenn nie gesetzt)"""
+    for m in (objekt or {}).get("meta_data") or []:
+        if m.get("key") == HASH_META:
+            return m.get("value")
+    return None
+
+
+# ============================================================
+# PARENT
+# ============================================================
+
+def parent_werte(product_data: dict) -> dict:
+    """Eingabewerte für den Parent-SEO-Block (alles, was in den Hash eingeht)"""
+    varianten = product_data.get("varianten", [])
+    farben = sorted({v["farbe"] for v in varianten if v.get("farbe")})
+    speicher = sorted({v["speicher"] for v in varianten if v.get("speicher")}, key=_speicher_gb)
+    return {"name": basisname(product_data.get("name")), "farben": farben, "speicher": speicher,
+            "ean": str(product_data.get("ean") or "")}
+
+
+def _platzhalter(werte: dict) -> dict:
+    farben, speicher = werte["farben"], werte["speicher"]
+    return {
+        "name": werte["name"],
+        # Eine Farbe steht im Titel, mehrere nur in Keywords/Beschreibung
+        "farbe": farben[0] if len(farben) == 1 else "",
+        "speicher": f"{speicher[0]} bis {speicher[-1]}" if len(speicher) > 1 else "".join(speicher),
+    }
+
+
+def keywords(name: str, farben: list, speicher: list, limit: int = 8) -> str:
+    basis = _render("keywords", {"name": name, "farbe": farben[0] if farben else "",
+                                 "speicher": speicher[0] if speicher else ""}).split(", ")
+    kandidaten = basis[:4] + [f"{name} {s}" for s in speicher[1:]] + [f"{name} {f}" for f in farben[1:]] + basis[4:]
+    ergebnis = []
+    for k in (k.strip() for k in kandidaten):
+        if k and k not in ergebnis:
+            ergebnis.append(k)
+    return ", ".join(ergebnis[:limit])
+
+
+@lru_cache(maxsize=4096)
+def _parent_gerendert(werte_json: str) -> dict:
+    werte = json.loads(werte_json)
+    p = _platzhalter(werte)
+    meta_desc = _render("parent_meta_desc", p)
+    schema = {
+        "@context": "https://schema.org",
+        "@type": "Product",
+        "name": " ".join(x for x in (p["name"], p["farbe"], p["speicher"]) if x),
+        "description": meta_desc,
+        "offers": {"@type": "Offer", "priceCurrency": "EUR", "price": "0", "availability": "https://schema.org/InStock"},
+    }
+    if werte["ean"]:
+        schema["gtin13"] = werte["ean"]
+    if len(werte["farben"]) > 1:
+        schema["color"] = ", ".join(werte["farben"])
+    limit = 8 if len(werte["farben"]) <= 1 and len(werte["speicher"]) <= 1 else MAX_KEYWORDS
+    return {
+        "meta_titel": _render("parent_titel", p),
+        "meta_desc": meta_desc,
+        "keywords": keywords(werte["name"], werte["farben"], werte["speicher"], limit),
+        "description": _render("parent_beschreibung", p),
+        "og_desc": _render("parent_og_desc", p),
+        "schema_product": json.dumps(schema),
+    }
+
+
+def parent_seo(werte: dict) -> dict:
+    """Gerenderter Parent-Block (gleiche Werte -> aus dem Cache) + hash"""
+    seo = dict(_parent_gerendert(json.dumps(werte, sort_keys=True, ensure_ascii=False)))
+    seo["hash"] = inhalt_hash("parent", werte)
+    return seo
+
+
+def parent_felder(seo: dict) -> dict:
+    """SEO-Felder für den Produkt-Payload (meta_data ohne EAN - die hängt der Aufrufer an)"""
+    return {
+        "short_description": seo["meta_desc"][:150],
+        "description": seo["description"],
+        "meta_data": [
+            {"key": "seo_title", "value": seo["meta_titel"]},
+            {"key": "keywords", "value": seo["keywords"]},
+            {"key": "schema_product", "value": seo["schema_product"]},
+            {"key": HASH_META, "value": seo["hash"]},
+        ],
+    }
+
+
+# ============================================================
+# VARIATION
+# ============================================================
+
+def variante_werte(name: str, attributes: list) -> dict:
+    optionen = {a.get("name"): a.get("option") or "" for a in attributes or []}
+    return {"name": basisname(name), "farbe": optionen.get("Farbe", ""), "speicher": optionen.get("Speicher", ""),
+            "zustand": optionen.get("Zustand", "")}
+
+
+def variante_felder(werte: dict) -> dict:
+    """SEO-Felder für einen Variations-Payload (description + meta seo_title/seo_hash)"""
+    return {
+        "description": _render("variante_beschreibung", werte),
+        "meta_data": [
+            {"key": "seo_title", "value": _render("variante_titel", werte)},
+            {"key": HASH_META, "value": inhalt_hash("variante", werte)},
+        ],
+    }
+
+
+def mit_varianten_seo(name: str, payloads: list) -> list:
+    """Kopien der Variations-Payloads mit SEO-Feldern (für neu anzulegende Variationen)"""
+    return [{**p, **variante_felder(variante_werte(name, p["attributes"]))} for p in payloads]
@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import woo_api
+
+
+class StubShop:
+    """Lokaler Shop-Stand-in: beantwortet Requests der Reihe nach aus `antworten`, merkt sich die Bodies"""
+
+    def __init__(self):
+        self.antworten = []     # [(status, headers, body)]
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                laenge = int(self.headers.get("Content-Length") or 0)
+                stub.requests.append((self.path, json.loads(self.rfile.read(laenge) or b"null")))
+                status, headers, body = stub.antworten.pop(0)
+                daten = json.dumps(body).encode()
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(daten)))
+                self.end_headers()
+                self.wfile.write(daten)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/wp-json/wc/v3"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def shop(monkeypatch):
+    stub = StubShop()
+    monkeypatch.setattr(woo_api, "WC_URL", stub.url)
+    monkeypatch.setattr(woo_api, "_latenz", {})          # Testläufe nicht in woo_latency.json
+    monkeypatch.setattr(woo_api, "_pause_until", 0.0)
+    woo_api.set_concurrency(2)
+    yield stub
+    stub.server.shutdown()
+    woo_api.set_concurrency(woo_api.MAX_CONCURRENCY)
+
+
+def test_fehler_pro_eintrag(shop):
+    shop.antworten.append((200, {}, {
+        "create": [{"id": 11, "sku": "A"},
+                   {"id": 0, "error": {"code": "product_invalid_sku", "message": "SKU doppelt"}}],
+        "update": [{"id": 7, "error": {"code": "woocommerce_rest_product_invalid_id", "message": "Ungültige ID."}}],
+    }))
+
+    res = woo_api.wc_batch("/products", create=[{"sku": "A"}, {"sku": "B"}], update=[{"id": 7}], delete=[8])
+
+    assert shop.requests == [("/wp-json/wc/v3/products/batch",
+                              {"create": [{"sku": "A"}, {"sku": "B"}], "update": [{"id": 7}], "delete": [8]})]
+    assert [(e["ok"], e["id"]) for e in res["create"]] == [(True, 11), (False, None)]
+    assert res["create"][1]["error"] == "product_invalid_sku: SKU doppelt"
+    assert (res["update"][0]["ok"], res["update"][0]["id"]) == (False, 7)
+    assert res["update"][0]["error"] == "woocommerce_rest_product_invalid_id: Ungültige ID."
+    assert res["delete"] == [{"ok": False, "id": None, "data": None, "error": "Keine Antwort für Eintrag"}]
+
+
+def test_fehlgeschlagener_block_trifft_nur_seine_eintraege(shop, monkeypatch):
+    monkeypatch.setattr(woo_api, "BATCH_SIZE", 2)
+    shop.antworten += [(200, {}, {"update": [{"id": 1}, {"id": 2}]}),
+                       (500, {}, {"code": "internal_server_error"})]
+
+    res = woo_api.wc_batch("/products", update=[{"id": 1}, {"id": 2}, {"id": 3}])
+
+    assert len(shop.requests) == 2
+    assert [e["ok"] for e in res["update"]] == [True, True, False]
+    assert res["update"][2]["error"].startswith("HTTP 500")
+
+
+def test_429_wartet_retry_after_ab_und_wiederholt(shop):
+    shop.antworten += [(429, {"Retry-After": "1"}, {"code": "too_many_requests"}),
+                       (200, {}, {"update": [{"id": 5}]})]
+
+    start = time.time()
+    res = woo_api.wc_batch("/products", update=[{"id": 5}])
+
+    assert time.time() - start >= 0.9
+    assert len(shop.requests) == 2 and shop.requests[0] == shop.requests[1]
+    assert res["update"] == [{"ok": True, "id": 5, "data": {"id": 5}, "error": None}]
+
+
+def test_429_ohne_ende_gibt_den_fehler_weiter(shop, monkeypatch):
+    monkeypatch.setattr(woo_api, "MAX_429_RETRIES", 2)
+    shop.antworten += [(429, {"Retry-After": "0"}, {"code": "too_many_requests"})] * 3
+
+    res = woo_api.wc_batch("/products", update=[{"id": 5}])
+
+    assert len(shop.requests) == 3
+    assert res["update"][0]["ok"] is False and res["update"][0]["error"].startswith("HTTP 429")
+
+
+@pytest.mark.parametrize("wert, erwartet", [
+    ("7", 7.0), (None, woo_api.DEFAULT_RETRY_AFTER), ("kaputt", woo_api.DEFAULT_RETRY_AFTER)])
+def test_retry_after_header(wert, erwartet):
+    class R:
+        headers = {"Retry-After": wert} if wert else {}
+
+    assert woo_api._retry_after_seconds(R()) == erwartet
@@ -0,0 +1,333 @@
+"""
+WooCommerce REST-Zugriff für die Uploader-Scripts
+
+- Eine gemeinsame requests.Session (Keep-Alive, Connection-Pool) für alle Threads
+- Max. N Requests gleichzeitig in Flight (set_concurrency)
+- 429 Too Many Requests: Retry-After respektieren - pausiert ALLE Threads,
+  nicht nur den, der die 429 bekommen hat
+- Verbindungsfehler / 502-504 werden per urllib3 Retry mit Backoff wiederholt
+  (POST nur bei Verbindungsfehlern - sonst drohen doppelte Produkte)
+- Jeder Request wird gemessen; die Latenzen landen beim Beenden in
+  output/woo_latency.json (Grundlage für die Dauer-Schätzung im Dry-Run)
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# === BASE DIR ===
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# === WOOCOMMERCE CONFIG ===
+WC_CK = "ck_6b947bafda50e508976a407186d1e7fade4a6a0f"
+WC_CS = "cs_d6ed242dc239723dc2159a3a17b570e38a4392a8"
+WC_URL = "https://sell-tekk.de/wp-json/wc/v3"
+
+CONFIG_FILE = os.path.join(BASE_DIR, "output", "woo_config.json")
+if os.path.exists(CONFIG_FILE):
+    with open(CONFIG_FILE, 'r') as f:
+        config = json.load(f)
+        WC_URL = config.get('shop_url', WC_URL) + '/wp-json/wc/v3'
+        WC_CK = config.get('consumer_key', WC_CK)
+        WC_CS = config.get('consumer_secret', WC_CS)
+
+# Override per Umgebung, z.B. lokaler Stub-Server zum Testen:
+#   WOO_SHOP_URL=http://127.0.0.1:8080 python woo_variable_uploader.py
+if os.environ.get('WOO_SHOP_URL'):
+    WC_URL = os.environ['WOO_SHOP_URL'].rstrip('/') + '/wp-json/wc/v3'
+
+# WordPress-API (Mediathek) liegt neben der WooCommerce-API
+WP_URL = WC_URL.rsplit('/wc/v3', 1)[0] + '/wp/v2'
+
+BATCH_SIZE = 100          # WooCommerce-Limit: max. 100 Einträge pro Batch-Request
+MAX_CONCURRENCY = 4       # Default: gleichzeitige Requests (Shop nicht überlasten)
+MAX_429_RETRIES = 8       # So oft wird nach 429 erneut versucht
+DEFAULT_RETRY_AFTER = 10  # Sekunden, falls der Shop keinen Retry-After Header schickt
+
+LATENZ_FILE = os.path.join(BASE_DIR, "output", "woo_latency.json")
+LATENZ_MAX_MESSUNGEN = 5000  # darüber verlieren alte Messungen Gewicht (Shop wird schneller/langsamer)
+# Annahmen solange noch nichts gemessen wurde (Sekunden)
+LATENZ_STANDARD = {"GET": 0.4, "POST": 0.6, "PUT": 0.6, "DELETE": 0.5,
+                   "batch_basis": 0.5, "batch_eintrag": 0.05, "sideload": 1.5}
+
+
+def get_auth():
+    return (WC_CK, WC_CS)
+
+
+# ============================================================
+# SESSION + CONCURRENCY
+# ============================================================
+
+_session = None
+_session_lock = threading.Lock()
+_inflight = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_concurrency = MAX_CONCURRENCY
+_pause_until = 0.0  # Zeitpunkt bis zu dem nach 429 niemand senden darf
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    s = requests.Session()
+    s.auth = get_auth()
+    retry = Retry(
+        total=4, connect=4, read=2, status=3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "PUT", "DELETE"}),
+        backoff_factor=1,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session(_concurrency)
+        return _session
+
+
+def set_concurrency(n: int):
+    """Max. gleichzeitige Requests - vor dem Upload setzen"""
+    global _inflight, _concurrency, _session
+    n = max(1, int(n))
+    with _session_lock:
+        _concurrency = n
+        _inflight = threading.BoundedSemaphore(n)
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_concurrency() -> int:
+    return _concurrency
+
+
+def _retry_after_seconds(r) -> float:
+    wert = r.headers.get("Retry-After")
+    if not wert:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(wert))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(wert).timestamp() - time.time())
+    except Exception:
+        return DEFAULT_RETRY_AFTER
+
+
+def wc_request(method: str, path: str, **kwargs) -> requests.Response:
+    """
+    Request gegen WC_URL + path über die gemeinsame Session.
+    Bei 429 wird (für alle Threads) bis Retry-After pausiert und wiederholt.
+    """
+    global _pause_until
+    kwargs.setdefault("timeout", 60)
+    url = path if path.startswith("http") else f"{WC_URL}{path}"
+    session = get_session()
+    sem = _inflight
+
+    for versuch in range(MAX_429_RETRIES + 1):
+        warten = _pause_until - time.time()
+        if warten > 0:
+            time.sleep(warten)
+        with sem:
+            start = time.perf_counter()
+            r = session.request(method, url, **kwargs)
+            dauer = time.perf_counter() - start
+        if r.status_code != 429:
+            _miss(method, url, kwargs.get("json"), dauer)
+        if r.status_code != 429 or versuch == MAX_429_RETRIES:
+            return r
+        pause = _retry_after_seconds(r)
+        with _session_lock:
+            _pause_until = max(_pause_until, time.time() + pause)
+        print(f"       [429] Shop drosselt - Pause {pause:.0f}s (Versuch {versuch+1}/{MAX_429_RETRIES})")
+    return r
+
+
+# ============================================================
+# LATENZ-MESSUNG
+# ============================================================
+#   "GET"/"POST"/...:  [anzahl, sekunden]
+#   "batch":           [anzahl, eintraege, sekunden, eintraege², eintraege*sekunden]  (ohne Sideload)
+#   "batch_sideload":  [anzahl, eintraege, sekunden, sideloads]
+
+_latenz = {}
+_latenz_lock = threading.Lock()
+
+
+def _addiere(summen: dict, kategorie: str, werte: list):
+    alt = summen.setdefault(kategorie, [0.0] * len(werte))
+    summen[kategorie] = [a + w for a, w in zip(alt, werte)]
+
+
+def _miss(method: str, url: str, body, sekunden: float):
+    if url.endswith("/batch") and isinstance(body, dict):
+        eintraege = sum(len(body.get(op) or []) for op in ("create", "update", "delete"))
+        sideloads = sum(1 for item in body.get("create") or []
+                        for spec in ([item.get("image")] + list(item.get("images") or []))
+                        if isinstance(spec, dict) and spec.get("src"))
+        if sideloads:
+            kategorie, werte = "batch_sideload", [1, eintraege, sekunden, sideloads]
+        else:
+            kategorie, werte = "batch", [1, eintraege, sekunden, eintraege ** 2, eintraege * sekunden]
+    else:
+        kategorie, werte = method.upper(), [1, sekunden]
+    with _latenz_lock:
+        _addiere(_latenz, kategorie, werte)
+
+
+def _lade_latenz() -> dict:
+    try:
+        with open(LATENZ_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("summen", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def latenz_speichern():
+    """Messungen dieses Laufs in LATENZ_FILE aufsummieren (läuft automatisch beim Beenden)"""
+    with _latenz_lock:
+        neu = dict(_latenz)
+        _latenz.clear()
+    if not neu:
+        return
+    summen = _lade_latenz()
+    for kategorie, werte in neu.items():
+        alt = summen.get(kategorie)
+        if alt and alt[0] + werte[0] > LATENZ_MAX_MESSUNGEN:
+            faktor = max(0.0, LATENZ_MAX_MESSUNGEN - werte[0]) / alt[0]
+            summen[kategorie] = [a * faktor for a in alt]
+        _addiere(summen, kategorie, werte)
+    os.makedirs(os.path.dirname(LATENZ_FILE), exist_ok=True)
+    with open(LATENZ_FILE, "w", encoding="utf-8") as f:
+        json.dump({"shop": WC_URL, "aktualisiert": time.strftime("%Y-%m-%dT%H:%M:%S"), "summen": summen}, f, indent=2)
+
+
+atexit.register(latenz_speichern)
+
+
+def latenz_profil() -> dict:
+    """
+    Sekunden pro Request aus allen bisherigen Messungen (Datei + dieser Lauf):
+    Batch = batch_basis + eintraege * batch_eintrag + sideloads * sideload
+    "messungen": Anzahl gemessener Requests (0 = nur LATENZ_STANDARD)
+    """
+    summen = _lade_latenz()
+    with _latenz_lock:
+        for kategorie, werte in _latenz.items():
+            _addiere(summen, kategorie, werte)
+
+    profil = dict(LATENZ_STANDARD)
+    for methode in ("GET", "POST", "PUT", "DELETE"):
+        n, sek = summen.get(methode, [0, 0])
+        if n:
+            profil[methode] = sek / n
+
+    # Lineare Regression sekunden ~ basis + eintraege * pro_eintrag (Batches ohne Sideload)
+    n, x, y, xx, xy = summen.get("batch", [0, 0, 0, 0, 0])
+    varianz = n * xx - x * x
+    if n >= 2 and varianz > 1e-9:
+        steigung = max(0.0, (n * xy - x * y) / varianz)
+        profil["batch_eintrag"] = steigung
+        profil["batch_basis"] = max(0.0, (y - steigung * x) / n)
+    elif n and x:
+        profil["batch_basis"], profil["batch_eintrag"] = 0.0, y / x
+
+    # Sideload = was bei Batches mit Sideload über das Modell hinausgeht, pro Bild
+    n_s, x_s, y_s, s_s = summen.get("batch_sideload", [0, 0, 0, 0])
+    if n_s and s_s:
+        rest = y_s - n_s * profil["batch_basis"] - x_s * profil["batch_eintrag"]
+        profil["sideload"] = max(0.0, rest / s_s)
+
+    profil["messungen"] = int(sum(w[0] for w in summen.values()))
+    return profil
+
+
+def ohne_auth(r):
+    """auth=ohne_auth: öffentliche WP-Routen ohne WooCommerce-Keys abfragen"""
+    return r
+
+
+def wc_get_all(path: str, params: dict = None, per_page: int = 100, **kwargs) -> list:
+    """
+    Alle Seiten einer Listen-Route holen (?per_page=100&page=N).
+    Seite 1 liefert X-WP-TotalPages, die restlichen Seiten laufen parallel.
+    """
+    params = dict(params or {}, per_page=per_page)
+    params.setdefault("orderby", "id")
+    params.setdefault("order", "asc")
+
+    def seite(n):
+        r = wc_request("GET", path, params=dict(params, page=n), **kwargs)
+        r.raise_for_status()
+        return r, r.json()
+
+    r, items = seite(1)
+    seiten = int(r.headers.get("X-WP-TotalPages") or 1)
+    if seiten > 1:
+        with ThreadPoolExecutor(max_workers=_concurrency) as ex:
+            for _, teil in ex.map(seite, range(2, seiten + 1)):
+                items.extend(teil)
+    return items
+
+
+# ============================================================
+# BATCH API
+# ============================================================
+
+def wc_batch(path: str, create: list = None, update: list = None, delete: list = None) -> dict:
+    """
+    POST {path}/batch in Blöcken von max. BATCH_SIZE Einträgen.
+
+    Returns: {"create": [...], "update": [...], "delete": [...]} in der
+    Reihenfolge der Eingabe, pro Eintrag {"ok", "id", "error", "data"}.
+    Schlägt ein ganzer Request fehl, bekommen alle Einträge des Blocks den Fehler.
+    """
+    ops = [("create", x) for x in create or []] + \
+          [("update", x) for x in update or []] + \
+          [("delete", x) for x in delete or []]
+    results = {"create": [], "update": [], "delete": []}
+
+    for start in range(0, len(ops), BATCH_SIZE):
+        block = ops[start:start + BATCH_SIZE]
+        body = {}
+        for op, item in block:
+            body.setdefault(op, []).append(item)
+
+        try:
+            r = wc_request("POST", f"{path}/batch", json=body, timeout=120)
+            antwort = r.json() if r.ok else None
+            fehler = None if r.ok else f"HTTP {r.status_code}: {r.text[:200]}"
+        except Exception as e:
+            antwort, fehler = None, f"EXCEPTION: {str(e)[:200]}"
+
+        for op, items in body.items():
+            antworten = (antwort or {}).get(op) or []
+            for i, item in enumerate(items):
+                data = antworten[i] if i < len(antworten) else None
+                if fehler or data is None:
+                    results[op].append({"ok": False, "id": None, "data": None,
+                                        "error": fehler or "Keine Antwort für Eintrag"})
+                elif data.get("error"):
+                    err = data["error"]
+                    results[op].append({"ok": False, "id": data.get("id") or None, "data": data,
+                                        "error": f"{err.get('code', '')}: {err.get('message', '')}"})
+                else:
+                    results[op].append({"ok": True, "id": data.get("id"), "data": data, "error": None})
+
+    return results
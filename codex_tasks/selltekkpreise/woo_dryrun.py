@@ -0,0 +1,314 @@
+"""
+Dry-Run als Operationsplan: genau die API-Aufrufe, die der echte Lauf machen würde
+
+Nutzt dieselbe Planung wie der echte Lauf (woo_plan.py, Journal, Sync-Diff aus
+dem Spiegel) und spielt batch_mit_medien() nach: Blöcke à BATCH_SIZE, Bilder per
+Media-ID aus dem Cache, jede neue Bild-URL genau einmal per Sideload - Payloads
+mit derselben URL gehen wie im echten Lauf eine Runde später raus.
+Gerechnet wird in sequentieller Reihenfolge; parallel laufende Produkte können im
+echten Lauf einzelne Runden verschieben, an Sideloads/Einträgen ändert das nichts.
+
+Dauer-Schätzung aus den gemessenen Latenzen (output/woo_latency.json, schreibt
+woo_api.py bei jedem echten Lauf mit), parallel wie --concurrency.
+Der komplette Plan landet in output/dryrun_<eingabe>.json.
+"""
+
+import os
+import json
+import heapq
+from datetime import datetime
+
+from woo_api import BASE_DIR, BATCH_SIZE, latenz_profil
+from woo_keys import produkt_key
+from woo_media import MAX_RUNDEN, _bild_specs
+from woo_plan import MAX_VARIATIONEN, plane, ueber_limit
+from woo_variable_uploader import build_parent_payload, _neue_sku_base
+
+
+def _urls(payload: dict) -> list:
+    return [s["src"] for s in _bild_specs(payload) if s.get("src")]
+
+
+class BildStand:
+    """Welche Bild-URLs im Lauf eine Media-ID hätten (Cache/Mediathek oder früherer Sideload)"""
+
+    def __init__(self, media=None, offline: bool = False):
+        self.media = media
+        self.offline = offline
+        self._id = {}
+        self.sideloads = []
+        self.per_id = 0
+
+    def hat_id(self, url) -> bool:
+        if self.media is None:
+            return False  # ohne Cache geht jede URL per src raus
+        if url not in self._id:
+            # Nur lesen: der Plan darf weder media_cache noch die Statistik verändern
+            media_id = self.media.aus_cache(url) if self.offline else self.media.nachschlagen(url)
+            self._id[url] = bool(media_id)
+        return self._id[url]
+
+    def gelernt(self, urls):
+        for url in urls:
+            self.sideloads.append(url)
+            if self.media is not None:
+                self._id[url] = True
+
+
+def _post(pfad: str, block: list) -> dict:
+    op = {"methode": "POST", "pfad": f"{pfad}/batch", "create": 0, "update": 0, "delete": 0, "sideloads": []}
+    for art, _, urls in block:
+        op[art] += 1
+        op["sideloads"] += urls
+    return op
+
+
+def _get(pfad: str, seiten: int = 1) -> list:
+    return [{"methode": "GET", "pfad": pfad} for _ in range(max(1, seiten))]
+
+
+def _batch(pfad: str, bilder: BildStand, create: list = None, update: list = None, delete: list = None) -> list:
+    """Requests, die batch_mit_medien(media, pfad, create, update, delete) schicken würde"""
+    offen = list(create or [])
+    rest = [("update", x, []) for x in update or []] + [("delete", x, []) for x in delete or []]
+    requests = []
+    for _ in range(MAX_RUNDEN):
+        senden, spaeter, neu = [], [], set()
+        for payload in offen:
+            fehlend = [u for u in _urls(payload) if not bilder.hat_id(u)]
+            if bilder.media is not None and any(u in neu for u in fehlend):
+                spaeter.append(payload)  # wartet auf den Sideload eines anderen Payloads
+                continue
+            neu.update(fehlend)
+            senden.append(("create", payload, fehlend))
+        ops = senden + rest
+        requests += [_post(pfad, ops[i:i + BATCH_SIZE]) for i in range(0, len(ops), BATCH_SIZE)]
+        bilder.per_id += sum(len(_urls(p)) - len(urls) for _, p, urls in senden)
+        bilder.gelernt([u for _, _, urls in senden for u in urls])
+        rest, offen = [], spaeter
+        if not offen:
+            break
+    return requests
+
+
+def _produkt(name: str, aktion: str, parent: str = None, variationen: int = 0) -> dict:
+    return {"name": name, "aktion": aktion, "parent": parent, "create": 0, "update": 0, "delete": 0,
+            "variationen": variationen, "requests": 0, "sideloads": 0}
+
+
+def _zaehle(eintrag: dict, requests: list):
+    eintrag["requests"] += len(requests)
+    for op in requests:
+        if op["methode"] == "POST":
+            for art in ("create", "update", "delete"):
+                eintrag[art] += op[art]
+            eintrag["sideloads"] += len(op["sideloads"])
+
+
+# ============================================================
+# PLAN: NORMALER UPLOAD (wie _create_products)
+# ============================================================
+
+def _journal_aktion(z) -> str:
+    """Wie _plane_parents(), aber ohne Nachfragen/Schreiben: neu | fertig | fortsetzen | nachpruefen"""
+    if z is None or z["zurueckgerollt"] or not z["parent_geplant"]:
+        return "neu"
+    if z["fertig"]:
+        return "fertig"
+    return "fortsetzen" if z["parent_id"] else "nachpruefen"
+
+
+def plan_upload(produkte: list, journal=None, bilder: BildStand = None) -> dict:
+    """Operationen für den normalen Upload (Blöcke à BATCH_SIZE Produkte wie im echten Lauf)"""
+    bilder = bilder or BildStand()
+    phasen, eintraege = [], []
+    for start in range(0, len(produkte), BATCH_SIZE):
+        block = produkte[start:start + BATCH_SIZE]
+        zustaende = [journal.zustand(produkt_key(p)) if journal else None for p in block]
+        aktionen = [_journal_aktion(z) for z in zustaende]
+        sku_basen = [z["sku_base"] if z and a != "neu" else _neue_sku_base() for z, a in zip(zustaende, aktionen)]
+        df, _, payloads = plane(block, sku_basen)
+        limit = ueber_limit(df)
+
+        # Parent-Request ohne Antwort im Journal: der echte Lauf fragt die SKU im Shop nach
+        seriell = [op for a, sku in zip(aktionen, sku_basen) if a == "nachpruefen"
+                   for op in _get(f"/products?sku={sku}")]
+        neu = [i for i, a in enumerate(aktionen) if a in ("neu", "nachpruefen")]
+        seriell += _batch("/products", bilder, create=[build_parent_payload(block[i], sku_basen[i]) for i in neu])
+
+        parallel = []
+        for i, (p, aktion) in enumerate(zip(block, aktionen)):
+            name = p.get("name", "Unbekannt")
+            variationen = payloads.get(i, [])
+            eintrag = _produkt(name, aktion, "create" if i in neu else None, len(variationen))
+            eintrag["ueber_limit"] = i in limit
+            eintraege.append(eintrag)
+            if aktion == "fertig":
+                continue
+            if i in neu:
+                eintrag["create"] += 1
+            chunks = [variationen[n:n + BATCH_SIZE] for n in range(0, len(variationen), BATCH_SIZE)]
+            erledigt = set(zustaende[i]["chunks_erledigt"]) if aktion == "fortsetzen" else set()
+            offen = (zustaende[i]["chunks_geplant"] - erledigt) if aktion == "fortsetzen" else set()
+            pfad = f"/products/{zustaende[i]['parent_id'] if aktion == 'fortsetzen' else '<neu>'}/variations"
+            requests = _get(pfad) if offen else []
+            for n, chunk in enumerate(chunks):
+                if n not in erledigt:
+                    requests += _batch(pfad, bilder, create=chunk)
+            _zaehle(eintrag, requests)
+            parallel.append(requests)
+        phasen.append({"name": f"Produkte {start + 1}-{start + len(block)}", "seriell": seriell, "parallel": parallel})
+    return {"modus": "upload", "phasen": phasen, "produkte": eintraege, "bilder": bilder}
+
+
+# ============================================================
+# PLAN: SYNC (wie fuehre_aus)
+# ============================================================
+
+def plan_sync(diffs: list, bilder: BildStand = None) -> dict:
+    bilder = bilder or BildStand()
+    phasen, eintraege = [], []
+
+    parent_updates = [d["parent_update"] for d in diffs if d["parent_update"]]
+    if parent_updates:
+        phasen.append({"name": "Parent-Updates", "seriell": _batch("/products", bilder, update=parent_updates),
+                       "parallel": []})
+
+    neue = [d["produkt"] for d in diffs if d["aktion"] == "neu"]
+    if neue:
+        neu_plan = plan_upload(neue, bilder=bilder)
+        phasen += neu_plan["phasen"]
+        eintraege += neu_plan["produkte"]
+
+    parallel = []
+    for d in diffs:
+        if d["aktion"] == "neu":
+            continue
+        bestand = d.get("variationen_shop", 0) + len(d["create"]) - len(d["delete"])
+        eintrag = _produkt(d["name"], d["aktion"], "update" if d["parent_update"] else None, bestand)
+        eintrag["ueber_limit"] = bestand > MAX_VARIATIONEN
+        eintraege.append(eintrag)
+        if d["parent_update"]:
+            eintrag["update"] += 1
+        if d["create"] or d["update"] or d["delete"]:
+            requests = _batch(f"/products/{d['parent_id']}/variations", bilder,
+                              create=d["create"], update=d["update"], delete=d["delete"])
+            _zaehle(eintrag, requests)
+            parallel.append(requests)
+    if parallel:
+        phasen.append({"name": "Variations-Deltas", "seriell": [], "parallel": parallel})
+
+    if neue:
+        # fuehre_aus() holt neue Produkte per inkrementellem Pull in den Spiegel:
+        # Produkte, Kategorien, Medien + Variationen je geändertem Produkt (ca.)
+        geaendert = len(neue) + sum(1 for d in diffs if d["aktion"] == "update")
+        seriell = _get("/products") + _get("/products/categories") + _get("/wp/v2/media")
+        parallel = [_get("/products/<id>/variations") for _ in range(geaendert)]
+        phasen.append({"name": "Spiegel-Pull", "seriell": seriell, "parallel": parallel})
+    return {"modus": "sync", "phasen": phasen, "produkte": eintraege, "bilder": bilder}
+
+
+# ============================================================
+# DAUER + AUSGABE
+# ============================================================
+
+def _dauer(op: dict, profil: dict) -> float:
+    if op["methode"] != "POST" or not op["pfad"].endswith("/batch"):
+        return profil.get(op["methode"], profil["GET"])
+    eintraege = op["create"] + op["update"] + op["delete"]
+    return profil["batch_basis"] + eintraege * profil["batch_eintrag"] + len(op["sideloads"]) * profil["sideload"]
+
+
+def _parallel_dauer(zeiten: list, concurrency: int) -> float:
+    """Produkte laufen auf max. `concurrency` Threads - längste zuerst verteilen"""
+    threads = [0.0] * max(1, min(concurrency, len(zeiten) or 1))
+    for t in sorted(zeiten, reverse=True):
+        heapq.heapreplace(threads, threads[0] + t)
+    return max(threads)
+
+
+def schaetze_dauer(plan: dict, concurrency: int, profil: dict = None) -> float:
+    profil = profil or latenz_profil()
+    gesamt = 0.0
+    for phase in plan["phasen"]:
+        gesamt += sum(_dauer(op, profil) for op in phase["seriell"])
+        gesamt += _parallel_dauer([sum(_dauer(op, profil) for op in ops) for ops in phase["parallel"]], concurrency)
+    return gesamt
+
+
+def alle_requests(plan: dict) -> list:
+    return [dict(op, phase=phase["name"]) for phase in plan["phasen"]
+            for op in phase["seriell"] + [op for ops in phase["parallel"] for op in ops]]
+
+
+def zusammenfassung(plan: dict) -> dict:
+    requests = alle_requests(plan)
+    posts = [op for op in requests if op["methode"] == "POST"]
+    s = {
+        "requests": len(requests),
+        "parent_batches": sum(1 for op in posts if op["pfad"] == "/products/batch"),
+        "variations_batches": sum(1 for op in posts if op["pfad"].endswith("/variations/batch")),
+        "gets": sum(1 for op in requests if op["methode"] == "GET"),
+        "parents_create": sum(op["create"] for op in posts if op["pfad"] == "/products/batch"),
+        "parents_update": sum(op["update"] for op in posts if op["pfad"] == "/products/batch"),
+        "variationen_create": sum(op["create"] for op in posts if op["pfad"].endswith("/variations/batch")),
+        "variationen_update": sum(op["update"] for op in posts if op["pfad"].endswith("/variations/batch")),
+        "variationen_delete": sum(op["delete"] for op in posts if op["pfad"].endswith("/variations/batch")),
+        "sideloads": len(plan["bilder"].sideloads),
+        "bilder_per_id": plan["bilder"].per_id,
+        "uebersprungen": sum(1 for p in plan["produkte"] if p["aktion"] == "fertig"),
+    }
+    return s
+
+
+def _uhrzeit(sekunden: float) -> str:
+    m, s = divmod(int(round(sekunden)), 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+def zeige_plan(plan: dict, concurrency: int, datei: str = None) -> dict:
+    """Plan ausgeben, Dauer schätzen und (mit datei) als JSON speichern"""
+    profil = latenz_profil()
+    s = zusammenfassung(plan)
+    dauer = schaetze_dauer(plan, concurrency, profil)
+
+    if plan["modus"] == "upload":
+        for p in plan["produkte"]:
+            if p["aktion"] == "fertig":
+                print(f"  [FERTIG] {p['name']} (Journal)")
+                continue
+            kopf = "[NEU]   " if p["aktion"] in ("neu", "nachpruefen") else "[WEITER]"
+            print(f"  {kopf} {p['name']}: {'Parent + ' if p['parent'] else ''}{p['create'] - bool(p['parent'])} "
+                  f"Variationen in {p['requests']} Requests, {p['sideloads']} Sideloads")
+
+    print(f"\n[DRY RUN] Operationsplan - es wird nichts gesendet")
+    print(f"  Produkte:     {s['parents_create']} anlegen, {s['parents_update']} Parent-Updates"
+          + (f", {s['uebersprungen']} bereits fertig (Journal)" if s["uebersprungen"] else ""))
+    print(f"  Variationen:  {s['variationen_create']} anlegen, {s['variationen_update']} ändern, "
+          f"{s['variationen_delete']} löschen")
+    print(f"  Bilder:       {s['sideloads']} Sideloads (neue URLs), {s['bilder_per_id']}x per Media-ID")
+    print(f"  Requests:     {s['requests']} gesamt - {s['parent_batches']}x /products/batch, "
+          f"{s['variations_batches']}x /variations/batch, {s['gets']}x GET")
+    quelle = (f"Latenz aus {profil['messungen']} Messungen" if profil["messungen"]
+              else "Standard-Latenzen, noch nichts gemessen")
+    print(f"  Dauer:        ca. {_uhrzeit(dauer)} bei --concurrency {concurrency} ({quelle})")
+
+    zu_gross = [p for p in plan["produkte"] if p.get("ueber_limit")]
+    for p in zu_gross:
+        print(f"  [LIMIT] {p['name']}: {p['variationen']} Variationen > {MAX_VARIATIONEN} (wc_max_linked_variations)")
+
+    if datei:
+        os.makedirs(os.path.dirname(datei), exist_ok=True)
+        with open(datei, "w", encoding="utf-8") as f:
+            json.dump({"erstellt": datetime.now().isoformat(timespec="seconds"), "modus": plan["modus"],
+                       "concurrency": concurrency, "dauer_sekunden": round(dauer, 1), "latenz": profil,
+                       "zusammenfassung": s, "produkte": plan["produkte"], "requests": alle_requests(plan)},
+                      f, ensure_ascii=False, indent=2)
+        print(f"  Plan:         {datei}")
+    return dict(s, dauer_sekunden=dauer)
+
+
+def plan_datei(input_file: str) -> str:
+    name = os.path.splitext(os.path.basename(input_file))[0]
+    return os.path.join(BASE_DIR, "output", f"dryrun_{name}.json")
@@ -0,0 +1,116 @@
+"""
+Write-Ahead-Journal für den Upload (Absturz/Strg+C sicher fortsetzen)
+
+Jeder Schritt wird VOR dem Request als "geplant" und danach als "erledigt"
+ins Journal (JSONL, fsync) geschrieben:
+
+    parent_geplant   key, sku_base        -> Parent-Batch wird gesendet
+    parent_erstellt  key, parent_id       -> Parent existiert im Shop
+    chunk_geplant    key, chunk           -> Variations-Chunk N wird gesendet
+    chunk_erledigt   key, chunk, ok, fehler
+    produkt_fertig   key
+    zurueckgerollt   key, parent_id       -> halber Parent gelöscht (--repair zurueckrollen)
+
+Beim Neustart wird pro Produkt am letzten bestätigten Schritt weitergemacht.
+Nur was "geplant" aber nicht bestätigt ist, wird im Shop nachgeschaut
+(Parent per SKU, Variationen per SKU) - so entstehen keine Dubletten.
+Ein Journal pro Eingabe-Datei: output/journal_<datei>.jsonl
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+from woo_api import BASE_DIR
+
+
+def journal_pfad(input_file: str) -> str:
+    name = os.path.splitext(os.path.basename(input_file))[0]
+    return os.path.join(BASE_DIR, "output", f"journal_{name}.jsonl")
+
+
+class UploadJournal:
+    def __init__(self, pfad: str):
+        self.pfad = pfad
+        self._lock = threading.Lock()
+        self._zustand = {}
+        self.lauf = datetime.now().isoformat(timespec="seconds")
+        os.makedirs(os.path.dirname(pfad) or ".", exist_ok=True)
+        self._lade()
+        self._f = open(pfad, "a", encoding="utf-8")
+
+    def _lade(self):
+        if not os.path.exists(self.pfad):
+            return
+        with open(self.pfad, "r", encoding="utf-8") as f:
+            for zeile in f:
+                try:
+                    eintrag = json.loads(zeile)
+                except ValueError:
+                    continue  # letzte Zeile beim Absturz nur halb geschrieben
+                self._anwenden(eintrag)
+
+    def _anwenden(self, e: dict):
+        z = self._zustand.setdefault(e["key"], {
+            "name": None, "sku_base": None, "parent_id": None, "parent_geplant": False,
+            "chunks_geplant": set(), "chunks_erledigt": {}, "fertig": False, "zurueckgerollt": False,
+        })
+        schritt = e["schritt"]
+        if schritt == "parent_geplant":
+            # Neuer Versuch nach Rollback beginnt von vorn
+            if z["zurueckgerollt"]:
+                z.update(parent_id=None, zurueckgerollt=False, fertig=False,
+                         chunks_geplant=set(), chunks_erledigt={})
+            z.update(parent_geplant=True, sku_base=e["sku_base"], name=e.get("name"))
+        elif schritt == "parent_erstellt":
+            z["parent_id"] = e["parent_id"]
+        elif schritt == "chunk_geplant":
+            z["chunks_geplant"].add(e["chunk"])
+        elif schritt == "chunk_erledigt":
+            # Nur fehlerfreie Chunks gelten als bestätigt - der Rest wird beim Fortsetzen nachgeprüft
+            if e.get("fehler"):
+                z["chunks_erledigt"].pop(e["chunk"], None)
+            else:
+                z["chunks_erledigt"][e["chunk"]] = e.get("ok", 0)
+        elif schritt == "produkt_fertig":
+            z["fertig"] = True
+        elif schritt == "zurueckgerollt":
+            z.update(zurueckgerollt=True, fertig=False)
+
+    def schreibe(self, schritt: str, key: str, **daten):
+        eintrag = {"ts": datetime.now().isoformat(timespec="seconds"), "lauf": self.lauf,
+                   "schritt": schritt, "key": key, **daten}
+        with self._lock:
+            self._f.write(json.dumps(eintrag, ensure_ascii=False) + "\n")
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self._anwenden(eintrag)
+
+    def zustand(self, key: str) -> dict:
+        with self._lock:
+            return self._zustand.get(key)
+
+    def halbfertig(self) -> dict:
+        """Produkte mit begonnenem, aber nicht abgeschlossenem Upload: {key: zustand}"""
+        with self._lock:
+            return {k: z for k, z in self._zustand.items()
+                    if z["parent_geplant"] and not z["fertig"] and not z["zurueckgerollt"]}
+
+    def offene_chunks(self, key: str) -> set:
+        """Geplant aber nicht (fehlerfrei) bestätigt - Ergebnis im Shop unbekannt"""
+        z = self.zustand(key)
+        return (z["chunks_geplant"] - set(z["chunks_erledigt"])) if z else set()
+
+    def close(self):
+        with self._lock:
+            self._f.close()
+
+    def archivieren(self):
+        """Journal beiseitelegen - nächster Lauf startet ohne Vorgeschichte"""
+        self.close()
+        if os.path.exists(self.pfad):
+            ziel = f"{self.pfad}.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            os.replace(self.pfad, ziel)
+            return ziel
+        return None
@@ -0,0 +1,39 @@
+"""
+Stabile Keys für Produkte und Variationen im Shop
+
+Gemeinsam genutzt von Sync (Diff), Spiegel und Upload-Journal, damit überall
+dasselbe Produkt unter demselben Key läuft.
+"""
+
+
+def norm(text) -> str:
+    return " ".join(str(text or "").lower().split())
+
+
+def produkt_keys(name, ean) -> list:
+    """Alle Keys unter denen ein Produkt gefunden werden kann (EAN zuerst)"""
+    keys = []
+    if ean:
+        keys.append(f"ean:{str(ean).strip()}")
+    if name:
+        keys.append(f"name:{norm(name)}")
+    return keys
+
+
+def produkt_key(product_data: dict) -> str:
+    """Der bevorzugte Key eines Eingabe-Produkts"""
+    keys = produkt_keys(product_data.get("name"), product_data.get("ean"))
+    return keys[0] if keys else "name:unbekannt"
+
+
+def variation_key(attributes) -> tuple:
+    """(speicher, farbe, zustand) aus [{"name", "option"}, ...] - '128 GB' == '128gb'"""
+    werte = {a.get("name"): a.get("option") for a in attributes or []}
+    return (norm(werte.get("Speicher")).replace(" ", ""), norm(werte.get("Farbe")), norm(werte.get("Zustand")))
+
+
+def ean_aus_meta(produkt: dict) -> str:
+    for m in produkt.get("meta_data") or []:
+        if m.get("key") == "EAN" and m.get("value"):
+            return str(m["value"])
+    return ""
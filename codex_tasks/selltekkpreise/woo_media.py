@@ -0,0 +1,246 @@
+"""
+Bild-URL -> Media-ID Cache für den Upload
+
+Vorher hing an jeder Variation {"src": url} - WooCommerce lädt das Bild dann
+jedes Mal neu herunter und legt einen neuen Eintrag in der Mediathek an
+(die 4 Zustands-Bilder an JEDER gebrauchten Variation jedes Produkts).
+
+Jetzt wird jede URL genau einmal aufgelöst und danach per {"id": ...} referenziert:
+1. Cache (output/woo_mirror.sqlite, Tabelle media_cache - bleibt über Läufe erhalten)
+2. Mediathek aus dem Spiegel (woo_mirror.py, Tabelle media), nur für URLs aus dem eigenen Shop
+3. Liegt die URL im eigenen Shop (z.B. CONDITION_IMAGE_MAP): WP-Medien-Suche
+4. Sonst: EIN Payload lädt per src hoch, die ID aus der Antwort wird gemerkt;
+   alle anderen Payloads mit derselben URL warten darauf (auch über Threads hinweg)
+"""
+
+import os
+import copy
+import sqlite3
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+from woo_api import WC_URL, WP_URL, wc_request, wc_batch, ohne_auth
+from woo_mirror import MIRROR_FILE
+
+MAX_RUNDEN = 4        # Sende-Runden pro Batch (Bild-Abhängigkeiten, ungültige IDs)
+WARTEN_TIMEOUT = 300  # Sekunden, die auf einen fremden Sideload derselben URL gewartet wird
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media_cache (
+    url TEXT PRIMARY KEY, media_id INTEGER NOT NULL, quelle TEXT, ts TEXT
+);
+"""
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or "").lower().removeprefix("www.")
+
+
+def _bild_specs(payload: dict) -> list:
+    """Die Bild-Dicts eines Payloads/einer Antwort: Variation "image", Parent "images" """
+    if payload.get("image"):
+        return [payload["image"]]
+    return [b for b in payload.get("images") or [] if b]
+
+
+class MediaCache:
+    def __init__(self, pfad: str = MIRROR_FILE):
+        os.makedirs(os.path.dirname(pfad) or ".", exist_ok=True)
+        self._db = sqlite3.connect(pfad, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._unterwegs = {}          # url -> Event (Sideload läuft gerade)
+        self._nicht_gefunden = set()  # Mediathek-Suche ohne Treffer (pro Lauf)
+        self.stats = {"cache": 0, "mediathek": 0, "sideload": 0}
+        self._shop_host = _host(WC_URL)
+
+    def close(self):
+        self._db.close()
+
+    # ---------- Auflösen ----------
+
+    def _aus_db(self, url):
+        with self._lock:
+            row = self._db.execute("SELECT media_id FROM media_cache WHERE url = ?", (url,)).fetchone()
+            if row:
+                return row[0]
+            # Mediathek aus dem Spiegel (falls schon mal gepullt) - nur für Bilder aus dem eigenen Shop
+            if _host(url) != self._shop_host:
+                return None
+            pfad = urlparse(url).path
+            try:
+                # gleiche URL oder gleiches Pfad-Ende (http/https, www) - ohne LIKE, "_"/"%" sind keine Platzhalter
+                rows = self._db.execute(
+                    "SELECT id, source_url FROM media WHERE source_url = ? OR substr(source_url, -?) = ? ORDER BY id",
+                    (url, len(pfad), pfad)).fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+        for media_id, quelle in rows:
+            if quelle == url or (_host(quelle) == self._shop_host and urlparse(quelle).path == pfad):
+                return media_id
+        return None
+
+    def _suche_mediathek(self, url):
+        """Bild im eigenen Shop per WP-REST suchen (öffentlich, ohne Keys)"""
+        if _host(url) != self._shop_host or url in self._nicht_gefunden:
+            return None
+        pfad = urlparse(url).path
+        stamm = os.path.splitext(os.path.basename(pfad))[0]
+        try:
+            r = wc_request("GET", f"{WP_URL}/media", params={"search": stamm, "per_page": 20}, auth=ohne_auth)
+            treffer = r.json() if r.ok else []
+        except Exception:
+            treffer = []
+        for m in treffer:
+            if urlparse(m.get("source_url") or "").path == pfad:
+                return m["id"]
+        self._nicht_gefunden.add(url)
+        return None
+
+    def aus_cache(self, url):
+        """Nur lokal nachsehen (Cache + Spiegel), ohne Anfrage an den Shop"""
+        return self._aus_db(url)
+
+    def nachschlagen(self, url):
+        """Wie aufloesen(), aber nur lesend: Treffer aus der Mediathek werden nicht gemerkt (Dry-Run)"""
+        return self._aus_db(url) or self._suche_mediathek(url)
+
+    def aufloesen(self, url):
+        """Media-ID für url oder None (dann muss einmal per src hochgeladen werden)"""
+        media_id = self._aus_db(url)
+        if media_id:
+            self.stats["cache"] += 1
+            return media_id
+        media_id = self._suche_mediathek(url)
+        if media_id:
+            self.stats["mediathek"] += 1
+            self.merke(url, media_id, "mediathek")
+        return media_id
+
+    def merke(self, url, media_id, quelle="sideload"):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO media_cache (url, media_id, quelle, ts) VALUES (?, ?, ?, ?)",
+                             (url, media_id, quelle, datetime.now().isoformat(timespec="seconds")))
+
+    def vergiss(self, url):
+        """ID ungültig (Bild in der Mediathek gelöscht) - beim nächsten Mal neu auflösen"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM media_cache WHERE url = ?", (url,))
+        self._nicht_gefunden.add(url)
+
+    # ---------- Sideload-Koordination ----------
+
+    def _reservieren(self, url) -> bool:
+        with self._lock:
+            if url in self._unterwegs:
+                return False
+            self._unterwegs[url] = threading.Event()
+            return True
+
+    def freigeben(self, url):
+        with self._lock:
+            event = self._unterwegs.pop(url, None)
+        if event:
+            event.set()
+
+    def warten(self, url):
+        with self._lock:
+            event = self._unterwegs.get(url)
+        if event:
+            event.wait(WARTEN_TIMEOUT)
+
+    def einsetzen(self, payload: dict):
+        """
+        Kopie des Payloads mit {"id"} statt {"src"} wo möglich.
+        Returns: (kopie, quellen [(pos, url)] die per src hochgeladen werden,
+                  benutzt [url] per Cache-ID, blockiert [url] auf deren Sideload gewartet wird)
+        """
+        kopie = copy.deepcopy(payload)
+        quellen, benutzt, blockiert = [], [], []
+        for pos, spec in enumerate(_bild_specs(kopie)):
+            url = spec.get("src")
+            if not url:
+                continue
+            media_id = self.aufloesen(url)
+            if media_id:
+                spec.clear()
+                spec["id"] = media_id
+                benutzt.append(url)
+            elif self._reservieren(url):
+                quellen.append((pos, url))
+            else:
+                blockiert.append(url)
+        if blockiert:
+            for _, url in quellen:
+                self.freigeben(url)
+            return None, [], [], blockiert
+        return kopie, quellen, benutzt, []
+
+    def lerne(self, quellen: list, antwort: dict):
+        specs = _bild_specs(antwort or {})
+        for pos, url in quellen:
+            if pos < len(specs) and specs[pos].get("id"):
+                self.merke(url, specs[pos]["id"])
+                self.stats["sideload"] += 1
+
+    def bericht(self) -> str:
+        return (f"Bilder: {self.stats['cache']}x aus Cache, {self.stats['mediathek']}x in Mediathek gefunden, "
+                f"{self.stats['sideload']}x neu hochgeladen")
+
+
+def batch_mit_medien(media, path: str, create: list = None, update: list = None, delete: list = None) -> dict:
+    """
+    wc_batch() mit Bild-IDs aus dem MediaCache. Payloads, deren Bild gerade von
+    einem anderen Payload hochgeladen wird, gehen in der nächsten Runde mit der
+    gelernten ID raus. Ergebnisse in Eingabe-Reihenfolge wie bei wc_batch().
+    """
+    create = list(create or [])
+    if media is None or not create:
+        return wc_batch(path, create=create, update=update, delete=delete)
+
+    ergebnisse = [None] * len(create)
+    offen = list(range(len(create)))
+    rest = {"update": update, "delete": delete}
+    gesamt = {"create": None, "update": [], "delete": []}
+
+    for _ in range(MAX_RUNDEN):
+        senden, spaeter = [], []
+        for i in offen:
+            kopie, quellen, benutzt, blockiert = media.einsetzen(create[i])
+            if blockiert:
+                spaeter.append((i, blockiert))
+            else:
+                senden.append((i, kopie, quellen, benutzt))
+
+        nochmal = []
+        try:
+            res = wc_batch(path, create=[k for _, k, _, _ in senden], **rest)
+            gesamt["update"] += res["update"]
+            gesamt["delete"] += res["delete"]
+            rest = {}
+            for (i, _, quellen, benutzt), r in zip(senden, res["create"]):
+                ergebnisse[i] = r
+                if r["ok"]:
+                    media.lerne(quellen, r["data"])
+                elif benutzt and "image" in (r["error"] or "").lower():
+                    # Gecachte ID existiert nicht mehr -> vergessen und erneut senden
+                    for url in benutzt:
+                        media.vergiss(url)
+                    nochmal.append(i)
+        finally:
+            for _, _, quellen, _ in senden:
+                for _, url in quellen:
+                    media.freigeben(url)
+
+        for _, blockiert in spaeter:
+            for url in blockiert:
+                media.warten(url)
+        offen = [i for i, _ in spaeter] + nochmal
+        if not offen:
+            break
+
+    for i in offen:
+        ergebnisse[i] = {"ok": False, "id": None, "data": None, "error": "Bild konnte nicht aufgelöst werden"}
+    gesamt["create"] = ergebnisse
+    return gesamt
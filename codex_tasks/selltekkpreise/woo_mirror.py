@@ -0,0 +1,245 @@
+"""
+Lokaler Spiegel des Shop-Katalogs (SQLite)
+
+Produkte, Variationen, Kategorien und Mediathek liegen in output/woo_mirror.sqlite.
+- Erster Lauf / --voll: kompletter paginierter Pull
+- Danach inkrementell: nur was seit dem letzten Pull geändert wurde (modified_after);
+  für geänderte Variable Products werden deren Variationen komplett neu geholt,
+  für alle übrigen gespiegelten Variable Products die geänderten Variationen
+  (eine Variation zu ändern ändert date_modified des Parents nicht)
+- Schreibt der Uploader, landen die Antworten der Batch-API direkt im Spiegel
+
+Diffs, Dry-Runs und Reports laufen damit offline in Millisekunden.
+Gelöschte Produkte und gelöschte Variationen eines sonst unveränderten Parents
+tauchen in modified_after nicht auf - dafür ab und zu --voll.
+
+Nutzung:
+    python woo_mirror.py pull           # inkrementell (beim ersten Mal voll)
+    python woo_mirror.py pull --voll
+    python woo_mirror.py status
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from woo_api import BASE_DIR, WP_URL, wc_get_all, get_concurrency, ohne_auth
+from woo_keys import ean_aus_meta
+
+MIRROR_FILE = os.path.join(BASE_DIR, "output", "woo_mirror.sqlite")
+UHR_TOLERANZ = timedelta(minutes=5)  # Uhr-Abweichung Shop <-> lokal beim modified_after
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY, sku TEXT, name TEXT, ean TEXT, type TEXT, status TEXT,
+    date_modified_gmt TEXT, data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_products_sku ON products(sku);
+CREATE INDEX IF NOT EXISTS idx_products_ean ON products(ean);
+CREATE TABLE IF NOT EXISTS variations (
+    id INTEGER PRIMARY KEY, parent_id INTEGER NOT NULL, sku TEXT, regular_price TEXT, status TEXT,
+    image_id INTEGER, date_modified_gmt TEXT, data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_variations_parent ON variations(parent_id);
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY, name TEXT, slug TEXT, parent INTEGER, data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS media (
+    id INTEGER PRIMARY KEY, source_url TEXT, date_modified_gmt TEXT, data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_media_url ON media(source_url);
+CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _jetzt_gmt() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class ShopMirror:
+    def __init__(self, pfad: str = MIRROR_FILE):
+        self.pfad = pfad
+        os.makedirs(os.path.dirname(pfad) or ".", exist_ok=True)
+        # Eine Verbindung, von Upload-Threads über den Lock geteilt
+        self._db = sqlite3.connect(pfad, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._db.close()
+
+    # ---------- State ----------
+
+    def _get_state(self, name, default=None):
+        row = self._db.execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_state(self, name, value):
+        self._db.execute("INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)", (name, value))
+
+    # ---------- Schreiben ----------
+
+    def speichere_produkte(self, produkte: list):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO products (id, sku, name, ean, type, status, date_modified_gmt, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(p["id"], p.get("sku"), p.get("name"), ean_aus_meta(p), p.get("type"), p.get("status"),
+                  p.get("date_modified_gmt"), json.dumps(p, ensure_ascii=False)) for p in produkte])
+
+    def speichere_variationen(self, variationen: list, parent_id: int = None, ersetzen: bool = False):
+        """ersetzen=True: alle Variationen von parent_id durch die Liste ersetzen (gelöschte fallen weg)"""
+        with self._lock, self._db:
+            if ersetzen and parent_id is not None:
+                self._db.execute("DELETE FROM variations WHERE parent_id = ?", (parent_id,))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO variations (id, parent_id, sku, regular_price, status, image_id, "
+                "date_modified_gmt, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(v["id"], v.get("parent_id") or parent_id, v.get("sku"), v.get("regular_price"), v.get("status"),
+                  (v.get("image") or {}).get("id"), v.get("date_modified_gmt"),
+                  json.dumps(v, ensure_ascii=False)) for v in variationen])
+
+    def loesche_variationen(self, ids: list):
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM variations WHERE id = ?", [(i,) for i in ids])
+
+    def loesche_produkt(self, produkt_id: int):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM variations WHERE parent_id = ?", (produkt_id,))
+            self._db.execute("DELETE FROM products WHERE id = ?", (produkt_id,))
+
+    def speichere_kategorien(self, kategorien: list):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM categories")
+            self._db.executemany(
+                "INSERT INTO categories (id, name, slug, parent, data) VALUES (?, ?, ?, ?, ?)",
+                [(k["id"], k.get("name"), k.get("slug"), k.get("parent"), json.dumps(k, ensure_ascii=False))
+                 for k in kategorien])
+
+    def speichere_medien(self, medien: list):
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO media (id, source_url, date_modified_gmt, data) VALUES (?, ?, ?, ?)",
+                [(m["id"], m.get("source_url"), m.get("modified_gmt"),
+                  json.dumps({k: m.get(k) for k in ("id", "source_url", "slug", "modified_gmt", "mime_type")},
+                             ensure_ascii=False)) for m in medien])
+
+    # ---------- Lesen ----------
+
+    def produkte(self, typ: str = None) -> list:
+        sql, args = "SELECT data FROM products", ()
+        if typ:
+            sql, args = sql + " WHERE type = ?", (typ,)
+        return [json.loads(r[0]) for r in self._db.execute(sql + " ORDER BY id", args)]
+
+    def variationen(self, parent_id: int = None):
+        """Liste für einen Parent, ohne parent_id: {parent_id: [variation, ...]}"""
+        if parent_id is not None:
+            return [json.loads(r[0]) for r in self._db.execute(
+                "SELECT data FROM variations WHERE parent_id = ? ORDER BY id", (parent_id,))]
+        alle = {}
+        for pid, data in self._db.execute("SELECT parent_id, data FROM variations ORDER BY id"):
+            alle.setdefault(pid, []).append(json.loads(data))
+        return alle
+
+    def medium_id(self, source_url: str):
+        row = self._db.execute("SELECT id FROM media WHERE source_url = ? ORDER BY id LIMIT 1",
+                               (source_url,)).fetchone()
+        return row[0] if row else None
+
+    def status(self) -> dict:
+        zahlen = {t: self._db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+                  for t in ("products", "variations", "categories", "media")}
+        zahlen["letzter_pull"] = self._get_state("letzter_pull")
+        zahlen["letzter_voller_pull"] = self._get_state("letzter_voller_pull")
+        return zahlen
+
+    # ---------- Pull ----------
+
+    def pull(self, voll: bool = False, verbose: bool = True) -> dict:
+        """Shop -> Spiegel. Inkrementell seit dem letzten Pull, beim ersten Mal voll."""
+        seit = None if voll else self._get_state("letzter_pull")
+        start = _jetzt_gmt()
+        params = {}
+        if seit:
+            ab = datetime.strptime(seit, "%Y-%m-%dT%H:%M:%S") - UHR_TOLERANZ
+            params = {"modified_after": ab.strftime("%Y-%m-%dT%H:%M:%S"), "dates_are_gmt": "true"}
+
+        produkte = wc_get_all("/products", params)
+        if seit is None:
+            with self._lock, self._db:
+                self._db.execute("DELETE FROM variations")
+                self._db.execute("DELETE FROM products")
+        self.speichere_produkte(produkte)
+
+        # Geänderte Variable Products: alle Variationen neu (gelöschte fallen weg);
+        # übrige Parents im Spiegel: nur seitdem geänderte Variationen
+        variable = [p["id"] for p in produkte if p.get("type") == "variable"]
+        unveraendert = []
+        if seit:
+            neu = set(variable)
+            unveraendert = [r[0] for r in self._db.execute("SELECT id FROM products WHERE type = 'variable' ORDER BY id")
+                            if r[0] not in neu]
+
+        def hole(auftrag):
+            pid, nur_geaenderte = auftrag
+            return pid, nur_geaenderte, wc_get_all(f"/products/{pid}/variations", params if nur_geaenderte else {})
+
+        geaenderte_variationen = 0
+        auftraege = [(pid, False) for pid in variable] + [(pid, True) for pid in unveraendert]
+        with ThreadPoolExecutor(max_workers=get_concurrency()) as ex:
+            for pid, nur_geaenderte, variationen in ex.map(hole, auftraege):
+                self.speichere_variationen(variationen, pid, ersetzen=not nur_geaenderte)
+                if nur_geaenderte:
+                    geaenderte_variationen += len(variationen)
+
+        self.speichere_kategorien(wc_get_all("/products/categories"))
+
+        medien = []
+        try:
+            media_params = {"modified_after": params["modified_after"]} if seit else {}
+            medien = wc_get_all(f"{WP_URL}/media", media_params, auth=ohne_auth)
+            self.speichere_medien(medien)
+        except Exception as e:
+            # Mediathek ist optional (z.B. REST für Medien im Shop gesperrt)
+            print(f"[MIRROR] Mediathek nicht geladen: {str(e)[:100]}")
+
+        with self._lock, self._db:
+            self._set_state("letzter_pull", start)
+            if seit is None:
+                self._set_state("letzter_voller_pull", start)
+
+        stats = {"modus": "inkrementell" if seit else "voll", "produkte": len(produkte),
+                 "variable": len(variable), "variationen": geaenderte_variationen, "medien": len(medien)}
+        if verbose:
+            print(f"[MIRROR] Pull ({stats['modus']}): {stats['produkte']} Produkte, "
+                  f"{stats['variable']} mit Variationen neu geladen, "
+                  f"{stats['variationen']} weitere geänderte Variationen, {stats['medien']} Medien")
+        return stats
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Lokaler SQLite-Spiegel des WooCommerce-Katalogs")
+    parser.add_argument("befehl", choices=["pull", "status"])
+    parser.add_argument("--voll", action="store_true", help="Kompletter Pull statt inkrementell")
+    parser.add_argument("--db", default=MIRROR_FILE)
+    args = parser.parse_args(argv)
+
+    mirror = ShopMirror(args.db)
+    try:
+        if args.befehl == "pull":
+            mirror.pull(voll=args.voll)
+        for k, v in mirror.status().items():
+            print(f"  {k:20} {v}")
+    finally:
+        mirror.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Planungs-Stufe: Variations-Matrix für alle Produkte als Tabelle (pandas)
+
+Statt pro Variante x Zustand in einer Python-Schleife SKU, Speicher-Regex,
+Rabatt, Fallback-Preis und Bild neu zu berechnen, wird die komplette Matrix
+EINMAL als DataFrame aufgebaut (Varianten x ZUSTAENDE als Cross-Join) und
+spaltenweise berechnet (Preise über preisregeln.py). Danach validiert; der
+HTTP-Teil bekommt nur noch fertige Payloads. Braucht keinen Shop - zum
+Benchmarken/Prüfen:
+
+    python woo_plan.py output/test_variable.json
+    python woo_plan.py output/test_variable.json --bench 2000
+"""
+
+import sys
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+import preisregeln
+
+# ============================================================
+# ZUSTÄNDE (wie im Original)
+# ============================================================
+ZUSTAENDE = [
+    {"label": "Neuware", "suffix": ""},
+    {"label": "Wie-Neu", "suffix": "WIE-NEU"},
+    {"label": "Sehr-Gut", "suffix": "SEHRGUT"},
+    {"label": "Gut", "suffix": "GUT"},
+    {"label": "Akzeptabel", "suffix": "AKZEPTABEL"},
+]
+
+# === Zustands-Bilder ===
+CONDITION_IMAGE_MAP = {
+    "Wie-Neu":      "http://sell-tekk.de/wp-content/uploads/2025/08/Wie-Neu.png",
+    "Sehr-Gut":     "http://sell-tekk.de/wp-content/uploads/2025/08/Sehr-Gut.png",
+    "Gut":          "http://sell-tekk.de/wp-content/uploads/2025/08/Gut.png",
+    "Akzeptabel":   "http://sell-tekk.de/wp-content/uploads/2025/08/akzeptabel.png",
+}
+
+# Marke für die Preisregeln: Feld "hersteller" im Produkt, sonst aus dem Namen, sonst dieser Default
+STANDARD_HERSTELLER = ""
+MARKEN_MUSTER = {
+    "apple": ("iphone", "ipad", "apple", "macbook", "airpods"),
+    "samsung": ("samsung", "galaxy"),
+    "google": ("pixel", "google"),
+    "xiaomi": ("xiaomi", "redmi", "poco"),
+}
+
+# WooCommerce verknüpft/bearbeitet im Backend max. 50 Variationen am Stück (wc_max_linked_variations),
+# das Frontend lädt darüber die Variationen per AJAX nach - solche Produkte werden im Dry-Run markiert
+MAX_VARIATIONEN = 50
+
+SPALTEN = ["produkt", "sku_base", "marke", "farbe", "speicher", "idealo_preis", "variant_bild"]
+
+
+def erkenne_marke(product_data: dict) -> str:
+    if product_data.get("hersteller"):
+        return str(product_data["hersteller"]).lower()
+    name = str(product_data.get("name") or "").lower()
+    for marke, muster in MARKEN_MUSTER.items():
+        if any(m in name for m in muster):
+            return marke
+    return STANDARD_HERSTELLER.lower()
+
+
+def _zustaende_df() -> pd.DataFrame:
+    z = pd.DataFrame(ZUSTAENDE).rename(columns={"label": "zustand"})
+    z["zustand_kurz"] = np.where(z["zustand"] == "Neuware", "NW", z["zustand"].str[:4].str.upper())
+    z["zustand_pos"] = np.arange(len(z))
+    return z[["zustand", "zustand_kurz", "zustand_pos"]]
+
+
+def varianten_df(produkte: list, sku_basen: list) -> pd.DataFrame:
+    """Eine Zeile pro (Produkt, Variante) - die einzige Schleife über die Eingabe"""
+    marken = [erkenne_marke(p) for p in produkte]
+    zeilen = [
+        (i, sku_basen[i], marken[i], v.get("farbe") or "", v.get("speicher") or "", v.get("preis") or 0,
+         v.get("bild") or "")
+        for i, p in enumerate(produkte) for v in p.get("varianten", [])
+    ]
+    df = pd.DataFrame(zeilen, columns=SPALTEN)
+    df["idealo_preis"] = pd.to_numeric(df["idealo_preis"], errors="coerce").fillna(0.0).astype(float)
+    # Erste Zahl im Speicher-Text wie bisher ("128 GB" -> 128), NaN wenn keine
+    df["speicher_gb"] = pd.to_numeric(df["speicher"].str.extract(r"(\d+)", expand=False), errors="coerce")
+    df["variante_pos"] = np.arange(len(df))
+    return df
+
+
+def baue_matrix(produkte: list, sku_basen: list, regeln=None) -> pd.DataFrame:
+    """
+    Komplette Variations-Matrix: eine Zeile pro Variation (Variante x Zustand)
+    mit sku, preis, status, bild. Reihenfolge wie bisher: Variante, dann Zustand.
+    regeln: PreisEvaluator (Default: preisregeln.standard())
+    """
+    df = varianten_df(produkte, sku_basen).merge(_zustaende_df(), how="cross")
+    df = df.sort_values(["variante_pos", "zustand_pos"], kind="stable").reset_index(drop=True)
+
+    farbe_kurz = df["farbe"].str[:3].str.upper().replace("", "XXX")
+    speicher_kurz = df["speicher"].str.replace(" ", "", regex=False).str.upper().replace("", "XXX")
+    df["sku"] = df["sku_base"] + "-" + farbe_kurz + "-" + speicher_kurz + "-" + df["zustand_kurz"]
+
+    df["preis"] = (regeln or preisregeln.standard()).anwenden(df)
+    neuware = (df["zustand"] == "Neuware").to_numpy()
+    df["status"] = np.where(neuware, "publish", "draft")
+    # Bild: Für Neuware = Produktbild, für andere Zustände = Zustands-Bild
+    df["bild"] = np.where(neuware, df["variant_bild"], df["zustand"].map(CONDITION_IMAGE_MAP).fillna(""))
+    return df
+
+
+def validiere(df: pd.DataFrame) -> list:
+    """Probleme in der Matrix als Liste von Texten (leer = ok)"""
+    probleme = []
+    doppelt = df[df.duplicated("sku", keep=False)]
+    if len(doppelt):
+        probleme.append(f"{doppelt['sku'].nunique()} SKUs mehrfach vergeben (z.B. {doppelt['sku'].iloc[0]})")
+    kombi = df[df.duplicated(["produkt", "speicher", "farbe", "zustand"], keep=False)]
+    if len(kombi):
+        probleme.append(f"{len(kombi)} Zeilen mit doppelter Speicher/Farbe/Zustand-Kombination "
+                        f"(Produkte {sorted(kombi['produkt'].unique().tolist())[:10]})")
+    ungueltig = df[~np.isfinite(df["preis"]) | (df["preis"] <= 0)]
+    if len(ungueltig):
+        probleme.append(f"{len(ungueltig)} Variationen ohne gültigen Preis (z.B. {ungueltig['sku'].iloc[0]})")
+    ohne_attribute = df[(df["farbe"] == "") & (df["speicher"] == "")]
+    if len(ohne_attribute):
+        probleme.append(f"{len(ohne_attribute)} Variationen ohne Farbe und Speicher")
+    return probleme
+
+
+def ueber_limit(df: pd.DataFrame, limit: int = MAX_VARIATIONEN) -> dict:
+    """{produkt_index: anzahl_variationen} für Produkte mit mehr als `limit` Variationen"""
+    anzahl = df.groupby("produkt").size()
+    return {int(i): int(n) for i, n in anzahl[anzahl > limit].items()}
+
+
+def _preis_str(preis: float) -> str:
+    return f"{preis:.2f}".rstrip("0").rstrip(".") if preis else ""
+
+
+def payloads_je_produkt(df: pd.DataFrame) -> dict:
+    """{produkt_index: [variation_payload, ...]} - fertig für /variations/batch"""
+    ergebnis = {}
+    spalten = ["produkt", "sku", "preis", "status", "bild", "speicher", "farbe", "zustand"]
+    for produkt, sku, preis, status, bild, speicher, farbe, zustand in df[spalten].itertuples(index=False):
+        attribute = []
+        if speicher:
+            attribute.append({"name": "Speicher", "option": speicher})
+        if farbe:
+            attribute.append({"name": "Farbe", "option": farbe})
+        attribute.append({"name": "Zustand", "option": zustand})
+        ergebnis.setdefault(produkt, []).append({
+            "sku": sku,
+            "regular_price": _preis_str(preis),
+            "status": status,
+            "manage_stock": False,
+            "attributes": attribute,
+            "image": {"src": bild} if bild else None,
+        })
+    return ergebnis
+
+
+def plane(produkte: list, sku_basen: list, regeln=None) -> tuple:
+    """Matrix + Validierung + Payloads in einem Schritt: (df, probleme, payloads_je_produkt)"""
+    df = baue_matrix(produkte, sku_basen, regeln)
+    return df, validiere(df), payloads_je_produkt(df)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Variations-Matrix planen und prüfen (ohne Shop)")
+    parser.add_argument("input", help="JSON mit 'produkte' (wie für woo_variable_uploader.py)")
+    parser.add_argument("--bench", type=int, default=0, metavar="N",
+                        help="Benchmark: Eingabe auf N Produkte vervielfachen")
+    args = parser.parse_args(argv)
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        produkte = json.load(f).get("produkte", [])
+    if args.bench:
+        produkte = [produkte[i % len(produkte)] for i in range(args.bench)]
+    sku_basen = [f"PLAN-{i:06d}" for i in range(len(produkte))]
+
+    start = time.perf_counter()
+    df, probleme, payloads = plane(produkte, sku_basen)
+    dauer = time.perf_counter() - start
+
+    print(f"[PLAN] {len(produkte)} Produkte -> {len(df)} Variationen in {dauer*1000:.1f} ms")
+    print(df.groupby("zustand", sort=False)["preis"].describe()[["count", "min", "50%", "max"]].to_string())
+    for p in probleme:
+        print(f"[WARN] {p}")
+    zu_gross = ueber_limit(df)
+    if zu_gross:
+        print(f"[INFO] {len(zu_gross)} Produkte mit mehr als {MAX_VARIATIONEN} Variationen")
+    return 1 if probleme and not args.bench else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Diff-basierter Sync gegen den Shop (statt jedes Mal neue Produkte anzulegen)
+
+1. Bestehende Variable Products + Variationen EINMAL paginiert laden
+2. Zuordnung über stabile Keys:
+   - Produkt:   EAN (meta_data "EAN"), sonst normalisierter Name
+   - Variation: Speicher + Farbe + Zustand
+3. Diff: nur geänderte Felder (regular_price, status, attributes) per Batch-Update,
+   fehlende Variationen/Produkte anlegen, optional verwaiste Variationen löschen (prune)
+4. SEO (seo_templates.py) nur, wenn sich der Inhalts-Hash (meta seo_hash) geändert hat
+
+Der Shop-Zustand kommt aus dem lokalen Spiegel (woo_mirror.py), der vorher
+inkrementell aktualisiert wird - offline=True diffed ganz ohne API-Aufruf.
+
+Bestehende Produkte behalten ihre SKU-Basis - ein täglicher Preis-Refresh
+wird so zu ein paar kleinen Batch-Updates statt einem kompletten Re-Create.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from woo_api import wc_get_all, wc_batch, get_concurrency
+from woo_keys import produkt_keys, variation_key, ean_aus_meta
+from woo_media import batch_mit_medien
+from woo_plan import plane
+import seo_templates
+from woo_variable_uploader import (
+    ZUSTAENDE, build_parent_payload, build_variation_payloads, _create_products, _variation_label,
+)
+
+VARIATION_FELDER = ("regular_price", "status", "attributes")
+
+
+def _preis_gleich(a, b) -> bool:
+    try:
+        return round(float(a or 0), 2) == round(float(b or 0), 2)
+    except (TypeError, ValueError):
+        return str(a or "") == str(b or "")
+
+
+# ============================================================
+# SHOP LADEN
+# ============================================================
+
+def lade_shop(verbose: bool = True, mirror=None, offline: bool = False) -> dict:
+    """
+    Alle Variable Products + ihre Variationen holen - aus dem Spiegel (nach
+    inkrementellem Pull, offline ohne) oder ohne Spiegel direkt live.
+    Returns: {"produkte": {key: produkt}, "variationen": {parent_id: [variation, ...]}}
+    """
+    if mirror is not None:
+        if not offline:
+            mirror.pull(verbose=verbose)
+        shop = index_shop(mirror.produkte("variable"), mirror.variationen())
+        if verbose:
+            print(f"[SYNC] Spiegel: {mirror.status()['products']} Produkte, Stand {mirror.status()['letzter_pull']}")
+        return shop
+
+    produkte = wc_get_all("/products", {"type": "variable"})
+    if verbose:
+        print(f"[SYNC] {len(produkte)} Variable Products im Shop")
+
+    def variationen(p):
+        return p["id"], wc_get_all(f"/products/{p['id']}/variations")
+
+    with ThreadPoolExecutor(max_workers=get_concurrency()) as ex:
+        alle_variationen = dict(ex.map(variationen, produkte))
+    if verbose:
+        print(f"[SYNC] {sum(len(v) for v in alle_variationen.values())} Variationen geladen")
+
+    return index_shop(produkte, alle_variationen)
+
+
+def index_shop(produkte: list, variationen: dict) -> dict:
+    index = {}
+    for p in produkte:
+        for key in produkt_keys(p.get("name"), ean_aus_meta(p)):
+            index.setdefault(key, p)  # bei Dubletten gewinnt das älteste Produkt
+    return {"produkte": index, "variationen": variationen}
+
+
+def finde_produkt(shop: dict, product_data: dict):
+    for key in produkt_keys(product_data.get("name"), product_data.get("ean")):
+        if key in shop["produkte"]:
+            return shop["produkte"][key]
+    return None
+
+
+# ============================================================
+# DIFF
+# ============================================================
+
+def _attribut_update(parent: dict, soll: list):
+    """Neue Farben/Speicher müssen im Parent-Attribut stehen, sonst greifen die Variationen nicht"""
+    ist = {a.get("name"): a for a in parent.get("attributes") or []}
+    neu = []
+    geaendert = False
+    for a in soll:
+        alt = ist.get(a["name"])
+        optionen = list(alt.get("options") or []) if alt else []
+        for o in a["options"]:
+            if o not in optionen:
+                optionen.append(o)
+                geaendert = True
+        neu.append(dict(a, options=optionen))
+    # Fremde Attribute (im Shop gepflegt) behalten
+    neu += [a for name, a in ist.items() if name not in {x["name"] for x in soll}]
+    return {"id": parent["id"], "attributes": neu} if geaendert else None
+
+
+def _sku_base(parent: dict) -> str:
+    return parent.get("sku") or f"ID{parent['id']}"
+
+
+def _seo_update(product_data: dict, parent: dict):
+    """SEO-Felder für den Parent, wenn sich der Hash geändert hat - sonst None (nichts rendern)"""
+    werte = seo_templates.parent_werte(product_data)
+    if seo_templates.shop_hash(parent) == seo_templates.inhalt_hash("parent", werte):
+        return None
+    felder = seo_templates.parent_felder(seo_templates.parent_seo(werte))
+    if product_data.get("ean"):
+        felder["meta_data"].append({"key": "EAN", "value": product_data["ean"]})
+    return felder
+
+
+def diff_produkt(product_data: dict, parent: dict, shop_variationen: list, prune: bool = False,
+                 soll: list = None) -> dict:
+    """Diff für ein bestehendes Produkt - nur geänderte Felder (soll: vorgeplante Payloads)"""
+    sku_base = _sku_base(parent)
+    name = product_data.get("name", "Unbekannt")
+    soll_parent = build_parent_payload(product_data, sku_base, with_seo=False)
+    if soll is None:
+        soll = build_variation_payloads(product_data, sku_base)
+    ist = {variation_key(v.get("attributes")): v for v in shop_variationen}
+
+    create, update, gesehen = [], [], set()
+    for payload in soll:
+        key = variation_key(payload["attributes"])
+        gesehen.add(key)
+        v = ist.get(key)
+        seo_werte = seo_templates.variante_werte(name, payload["attributes"])
+        if v is None:
+            create.append({**payload, **seo_templates.variante_felder(seo_werte)})
+            continue
+        aenderung = {}
+        if not _preis_gleich(v.get("regular_price"), payload["regular_price"]):
+            aenderung["regular_price"] = payload["regular_price"]
+        if v.get("status") != payload["status"]:
+            aenderung["status"] = payload["status"]
+        if variation_key(v.get("attributes")) != key or \
+                {a.get("name") for a in v.get("attributes") or []} != {a["name"] for a in payload["attributes"]}:
+            aenderung["attributes"] = payload["attributes"]
+        if seo_templates.shop_hash(v) != seo_templates.inhalt_hash("variante", seo_werte):
+            aenderung.update(seo_templates.variante_felder(seo_werte))
+        if aenderung:
+            update.append(dict(aenderung, id=v["id"], _label=_variation_label(payload)))
+
+    delete = [v["id"] for key, v in ist.items() if key not in gesehen] if prune else []
+
+    parent_update = _attribut_update(parent, soll_parent["attributes"])
+    seo = _seo_update(product_data, parent)
+    if seo:
+        parent_update = {**(parent_update or {"id": parent["id"]}), **seo}
+
+    return {
+        "name": name,
+        "aktion": "update" if (create or update or delete) else "unveraendert",
+        "parent_id": parent["id"],
+        "sku_base": sku_base,
+        "parent_update": parent_update,
+        "variationen_shop": len(shop_variationen),
+        "create": create,
+        "update": update,
+        "delete": delete,
+    }
+
+
+def berechne_diff(produkte: list, shop: dict, prune: bool = False) -> list:
+    parents = [finde_produkt(shop, p) for p in produkte]
+    # Soll-Variationen aller bestehenden Produkte in EINER Matrix planen
+    bestehend = [i for i, parent in enumerate(parents) if parent is not None]
+    _, probleme, soll = plane([produkte[i] for i in bestehend], [_sku_base(parents[i]) for i in bestehend])
+    for problem in probleme:
+        print(f"[WARN] Planung: {problem}")
+    soll = {i: soll.get(n, []) for n, i in enumerate(bestehend)}
+
+    diffs = []
+    for i, (p, parent) in enumerate(zip(produkte, parents)):
+        if parent is None:
+            diffs.append({"name": p.get("name", "Unbekannt"), "aktion": "neu", "produkt": p,
+                          "parent_id": None, "parent_update": None, "create": [], "update": [], "delete": []})
+        else:
+            d = diff_produkt(p, parent, shop["variationen"].get(parent["id"], []), prune, soll[i])
+            if d["parent_update"] and d["aktion"] == "unveraendert":
+                d["aktion"] = "update"
+            diffs.append(d)
+    return diffs
+
+
+def diff_bericht(diffs: list) -> dict:
+    summe = {"neu": 0, "update": 0, "unveraendert": 0,
+             "variationen_neu": 0, "variationen_update": 0, "variationen_delete": 0, "seo": 0}
+    for d in diffs:
+        summe[d["aktion"]] += 1
+        summe["seo"] += bool(d["parent_update"] and "meta_data" in d["parent_update"])
+        summe["seo"] += sum("meta_data" in u for u in d["update"])
+        if d["aktion"] == "neu":
+            summe["variationen_neu"] += len(d["produkt"].get("varianten", [])) * len(ZUSTAENDE)
+        summe["variationen_neu"] += len(d["create"])
+        summe["variationen_update"] += len(d["update"])
+        summe["variationen_delete"] += len(d["delete"])
+    return summe
+
+
+def zeige_diff(diffs: list):
+    for d in diffs:
+        if d["aktion"] == "unveraendert":
+            continue
+        if d["aktion"] == "neu":
+            print(f"  [NEU]    {d['name']} ({len(d['produkt'].get('varianten', []))} x {len(ZUSTAENDE)} Variationen)")
+            continue
+        print(f"  [UPDATE] {d['name']} (ID {d['parent_id']}): +{len(d['create'])} ~{len(d['update'])} -{len(d['delete'])}")
+        if d["parent_update"]:
+            teile = [t for k, t in (("attributes", "Attribute erweitert"), ("meta_data", "SEO neu"))
+                     if k in d["parent_update"]]
+            print(f"           Parent: {', '.join(teile)}")
+        for u in d["update"]:
+            felder = [f"{k}={u[k]}" for k in VARIATION_FELDER if k in u and k != "attributes"]
+            felder += [k for k in ("attributes",) if k in u] + (["SEO"] if "meta_data" in u else [])
+            print(f"           ~ {u['_label']}: {', '.join(felder)}")
+    s = diff_bericht(diffs)
+    print(f"\n[SYNC] Produkte: {s['neu']} neu, {s['update']} geändert, {s['unveraendert']} unverändert")
+    print(f"[SYNC] Variationen: {s['variationen_neu']} neu, {s['variationen_update']} Updates, "
+          f"{s['variationen_delete']} löschen")
+    print(f"[SYNC] SEO: {s['seo']} Parents/Variationen mit geändertem Hash")
+
+
+# ============================================================
+# AUSFÜHREN
+# ============================================================
+
+def _schreibe_variationen(d: dict, mirror=None, media=None) -> dict:
+    update = [{k: v for k, v in u.items() if not k.startswith("_")} for u in d["update"]]
+    res = batch_mit_medien(media, f"/products/{d['parent_id']}/variations",
+                           create=d["create"], update=update, delete=d["delete"])
+    if mirror is not None:
+        mirror.speichere_variationen([r["data"] for r in res["create"] + res["update"] if r["ok"]], d["parent_id"])
+        mirror.loesche_variationen([i for i, r in zip(d["delete"], res["delete"]) if r["ok"]])
+    fehler = [r["error"] for op in res.values() for r in op if not r["ok"]]
+    for f in fehler[:5]:
+        print(f"       {d['name']}: FEHLER {f[:100]}")
+    return {"success": not fehler, "parent_id": d["parent_id"], "name": d["name"],
+            "variationen": sum(r["ok"] for op in res.values() for r in op), "fehler": len(fehler)}
+
+
+def fuehre_aus(diffs: list, concurrency: int = 1, mirror=None, media=None) -> list:
+    """Diff schreiben: Parent-Attribute, neue Produkte, Variations-Deltas (Antworten -> Spiegel)"""
+    results = []
+
+    parent_updates = [d["parent_update"] for d in diffs if d["parent_update"]]
+    if parent_updates:
+        res = wc_batch("/products", update=parent_updates)["update"]
+        if mirror is not None:
+            mirror.speichere_produkte([r["data"] for r in res if r["ok"]])
+        print(f"[SYNC] Parents (Attribute/SEO): {sum(r['ok'] for r in res)}/{len(res)} aktualisiert")
+
+    neue = [d["produkt"] for d in diffs if d["aktion"] == "neu"]
+    if neue:
+        print(f"[SYNC] Lege {len(neue)} neue Produkte an")
+        results += _create_products(neue, concurrency=concurrency, media=media)
+
+    geaendert = [d for d in diffs if d["aktion"] == "update" and (d["create"] or d["update"] or d["delete"])]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        results += list(ex.map(lambda d: _schreibe_variationen(d, mirror, media), geaendert))
+
+    # Neu angelegte Produkte per inkrementellem Pull in den Spiegel holen
+    if neue and mirror is not None:
+        mirror.pull(verbose=False)
+    return results
+
+
+def sync_products(produkte: list, dry_run: bool = False, prune: bool = False, concurrency: int = 1,
+                  mirror=None, offline: bool = False, media=None, dryrun_datei: str = None) -> list:
+    shop = lade_shop(mirror=mirror, offline=offline)
+    diffs = berechne_diff(produkte, shop, prune)
+    zeige_diff(diffs)
+    if dry_run:
+        from woo_dryrun import BildStand, plan_sync, zeige_plan
+        zeige_plan(plan_sync(diffs, BildStand(media, offline)), concurrency, dryrun_datei)
+        return []
+    return fuehre_aus(diffs, concurrency, mirror, media)
@@ -12,109 +12,42 @@ Basiert auf dem CSV-Format aus idealo_crawler_varianten_ready_bilderzuvariaten.p
 import os
 import sys
 import json
-import time
-import requests
 import re
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # === BASE DIR ===
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# === WOOCOMMERCE CONFIG ===
-WC_CK = "ck_6b947bafda50e508976a407186d1e7fade4a6a0f"
-WC_CS = "cs_d6ed242dc239723dc2159a3a17b570e38a4392a8"
-WC_URL = "https://sell-tekk.de/wp-json/wc/v3"
+# === WOOCOMMERCE (Config, Session, Batch) ===
+from woo_api import BATCH_SIZE, wc_get_all, wc_request, set_concurrency, MAX_CONCURRENCY
+from woo_keys import produkt_key
+from woo_journal import UploadJournal, journal_pfad
+from woo_media import MediaCache, batch_mit_medien
 
-CONFIG_FILE = os.path.join(BASE_DIR, "output", "woo_config.json")
-if os.path.exists(CONFIG_FILE):
-    with open(CONFIG_FILE, 'r') as f:
-        config = json.load(f)
-        WC_URL = config.get('shop_url', WC_URL) + '/wp-json/wc/v3'
-        WC_CK = config.get('consumer_key', WC_CK)
-        WC_CS = config.get('consumer_secret', WC_CS)
 
-
-def get_auth():
-    return (WC_CK, WC_CS)
+# === ZUSTÄNDE, Zustands-Bilder, Variations-Matrix (Planung ohne Shop) ===
+from woo_plan import ZUSTAENDE, plane
+import woo_plan
+import preisregeln
+import seo_templates
 
 
 # ============================================================
-# ZUSTÄNDE (wie im Original)
-# ============================================================
-ZUSTAENDE = [
-    {"label": "Neuware", "suffix": ""},
-    {"label": "Wie-Neu", "suffix": "WIE-NEU"},
-    {"label": "Sehr-Gut", "suffix": "SEHRGUT"},
-    {"label": "Gut", "suffix": "GUT"},
-    {"label": "Akzeptabel", "suffix": "AKZEPTABEL"},
-]
-
-# === Zustands-Bilder ===
-CONDITION_IMAGE_MAP = {
-    "Wie-Neu":      "http://sell-tekk.de/wp-content/uploads/2025/08/Wie-Neu.png",
-    "Sehr-Gut":     "http://sell-tekk.de/wp-content/uploads/2025/08/Sehr-Gut.png",
-    "Gut":          "http://sell-tekk.de/wp-content/uploads/2025/08/Gut.png",
-    "Akzeptabel":   "http://sell-tekk.de/wp-content/uploads/2025/08/akzeptabel.png",
-}
-
-
-# ============================================================
-# SEO (wie zuvor)
+# SEO (Templates + Inhalts-Hash in seo_templates.py)
 # ============================================================
 
 def generate_keywords(name, farbe, speicher):
-    name_clean = name.replace(" verkaufen", "").strip()
-    keywords = [
-        name_clean, f"{name_clean} verkaufen",
-        f"{name_clean} {farbe}", f"{name_clean} {speicher}",
-        "Smartphone verkaufen", "Handy verkaufen",
-        "Ankauf", "Sofortauszahlung", "Deutschland"
-    ]
-    return ", ".join(keywords[:8])
+    return seo_templates.keywords(seo_templates.basisname(name), [farbe] if farbe else [],
+                                  [speicher] if speicher else [])
 
 
 def generate_seo(name, farbe, speicher):
-    name = (name or "").replace(" verkaufen", "").strip()
-    
-    meta_titel = (
-        f"{name} {farbe} {speicher} verkaufen | Top-Ankaufpreise Deutschland + Bremen | "
-        f"Sofortauszahlung in 6 Stunden | größte Plattform Norddeutschland"
-    )
-    
-    meta_desc = (
-        f"{name} {farbe} {speicher} verkaufen? Wir bieten die höchsten Ankaufpreise in ganz Deutschland! "
-        "Sofortauszahlung innerhalb 6 Stunden, kostenloser Versand. "
-        "Die größte Ankaufsplattform in Bremen, Hamburg, Hannover & Norddeutschland. "
-        "Jetzt verkaufen - innerhalb 6 Stunden Geld auf dein Konto!"
-    )
-    
-    og_desc = f"{name} {farbe} {speicher} verkaufen - Sofortauszahlung 6Std - Top-Preise"
-    
-    kw = generate_keywords(name, farbe, speicher)
-    
-    description = f"""
-Verkaufe dein {name} {farbe} mit {speicher} Speicher jetzt einfach und sicher an SellTekk.
-
-✅ Sofortauszahlung innerhalb von 6 Stunden
-✅ Kostenloser Versand mit DHL
-✅ Faire Bewertung
-✅ Sicherer Datentransfer
-✅ Größte Ankaufsplattform Bremen, Hamburg, Hannover
-✅ Über 10.000 zufriedene Kunden
-
-Bremen | Hamburg | Hannover | Deutschlandweite Top-Preise
-""".strip()
-    
-    schema = json.dumps({
-        "@context": "https://schema.org",
-        "@type": "Product",
-        "name": f"{name} {farbe} {speicher}",
-        "description": meta_desc,
-        "offers": {"@type": "Offer", "priceCurrency": "EUR", "price": "0", "availability": "https://schema.org/InStock"}
-    })
-    
-    return {"meta_titel": meta_titel, "meta_desc": meta_desc, "keywords": kw, 
-            "description": description, "og_desc": og_desc, "schema_product": schema}
+    werte = {"name": seo_templates.basisname(name), "farben": [farbe] if farbe else [],
+             "speicher": [speicher] if speicher else [], "ean": ""}
+    seo = seo_templates.parent_seo(werte)
+    seo.pop("hash")
+    return seo
 
 
 def parse_variant_info(text):
@@ -138,47 +71,28 @@ def parse_variant_info(text):
 # VARIABLE PRODUCT ERSTELLEN
 # ============================================================
 
-def create_variable_product(product_data: dict, with_seo: bool = True) -> dict:
-    """
-    Erstellt ein Variable Product mit Attributen und allen Variationen.
-    """
-    name = product_data.get('name', 'Unbekannt')
-    # SKU generieren wenn nicht vorhanden - IMMER neu generieren!
+def _neue_sku_base() -> str:
+    # SKU generieren - IMMER neu generieren!
     import uuid
-    sku_base = f"VAR-{uuid.uuid4().hex[:10].upper()}"
-    
-    preise = product_data.get('preise', {})  # Dict: {(farbe, speicher, zustand): preis}
+    return f"VAR-{uuid.uuid4().hex[:10].upper()}"
+
+
+def build_parent_payload(product_data: dict, sku_base: str, with_seo: bool = True) -> dict:
+    """Parent (type=variable) mit Attributen Speicher/Farbe/Zustand + SEO"""
+    name = product_data.get('name', 'Unbekannt')
     varianten = product_data.get('varianten', [])  # Liste: [{farbe, speicher, zustand, preis}, ...]
     categories = product_data.get('categories', [])
     ean = product_data.get('ean', '')
-    
-    print(f"\n[INFO] Erstelle Variable Product: {name}")
-    print(f"       SKU-Basis: {sku_base}")
-    
+
     # Sammle alle Farben und Speicher
-    alle_farben = set()
-    alle_speicher = set()
-    
-    for v in varianten:
-        if v.get('farbe'):
-            alle_farben.add(v['farbe'])
-        if v.get('speicher'):
-            alle_speicher.add(v['speicher'])
-    
-    alle_farben = sorted(list(alle_farben))
-    alle_speicher = sorted(list(alle_speicher))
-    
-    print(f"       Farben: {alle_farben}")
-    print(f"       Speicher: {alle_speicher}")
-    print(f"       Zustände: {len(ZUSTAENDE)}")
-    print(f"       Variationen: {len(varianten)}")
-    
-    # === 1. PARENT PRODUKT ERSTELLEN ===
+    alle_farben = sorted({v['farbe'] for v in varianten if v.get('farbe')})
+    alle_speicher = sorted({v['speicher'] for v in varianten if v.get('speicher')})
+
     # Bild holen aus erster Variante
     bild_url = product_data.get('bild', '')
     if not bild_url and varianten:
         bild_url = varianten[0].get('bild', '')
-    
+
     parent_data = {
         "name": name,
         "sku": sku_base,
@@ -190,147 +104,243 @@ def create_variable_product(product_data: dict, with_seo: bool = True) -> dict:
         "meta_data": [],
         "images": [{"src": bild_url}] if bild_url else []
     }
-    
+
     # Attribute hinzufügen
     attributes = []
-    
-    # Speicher
     if alle_speicher:
-        attributes.append({
-            "name": "Speicher",
-            "visible": True,
-            "variation": True,
-            "options": alle_speicher
-        })
-    
-    # Farbe
+        attributes.append({"name": "Speicher", "visible": True, "variation": True, "options": alle_speicher})
     if alle_farben:
-        attributes.append({
-            "name": "Farbe",
-            "visible": True,
-            "variation": True,
-            "options": alle_farben
-        })
-    
-    # Zustand
-    attributes.append({
-        "name": "Zustand",
-        "visible": True,
-        "variation": True,
-        "options": [z['label'] for z in ZUSTAENDE]
-    })
-    
+        attributes.append({"name": "Farbe", "visible": True, "variation": True, "options": alle_farben})
+    attributes.append({"name": "Zustand", "visible": True, "variation": True,
+                       "options": [z['label'] for z in ZUSTAENDE]})
     parent_data["attributes"] = attributes
-    
-    # SEO
+
+    # SEO über alle Farben/Speicher (seo_templates.py), Hash als meta seo_hash
     if with_seo:
-        farbe_first = alle_farben[0] if alle_farben else ""
-        speicher_first = alle_speicher[0] if alle_speicher else ""
-        seo = generate_seo(name, farbe_first, speicher_first)
-        
-        parent_data["short_description"] = seo["meta_desc"][:150]
-        parent_data["description"] = seo["description"]
-        parent_data["meta_data"] = [
-            {"key": "seo_title", "value": seo["meta_titel"]},
-            {"key": "keywords", "value": seo["keywords"]},
-            {"key": "schema_product", "value": seo["schema_product"]},
-        ]
+        seo = seo_templates.parent_seo(seo_templates.parent_werte(product_data))
+        parent_data.update(seo_templates.parent_felder(seo))
         if ean:
             parent_data["meta_data"].append({"key": "EAN", "value": ean})
-    
-    # Parent erstellen
-    r = requests.post(f"{WC_URL}/products", auth=get_auth(), json=parent_data)
-    
-    if not r.ok:
-        return {"success": False, "name": name, "error": f"Parent: {r.text[:200]}"}
-    
-    parent_id = r.json().get('id')
-    print(f"       Parent erstellt: ID {parent_id}")
-    
-    # === 2. VARIATIONEN ERSTELLEN ===
-    # Für jede Variante (Farbe+Speicher) alle 5 Zustände erstellen!
-    total_created = 0
-    for i, v in enumerate(varianten):
-        farbe = v.get('farbe', '')
-        speicher = v.get('speicher', '')
-        preis = v.get('preis', 0)
-        
-        # 30% Rabatt auf Idealo-Preis!
-        if preis and preis > 0:
-            preis = round(preis * 0.7, 2)
+
+    return parent_data
+
+
+def build_variation_payloads(product_data: dict, sku_base: str) -> list:
+    """
+    Für jede Variante (Farbe+Speicher) alle 5 Zustände - aus der Planungs-Matrix (woo_plan.py).
+    Kein parent_id im Payload - der steckt im Batch-Pfad.
+    """
+    _, _, payloads = plane([product_data], [sku_base])
+    return payloads.get(0, [])
+
+
+def _variation_label(payload: dict) -> str:
+    werte = {a["name"]: a["option"] for a in payload["attributes"]}
+    return f"{werte.get('Farbe', '')} {werte.get('Speicher', '')} {werte.get('Zustand', '')}"
+
+
+def _finde_parent_per_sku(sku_base: str):
+    """Parent-ID zu einer SKU im Shop (None wenn es ihn nicht gibt)"""
+    r = wc_request("GET", "/products", params={"sku": sku_base})
+    r.raise_for_status()
+    treffer = r.json()
+    return treffer[0]["id"] if treffer else None
+
+
+def create_variations(parent_id: int, payloads: list, log: list = None, journal=None, key: str = None,
+                      media=None) -> tuple:
+    """
+    Variationen per /products/{id}/variations/batch anlegen, Chunk für Chunk.
+    Mit Journal: bestätigte Chunks werden übersprungen, unbestätigte gegen die
+    SKUs im Shop geprüft (nur Fehlende werden gesendet).
+    Mit MediaCache: Bilder per Media-ID statt jedes Mal per src.
+    Returns: (erstellt, fehlgeschlagen) - Ausgaben landen in `log` (sonst print)
+    """
+    ausgabe = log.append if log is not None else print
+    chunks = [payloads[i:i + BATCH_SIZE] for i in range(0, len(payloads), BATCH_SIZE)]
+    erledigt = dict(journal.zustand(key)["chunks_erledigt"]) if journal and journal.zustand(key) else {}
+    offen = journal.offene_chunks(key) if journal else set()
+    vorhanden = {v.get("sku") for v in wc_get_all(f"/products/{parent_id}/variations")} if offen else set()
+
+    ok = fehler = 0
+    for n, chunk in enumerate(chunks):
+        if n in erledigt:
+            ok += erledigt[n]
+            ausgabe(f"       Chunk {n+1}/{len(chunks)}: bereits erledigt (Journal)")
+            continue
+        if n in offen:
+            schon_da = [x for x in chunk if x["sku"] in vorhanden]
+            chunk = [x for x in chunk if x["sku"] not in vorhanden]
+            ok += len(schon_da)
+            if schon_da:
+                ausgabe(f"       Chunk {n+1}/{len(chunks)}: {len(schon_da)} Variationen schon im Shop")
+        if journal:
+            journal.schreibe("chunk_geplant", key, chunk=n, parent_id=parent_id)
+
+        chunk_ok = 0
+        ergebnisse = batch_mit_medien(media, f"/products/{parent_id}/variations", create=chunk)["create"] if chunk else []
+        for i, (payload, res) in enumerate(zip(chunk, ergebnisse)):
+            label = _variation_label(payload)
+            nr = n * BATCH_SIZE + i + 1
+            if res["ok"]:
+                chunk_ok += 1
+                status_str = "[PUB]" if payload["status"] == "publish" else "[DRAFT]"
+                ausgabe(f"       [{nr}/{len(payloads)}] {label} = {payload['regular_price']}€ {status_str} (ID: {res['id']})")
+            else:
+                ausgabe(f"       [{nr}/{len(payloads)}] {label} - FEHLER: {res['error'][:100]}")
+        if journal:
+            journal.schreibe("chunk_erledigt", key, chunk=n, ok=chunk_ok, fehler=len(chunk) - chunk_ok)
+        ok += chunk_ok
+        fehler += len(chunk) - chunk_ok
+    return ok, fehler
+
+
+def _plane_parents(produkte: list, journal) -> list:
+    """
+    Pro Produkt: (aktion, sku_base, parent_id) mit aktion "neu" | "fortsetzen" | "fertig"
+    Ohne Journal ist alles "neu".
+    """
+    plan = []
+    for p in produkte:
+        z = journal.zustand(produkt_key(p)) if journal else None
+        if z is None or z["zurueckgerollt"] or not z["parent_geplant"]:
+            plan.append(("neu", _neue_sku_base(), None))
+        elif z["fertig"]:
+            plan.append(("fertig", z["sku_base"], z["parent_id"]))
+        elif z["parent_id"]:
+            plan.append(("fortsetzen", z["sku_base"], z["parent_id"]))
         else:
-            # Fallback
-            speicher_gb = int(re.search(r'(\d+)', speicher).group(1)) if speicher and re.search(r'(\d+)', speicher) else 256
-            preis = 500 + ((speicher_gb - 256) // 256) * 100
-        
-        # Bild für diese Variation
-        variant_bild = v.get('bild', '')
-        
-        # Für JEDEN Zustand eine Variation erstellen!
-        for zustand_obj in ZUSTAENDE:
-            zustand = zustand_obj["label"]
-            zustand_kurz = "NW" if zustand == "Neuware" else zustand[:4].upper()
-            
-            # SKU für Variation
-            farbe_kurz = farbe[:3].upper() if farbe else "XXX"
-            speicher_kurz = speicher.replace(" ", "").upper() if speicher else "XXX"
-            var_sku = f"{sku_base}-{farbe_kurz}-{speicher_kurz}-{zustand_kurz}"
-            
-            # Status: Nur Neuware = publish, andere = draft
-            is_publish = (zustand == "Neuware")
-            
-            # Bild: Für Neuware = Produktbild, für andere Zustände = Zustands-Bild
-            if zustand == "Neuware":
-                bild_url = variant_bild if variant_bild else None
+            # Parent-Request lief, Antwort fehlt -> im Shop nachsehen statt doppelt anlegen
+            parent_id = _finde_parent_per_sku(z["sku_base"])
+            if parent_id:
+                journal.schreibe("parent_erstellt", produkt_key(p), parent_id=parent_id, nachgeprueft=True)
+                plan.append(("fortsetzen", z["sku_base"], parent_id))
             else:
-                bild_url = CONDITION_IMAGE_MAP.get(zustand, None)
-            
-            variation_data = {
-                "parent_id": parent_id,
-                "sku": var_sku,
-                "regular_price": str(preis) if preis else "",
-                "status": "publish" if is_publish else "draft",
-                "manage_stock": False,
-                "attributes": [],
-                "image": {"src": bild_url} if bild_url else None
-            }
-            
-            # Attribute für Variation
-            if speicher:
-                variation_data["attributes"].append({"name": "Speicher", "option": speicher})
-            if farbe:
-                variation_data["attributes"].append({"name": "Farbe", "option": farbe})
-            variation_data["attributes"].append({"name": "Zustand", "option": zustand})
-            
-            # Variation erstellen
-            try:
-                r_var = requests.post(f"{WC_URL}/products/{parent_id}/variations", 
-                                     auth=get_auth(), json=variation_data, timeout=30)
-                
-                if r_var.ok:
-                    var_id = r_var.json().get('id')
-                    status_str = "[PUB]" if is_publish else "[DRAFT]"
-                    print(f"       [{total_created+1}] {farbe} {speicher} {zustand} = {preis}€ {status_str} (ID: {var_id})")
-                    total_created += 1
-                else:
-                    error_msg = r_var.text[:100] if r_var.text else "No error message"
-                    print(f"       [{total_created+1}] {farbe} {speicher} {zustand} - FEHLER: {r_var.status_code} - {error_msg}")
-                    total_created += 1
-            except Exception as e:
-                print(f"       [{total_created+1}] {farbe} {speicher} {zustand} - EXCEPTION: {str(e)[:50]}")
-                total_created += 1
-            
-            time.sleep(0.3)  # Rate limiting
-    
-    return {"success": True, "parent_id": parent_id, "name": name, "variationen": total_created}
+                plan.append(("neu", z["sku_base"], None))
+    return plan
+
+
+def _create_products(produkte: list, with_seo: bool = True, concurrency: int = 1, offset: int = 0,
+                     gesamt: int = None, journal=None, media=None) -> list:
+    """
+    Parents per /products/batch, danach die Variationen je Parent per Batch.
+    Die Variations-Batches verschiedener Parents laufen parallel (max. `concurrency`).
+    Mit Journal (woo_journal.py) wird jeder Schritt protokolliert und fortgesetzt,
+    mit MediaCache (woo_media.py) wird jedes Bild nur einmal hochgeladen.
+    """
+    gesamt = gesamt or len(produkte)
+    keys = [produkt_key(p) for p in produkte]
+    plan = _plane_parents(produkte, journal)
+
+    neu = [i for i, (aktion, _, _) in enumerate(plan) if aktion == "neu"]
+    if journal:
+        for i in neu:
+            journal.schreibe("parent_geplant", keys[i], sku_base=plan[i][1], name=produkte[i].get('name'))
+    parents = [build_parent_payload(produkte[i], plan[i][1], with_seo) for i in neu]
+
+    # Alle Variationen des Blocks in einem Rutsch planen + prüfen (woo_plan.py)
+    _, probleme, variationen_plan = plane(produkte, [sku for _, sku, _ in plan])
+    for problem in probleme:
+        print(f"[WARN] Planung: {problem}")
+    if with_seo:
+        variationen_plan = {i: seo_templates.mit_varianten_seo(produkte[i].get('name'), payloads)
+                            for i, payloads in variationen_plan.items()}
+    parent_results = {i: res for i, res in zip(neu, batch_mit_medien(media, "/products", create=parents)["create"])}
+    for i, res in parent_results.items():
+        if res["ok"] and journal:
+            journal.schreibe("parent_erstellt", keys[i], parent_id=res["id"])
+
+    def variationen(i):
+        p, (aktion, sku_base, parent_id) = produkte[i], plan[i]
+        name = p.get('name', 'Unbekannt')
+        log = [f"\n[{offset+i+1}/{gesamt}] Variable Product: {name}", f"       SKU-Basis: {sku_base}"]
+        if aktion == "fertig":
+            log.append(f"       Bereits hochgeladen (Journal): ID {parent_id}")
+            print("\n".join(log))
+            return {"success": True, "parent_id": parent_id, "name": name, "variationen": 0, "fehler": 0,
+                    "uebersprungen": True}
+
+        if aktion == "neu":
+            res = parent_results[i]
+            if not res["ok"]:
+                print("\n".join(log))
+                return {"success": False, "name": name, "error": f"Parent: {res['error']}"}
+            parent_id = res["id"]
+            log.append(f"       Parent erstellt: ID {parent_id}")
+        else:
+            log.append(f"       Setze fort: Parent ID {parent_id} (Journal)")
+
+        log.append(f"       Variationen: {len(p.get('varianten', []))} x {len(ZUSTAENDE)} Zustände")
+        ok, fehler = create_variations(parent_id, variationen_plan.get(i, []), log, journal, keys[i], media)
+        if journal and not fehler:
+            journal.schreibe("produkt_fertig", keys[i], parent_id=parent_id)
+        # Block am Stück ausgeben, damit parallele Produkte nicht durcheinander laufen
+        print("\n".join(log))
+        return {"success": True, "parent_id": parent_id, "name": name, "variationen": ok, "fehler": fehler}
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        return list(ex.map(variationen, range(len(produkte))))
+
+
+def repariere(produkte: list, journal, modus: str, concurrency: int = 1, media=None) -> list:
+    """
+    Halbfertige Parents aus dem Journal abschließen oder zurückrollen.
+    abschliessen: fehlende Variationen nachlegen (Produkt muss in der Eingabe stehen)
+    zurueckrollen: Parent samt Variationen löschen (force)
+    """
+    halb = journal.halbfertig()
+    print(f"[REPAIR] {len(halb)} halbfertige Produkte im Journal")
+    if not halb:
+        return []
+
+    if modus == "abschliessen":
+        nach_key = {produkt_key(p): p for p in produkte}
+        fehlend = [z["name"] or k for k, z in halb.items() if k not in nach_key]
+        for name in fehlend:
+            print(f"[REPAIR] Nicht in der Eingabe, kann nicht abgeschlossen werden: {name}")
+        return _create_products([nach_key[k] for k in halb if k in nach_key], concurrency=concurrency,
+                                journal=journal, media=media)
+
+    results = []
+    for key, z in halb.items():
+        name = z["name"] or key
+        parent_id = z["parent_id"] or _finde_parent_per_sku(z["sku_base"])
+        if parent_id:
+            r = wc_request("DELETE", f"/products/{parent_id}", params={"force": "true"})
+            if not r.ok and r.status_code != 404:
+                print(f"[REPAIR] {name}: Löschen fehlgeschlagen ({r.status_code}) {r.text[:100]}")
+                results.append({"success": False, "name": name, "error": f"Rollback: HTTP {r.status_code}"})
+                continue
+        journal.schreibe("zurueckgerollt", key, parent_id=parent_id)
+        print(f"[REPAIR] {name}: zurückgerollt (Parent {parent_id or 'nie angelegt'})")
+        results.append({"success": True, "name": name, "parent_id": parent_id, "variationen": 0, "fehler": 0})
+    return results
+
+
+def create_variable_product(product_data: dict, with_seo: bool = True) -> dict:
+    """
+    Erstellt ein Variable Product mit Attributen und allen Variationen.
+    """
+    return _create_products([product_data], with_seo)[0]
 
 
 # ============================================================
 # MAIN
 # ============================================================
 
-def upload_variable_products(json_file: str, dry_run: bool = True) -> list:
-    """Liest JSON und erstellt Variable Products"""
+def upload_variable_products(json_file: str, dry_run: bool = True, concurrency: int = MAX_CONCURRENCY,
+                             sync: bool = False, prune: bool = False, offline: bool = False,
+                             neu: bool = False, repair: str = None) -> list:
+    """
+    Liest JSON und erstellt Variable Products (max. `concurrency` Requests parallel).
+    sync=True: bestehende Produkte abgleichen statt neu anlegen (siehe woo_sync.py),
+    Shop-Zustand aus dem lokalen Spiegel - offline=True ohne vorherigen Pull
+    dry_run=True: nur den Operationsplan zeigen (woo_dryrun.py) - Requests, Sideloads, Dauer
+
+    Normaler Upload läuft über ein Journal pro Eingabe-Datei: ein abgebrochener
+    Lauf wird mit demselben Befehl fortgesetzt. neu=True verwirft das Journal,
+    repair="abschliessen" | "zurueckrollen" kümmert sich um halbfertige Parents.
+    """
     
     print(f"[INFO] Lese: {json_file}")
     
@@ -340,30 +350,73 @@ def upload_variable_products(json_file: str, dry_run: bool = True) -> list:
     produkte = data.get('produkte', [])
     print(f"[INFO] {len(produkte)} Produkte gefunden\n")
     
+    from woo_dryrun import BildStand, plan_upload, zeige_plan, plan_datei
+    if sync:
+        from woo_sync import sync_products
+        from woo_mirror import ShopMirror
+        set_concurrency(concurrency)
+        mirror = ShopMirror()
+        media = MediaCache()
+        try:
+            return sync_products(produkte, dry_run=dry_run, prune=prune, concurrency=concurrency,
+                                 mirror=mirror, offline=offline, media=media,
+                                 dryrun_datei=plan_datei(json_file) if dry_run else None)
+        finally:
+            if not dry_run:
+                print(f"[MEDIA] {media.bericht()}")
+            media.close()
+            mirror.close()
+    
     if dry_run:
-        print("[DRY RUN] Zeige nur was erstellt werden würde:\n")
-        for p in produkte:
-            name = p.get('name', 'N/A')
-            varianten = p.get('varianten', [])
-            print(f"  {name}")
-            print(f"    - {len(varianten)} Variationen geplant")
-            if varianten:
-                farben = set(v.get('farbe', '') for v in varianten)
-                speicher = set(v.get('speicher', '') for v in varianten)
-                print(f"    - Farben: {sorted(farben)}")
-                print(f"    - Speicher: {sorted(speicher)}")
+        # Operationsplan statt Upload - Journal und Bild-Cache werden nur gelesen;
+        # online werden Shop-Bilder zusätzlich per Mediathek-Suche (nur GET) nachgeschlagen
+        pfad = journal_pfad(json_file)
+        journal = UploadJournal(pfad) if os.path.exists(pfad) and not neu else None
+        media = MediaCache()
+        try:
+            zeige_plan(plan_upload(produkte, journal, BildStand(media, offline)), concurrency, plan_datei(json_file))
+        finally:
+            media.close()
+            if journal:
+                journal.close()
         return []
     
-    # Upload
+    # Upload: Parents gesammelt per /products/batch, Variationen per Parent-Batch
+    set_concurrency(concurrency)
+    print(f"[INFO] Parallel: max. {concurrency} Requests")
+
+    journal = UploadJournal(journal_pfad(json_file))
+    if neu:
+        archiv = journal.archivieren()
+        if archiv:
+            print(f"[JOURNAL] Altes Journal archiviert: {archiv}")
+        journal = UploadJournal(journal_pfad(json_file))
+    halb = journal.halbfertig()
+    print(f"[JOURNAL] {journal.pfad}" + (f" - {len(halb)} halbfertige Produkte werden fortgesetzt" if halb else ""))
+
+    media = MediaCache()
     results = []
-    for i, p in enumerate(produkte):
-        print(f"\n[{i+1}/{len(produkte)}] ", end="")
-        result = create_variable_product(p)
-        results.append(result)
-        if result.get('success'):
-            print(f"  -> OK! Parent ID: {result.get('parent_id')}")
-        else:
-            print(f"  -> FEHLER: {result.get('error')}")
+    try:
+        if repair:
+            return repariere(produkte, journal, repair, concurrency, media)
+        for start in range(0, len(produkte), BATCH_SIZE):
+            for result in _create_products(produkte[start:start + BATCH_SIZE], concurrency=concurrency,
+                                           offset=start, gesamt=len(produkte), journal=journal, media=media):
+                results.append(result)
+                if result.get('uebersprungen'):
+                    continue
+                if result.get('success'):
+                    print(f"  -> OK! Parent ID: {result.get('parent_id')} "
+                          f"({result['variationen']} Variationen, {result['fehler']} Fehler)")
+                else:
+                    print(f"  -> FEHLER: {result.get('error')}")
+    except KeyboardInterrupt:
+        print("\n[ABBRUCH] Fortsetzen mit demselben Befehl - das Journal kennt den letzten Stand")
+        raise
+    finally:
+        print(f"[MEDIA] {media.bericht()}")
+        media.close()
+        journal.close()
     
     return results
 
@@ -372,8 +425,24 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(description='WooCommerce Variable Products Upload')
     parser.add_argument('--input', '-i', default=None)
-    parser.add_argument('--dry-run', '-n', action='store_true')
-    parser.add_argument('--hersteller', default='apple')
+    parser.add_argument('--dry-run', '-n', action='store_true',
+                        help='Nichts senden: geplante API-Operationen, Sideloads und geschätzte Dauer anzeigen')
+    parser.add_argument('--hersteller', default='apple',
+                        help='Marke für die Preisregeln, wenn sie nicht aus dem Produkt hervorgeht')
+    parser.add_argument('--regeln', default=None,
+                        help='Preisregeln (Default: preisregeln.json) - Vorschau: python preisregeln.py preview')
+    parser.add_argument('--concurrency', '-c', type=int, default=MAX_CONCURRENCY,
+                        help=f'Max. gleichzeitige Requests an den Shop (Default: {MAX_CONCURRENCY})')
+    parser.add_argument('--sync', action='store_true',
+                        help='Bestehende Produkte abgleichen (nur Änderungen senden) statt neu anlegen')
+    parser.add_argument('--prune', action='store_true',
+                        help='Mit --sync: Variationen löschen, die nicht mehr in der Eingabe sind')
+    parser.add_argument('--offline', action='store_true',
+                        help='Mit --sync: Shop-Zustand nur aus dem lokalen Spiegel (kein Pull)')
+    parser.add_argument('--neu', action='store_true',
+                        help='Journal verwerfen und alles neu anlegen (statt abgebrochenen Lauf fortzusetzen)')
+    parser.add_argument('--repair', choices=['abschliessen', 'zurueckrollen'],
+                        help='Halbfertige Parents aus dem Journal abschließen oder löschen')
     args = parser.parse_args()
     
     if args.input:
@@ -384,8 +453,18 @@ def main():
     if not os.path.exists(input_file):
         print(f"[ERROR] Nicht gefunden: {input_file}")
         return 1
-    
-    results = upload_variable_products(input_file, dry_run=args.dry_run)
+
+    woo_plan.STANDARD_HERSTELLER = args.hersteller
+    if args.regeln:
+        try:
+            preisregeln.set_regeln_datei(args.regeln)
+        except (ValueError, OSError, json.JSONDecodeError) as e:
+            print(f"[ERROR] Preisregeln: {e}")
+            return 1
+    
+    results = upload_variable_products(input_file, dry_run=args.dry_run, concurrency=args.concurrency,
+                                       sync=args.sync, prune=args.prune, offline=args.offline,
+                                       neu=args.neu, repair=args.repair)
     
     if results:
         ok = sum(1 for r in results if r.get('success'))
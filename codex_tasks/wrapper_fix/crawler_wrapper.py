@@ -1,17 +1,40 @@
 """
-Auto-Restart Wrapper für Crawler
-Startet den Crawler bei Crash automatisch neu
+Crawler-Supervisor (ersetzt den alten Auto-Restart Wrapper)
+
+- Startet den Crawler als Subprozess und übergibt CRAWLER_HEARTBEAT_FILE
+- Der Crawler schreibt pro SKU einen Heartbeat; kommt N Sekunden keiner,
+  gilt er als hängend (z.B. Chrome eingefroren) -> Prozessbaum killen + Neustart
+- Exit-Code 0 = sauber fertig, alles andere = Crash -> Neustart
+- Neustarts mit exponentiellem Backoff (kein Restart-Loop im Sekundentakt)
+- Jeder Neustart wird mit Ursache im Run-Report (JSON) festgehalten
+
+Nutzung:
+    python crawler_wrapper.py                         # crawler_cli.py handy
+    python crawler_wrapper.py -- handy tablet --browsers 2
+    python crawler_wrapper.py --stall 300 --max-restarts 50 -- tablet
 """
 
-import subprocess
-import time
+import argparse
+import json
 import os
+import subprocess
 import sys
+import time
+from datetime import datetime
+
+CRAWLER_DIR = "F:/crawlerv5"
+CRAWLER_SCRIPT = os.path.join(CRAWLER_DIR, "crawler_cli.py")
+CHECKPOINT_FILE = os.path.join(CRAWLER_DIR, "crawler_checkpoint.txt")
+HEARTBEAT_FILE = os.path.join(CRAWLER_DIR, "crawler_heartbeat.json")
+REPORT_FILE = os.path.join(CRAWLER_DIR, "crawler_restarts.json")
+
+MAX_RESTARTS = 100        # Max Neustarts
+STALL_SECONDS = 300       # So lange ohne Heartbeat = hängt
+POLL_SECONDS = 5          # Wie oft Prozess + Heartbeat geprüft werden
+BACKOFF_BASE = 5          # Erste Wartezeit vor Neustart
+BACKOFF_MAX = 300         # Maximale Wartezeit vor Neustart
+HEALTHY_RUN_SECONDS = 600 # Lief der Crawler so lange, wird der Backoff zurückgesetzt
 
-CRAWLER_SCRIPT = "F:/crawlerv5/crawler_handy.py"
-CHECKPOINT_FILE = "F:/crawlerv5/crawler_checkpoint.txt"
-MAX_RESTARTS = 100  # Max Neustarts
-WAIT_SECONDS = 5   # Wartezeit zwischen Neustarts
 
 def get_checkpoint():
     if os.path.exists(CHECKPOINT_FILE):
@@ -22,44 +45,162 @@ def get_checkpoint():
             return 0
     return 0
 
-def main():
-    restarts = 0
-    
-    print("🔄 Auto-Restart Wrapper gestartet")
-    print(f"   Script: {CRAWLER_SCRIPT}")
+
+def read_heartbeat():
+    """(Zeitstempel, Inhalt) des letzten Heartbeats oder (None, {})"""
+    try:
+        with open(HEARTBEAT_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return float(data.get("ts") or os.path.getmtime(HEARTBEAT_FILE)), data
+    except Exception:
+        return None, {}
+
+
+def kill_tree(proc):
+    """Crawler + Chrome/Chromedriver-Kinder beenden"""
+    if proc.poll() is not None:
+        return
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        try:
+            os.killpg(proc.pid, 9)
+        except Exception:
+            proc.kill()
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+def describe_exit(rc):
+    if rc == 0:
+        return "sauber beendet"
+    if rc < 0:
+        return f"Crash durch Signal {-rc}"
+    return f"Crash (rc={rc})"
+
+
+def run_once(cmd, stall_seconds):
+    """
+    Einen Crawler-Durchlauf überwachen.
+    Returns: dict mit cause ("clean" | "crash" | "stall"), rc, laufzeit, letzter Heartbeat
+    """
+    try:
+        os.remove(HEARTBEAT_FILE)
+    except OSError:
+        pass
+
+    env = os.environ.copy()
+    env["CRAWLER_HEARTBEAT_FILE"] = HEARTBEAT_FILE
+    env["PYTHONUNBUFFERED"] = "1"
+    popen_kwargs = {}
+    if os.name != "nt":
+        popen_kwargs["start_new_session"] = True  # eigene Prozessgruppe für kill_tree
+
+    started = time.time()
+    proc = subprocess.Popen(cmd, cwd=os.path.dirname(cmd[1]) or None, env=env, **popen_kwargs)
+
+    while True:
+        try:
+            rc = proc.wait(timeout=POLL_SECONDS)
+            break
+        except subprocess.TimeoutExpired:
+            pass
+
+        hb_ts, hb = read_heartbeat()
+        last_progress = max(hb_ts or 0, started)
+        idle = time.time() - last_progress
+        if idle > stall_seconds:
+            print(f"⏱️ Kein Heartbeat seit {int(idle)}s (letzte SKU: {hb.get('sku', '?')}) - kille Crawler...")
+            kill_tree(proc)
+            return {"cause": "stall", "rc": proc.returncode, "laufzeit_s": round(time.time() - started),
+                    "idle_s": round(idle), "heartbeat": hb}
+
+    _, hb = read_heartbeat()
+    return {"cause": "clean" if rc == 0 else "crash", "rc": rc, "laufzeit_s": round(time.time() - started),
+            "exit": describe_exit(rc), "heartbeat": hb}
+
+
+def save_report(report):
+    try:
+        tmp = REPORT_FILE + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp, REPORT_FILE)
+    except Exception as e:
+        print(f"⚠️ Report nicht gespeichert: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawler-Supervisor mit Heartbeat + Stall-Erkennung")
+    parser.add_argument("--script", default=CRAWLER_SCRIPT)
+    parser.add_argument("--stall", type=int, default=STALL_SECONDS, help="Sekunden ohne Heartbeat bis Neustart")
+    parser.add_argument("--max-restarts", type=int, default=MAX_RESTARTS)
+    parser.add_argument("crawler_args", nargs="*", help="Argumente für den Crawler (nach --)")
+    args = parser.parse_args(argv)
+
+    cmd = [sys.executable, args.script] + args.crawler_args
+    report = {"start": datetime.now().isoformat(timespec="seconds"), "cmd": cmd, "runs": [], "ergebnis": None}
+
+    print("🔄 Crawler-Supervisor gestartet")
+    print(f"   Script: {args.script} {' '.join(args.crawler_args)}")
     print(f"   Checkpoint: {CHECKPOINT_FILE}")
+    print(f"   Heartbeat: {HEARTBEAT_FILE} (Stall nach {args.stall}s)")
     print("-" * 40)
-    
-    while restarts < MAX_RESTARTS:
+
+    restarts = 0
+    failures_in_row = 0
+    while True:
         checkpoint = get_checkpoint()
-        print(f"\n[{restarts+1}] Starter Crawler... (Checkpoint: {checkpoint})")
-        
+        print(f"\n[{restarts+1}] Starte Crawler... (Checkpoint: {checkpoint})")
+
         try:
-            # Crawler starten
-            result = subprocess.run(
-                [sys.executable, CRAWLER_SCRIPT],
-                cwd=os.path.dirname(CRAWLER_SCRIPT),
-                timeout=3600  # 1 Stunde max pro Durchgang
-            )
-            
-            # Erfolgreich beendet (Exit Code 0)
-            print("✅ Crawler erfolgreich beendet!")
-            break
-            
-        except subprocess.TimeoutExpired:
-            print("⏱️ Timeout - Crawler läuft zu lange, restarte...")
-            restarts += 1
-            time.sleep(WAIT_SECONDS)
-            
+            run = run_once(cmd, args.stall)
         except Exception as e:
-            print(f"❌ Fehler: {e}")
-            restarts += 1
-            time.sleep(WAIT_SECONDS)
-    
-    if restarts >= MAX_RESTARTS:
-        print(f"⚠️ Max Neustarts ({MAX_RESTARTS}) erreicht - beende")
-    else:
-        print("🏁 Fertig!")
+            run = {"cause": "start_failed", "rc": None, "laufzeit_s": 0, "exit": str(e)}
+
+        run["ts"] = datetime.now().isoformat(timespec="seconds")
+        run["checkpoint_vorher"] = checkpoint
+        run["checkpoint_nachher"] = get_checkpoint()
+        report["runs"].append(run)
+
+        if run["cause"] == "clean":
+            print("✅ Crawler sauber beendet (Exit-Code 0)")
+            report["ergebnis"] = "fertig"
+            break
+
+        print(f"❌ {run.get('exit') or run['cause']} nach {run['laufzeit_s']}s")
+        restarts += 1
+        if restarts > args.max_restarts:
+            print(f"⚠️ Max Neustarts ({args.max_restarts}) erreicht - beende")
+            report["ergebnis"] = "max_restarts"
+            break
+
+        # Backoff: zurücksetzen wenn der Lauf gesund war oder Fortschritt gemacht hat
+        progressed = run["checkpoint_nachher"] > checkpoint
+        if progressed or run["laufzeit_s"] >= HEALTHY_RUN_SECONDS:
+            failures_in_row = 0
+        failures_in_row += 1
+        wait = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures_in_row - 1))
+        run["backoff_s"] = wait
+        save_report(report)
+        print(f"   Neustart in {wait}s ({failures_in_row}. Fehler in Folge)")
+        time.sleep(wait)
+
+    report["ende"] = datetime.now().isoformat(timespec="seconds")
+    report["neustarts"] = restarts
+    report["ursachen"] = {}
+    for run in report["runs"]:
+        if run["cause"] != "clean":
+            report["ursachen"][run["cause"]] = report["ursachen"].get(run["cause"], 0) + 1
+    save_report(report)
+
+    print(f"🏁 Fertig! Neustarts: {restarts} {report['ursachen'] or ''}")
+    print(f"   Report: {REPORT_FILE}")
+    return 0 if report["ergebnis"] == "fertig" else 1
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""bridge_events.py
+
+GitHub-Webhooks statt Warten auf den nächsten Poll.
+
+Ein kleiner lokaler HTTP-Listener nimmt `pull_request`-, `push`- und
+`issue_comment`-Payloads entgegen (GitHub -> Tunnel, z.B. cloudflared/ngrok ->
+http://127.0.0.1:<port>/) und weckt den wartenden Workflow sofort. Ohne Tunnel
+lassen sich Events aus einer Datei einspielen (Tests/Offline):
+
+    {"event": "push", "payload": {"ref": "refs/heads/{branch}", ...}}   (eine Zeile pro Event)
+
+{branch} und {issue} werden beim Einspielen durch Branch und Issue-Nummer des
+gerade gesendeten Tasks ersetzt (die stehen beim Aufzeichnen noch nicht fest).
+
+Polling bleibt als Fallback: AdaptiveInterval startet kurz und wird länger,
+solange sich nichts tut (mit ETags kosten diese Polls kein Rate-Limit).
+"""
+
+import hmac
+import json
+import time
+import queue
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+def event_info(event: str, payload: dict):
+    """Das Relevante aus einem Webhook: {'event', 'action', 'branch', 'number'} oder None"""
+    if event == "push":
+        ref = payload.get("ref") or ""
+        branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else None
+        return {"event": event, "action": None, "branch": branch, "number": None}
+    if event == "pull_request":
+        pr = payload.get("pull_request") or {}
+        return {"event": event, "action": payload.get("action"),
+                "branch": (pr.get("head") or {}).get("ref"), "number": pr.get("number")}
+    if event == "issue_comment":
+        issue = payload.get("issue") or {}
+        return {"event": event, "action": payload.get("action"), "branch": None, "number": issue.get("number")}
+    return None
+
+
+class EventHub:
+    """Sammelt eingehende Events; wait() blockiert bis ein passendes kommt"""
+
+    def __init__(self):
+        self._q = queue.Queue()
+        self.received = 0
+
+    def put(self, event: str, payload: dict) -> bool:
+        info = event_info(event, payload or {})
+        if info:
+            self.received += 1
+            self._q.put(info)
+        return info is not None
+
+    def wait(self, match, timeout: float):
+        """Erstes Event mit match(info) == True oder None nach timeout Sekunden"""
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            try:
+                info = self._q.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if match(info):
+                return info
+
+
+def signature_ok(secret: str, body: bytes, header: str) -> bool:
+    expected = "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, header or "")
+
+
+def listen(hub: EventHub, port: int, host: str = "127.0.0.1", secret: str = ""):
+    """Webhook-Listener im Hintergrund-Thread starten; gibt den Server zurück (shutdown() beendet)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status: int):
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if secret and not signature_ok(secret, body, self.headers.get("X-Hub-Signature-256")):
+                return self._reply(401)
+            event = self.headers.get("X-GitHub-Event", "")
+            if event == "ping":
+                return self._reply(204)
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return self._reply(400)
+            hub.put(event, payload)
+            self._reply(204)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def replay(hub: EventHub, path: str, values: dict = None) -> int:
+    """
+    Events aus einer Datei einspielen (JSON-Lines oder JSON-Liste); Anzahl übernommener Events.
+    values: Platzhalter -> Wert, z.B. {"branch": "codex-1740012345", "issue": 12}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    for key, value in (values or {}).items():
+        # Zahlen/None als JSON-Wert ("number": {issue}), Strings stehen schon in Anführungszeichen
+        text = text.replace("{" + key + "}", value if isinstance(value, str) else json.dumps(value))
+    items = json.loads(text) if text.startswith("[") else [json.loads(l) for l in text.splitlines() if l.strip()]
+    return sum(1 for item in items if hub.put(item.get("event", ""), item.get("payload") or {}))
+
+
+class AdaptiveInterval:
+    """Poll-Intervall: startet bei minimum, wächst pro ruhigem Durchlauf um factor bis maximum"""
+
+    def __init__(self, minimum: float, maximum: float, factor: float = 1.5):
+        self.minimum, self.maximum, self.factor = minimum, maximum, factor
+        self.current = minimum
+
+    def next(self) -> float:
+        value = self.current
+        self.current = min(self.maximum, self.current * self.factor)
+        return value
+
+    def reset(self):
+        self.current = self.minimum
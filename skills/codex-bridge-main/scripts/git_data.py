@@ -0,0 +1,125 @@
+"""git_data.py
+
+Mehrere Dateien als EIN Commit über die Git Data API pushen.
+
+Die Contents API braucht pro Datei ein GET (sha) + PUT und erzeugt pro Datei
+einen eigenen Commit. Hier stattdessen:
+
+    Blobs    POST  /git/blobs                  parallel (max_workers)
+    Tree     POST  /git/trees                  base_tree = Tree vom Branch-Kopf
+    Commit   POST  /git/commits                parent = Branch-Kopf
+    Ref      PATCH /git/refs/heads/<branch>    bzw. POST /git/refs, wenn der Branch neu ist
+
+N Dateien kosten ~N/max_workers + 5 Requests und landen atomar in einem Commit.
+Hat jemand zwischendurch in den Branch gepusht, wird der Commit auf den neuen
+Kopf gesetzt (Blobs werden wiederverwendet) - kein Force-Push.
+
+api: Funktion (method, path, body=None) -> (status, data), z.B.
+     lambda m, p, body=None: gh_api(m, p, token, body)
+"""
+
+import os
+import base64
+from pathlib import Path
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 8
+MAX_REF_RETRIES = 3
+
+
+def _check(st, data, what):
+    if st not in (200, 201):
+        msg = data.get("message") if isinstance(data, dict) else data
+        raise RuntimeError(f"{what} failed: {st} {msg}")
+    return data
+
+
+def _head(api, repo: str, branch: str):
+    """Commit-SHA des Branch-Kopfs oder None, wenn es den Branch nicht gibt"""
+    st, data = api("GET", f"/repos/{repo}/git/ref/heads/{quote(branch)}")
+    if st == 404:
+        return None
+    return _check(st, data, f"get ref {branch}")["object"]["sha"]
+
+
+def _create_blob(api, repo: str, content: bytes) -> str:
+    st, data = api("POST", f"/repos/{repo}/git/blobs", body={
+        "content": base64.b64encode(content).decode("ascii"),
+        "encoding": "base64",
+    })
+    return _check(st, data, "create blob")["sha"]
+
+
+def _commit(api, repo: str, head: str, entries: list, message: str) -> str:
+    st, data = api("GET", f"/repos/{repo}/git/commits/{head}")
+    base_tree = _check(st, data, "get commit")["tree"]["sha"]
+    st, data = api("POST", f"/repos/{repo}/git/trees", body={"base_tree": base_tree, "tree": entries})
+    tree = _check(st, data, "create tree")["sha"]
+    st, data = api("POST", f"/repos/{repo}/git/commits", body={"message": message, "tree": tree, "parents": [head]})
+    return _check(st, data, "create commit")["sha"]
+
+
+def push_tree(api, repo: str, branch: str, files: dict, message: str, base: str = "main",
+              max_workers: int = MAX_WORKERS) -> dict:
+    """
+    files: {pfad_im_repo: bytes | (bytes, mode) | None}  - None löscht die Datei
+    Fehlt `branch`, wird er mit dem Commit auf Basis von `base` angelegt.
+    Returns: {"commit", "branch", "files", "created"}
+    """
+    files = {p.replace("\\", "/").lstrip("/"): v for p, v in files.items()}
+    if not files:
+        return {"commit": None, "branch": branch, "files": [], "created": False}
+
+    head = _head(api, repo, branch)
+    created = head is None
+    if created:
+        head = _head(api, repo, base)
+        if head is None:
+            raise RuntimeError(f"base branch not found: {base}")
+
+    uploads = []
+    for path, value in files.items():
+        if value is not None:
+            content, mode = value if isinstance(value, tuple) else (value, "100644")
+            uploads.append((path, content, mode))
+    workers = max(1, min(max_workers, len(uploads) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        shas = list(ex.map(lambda u: _create_blob(api, repo, u[1]), uploads))
+
+    entries = [{"path": path, "mode": mode, "type": "blob", "sha": sha}
+               for (path, _, mode), sha in zip(uploads, shas)]
+    entries += [{"path": path, "mode": "100644", "type": "blob", "sha": None}
+                for path, value in files.items() if value is None]
+
+    for attempt in range(MAX_REF_RETRIES):
+        commit = _commit(api, repo, head, entries, message)
+        if created:
+            st, data = api("POST", f"/repos/{repo}/git/refs", body={"ref": f"refs/heads/{branch}", "sha": commit})
+            if st in (200, 201):
+                break
+            if "already exists" not in str(data.get("message", "")).lower():
+                _check(st, data, f"create ref {branch}")
+            created = False  # parallel angelegt -> als Update auf dessen Kopf wiederholen
+        else:
+            st, data = api("PATCH", f"/repos/{repo}/git/refs/heads/{quote(branch)}", body={"sha": commit, "force": False})
+            if st in (200, 201):
+                break
+            if st != 422 or attempt == MAX_REF_RETRIES - 1:
+                _check(st, data, f"update ref {branch}")
+        head = _head(api, repo, branch)  # Branch hat sich bewegt -> auf den neuen Kopf setzen
+    return {"commit": commit, "branch": branch, "files": sorted(files), "created": created}
+
+
+def read_files(root, paths) -> dict:
+    """{pfad: (bytes, mode)} für push_tree; fehlende Dateien -> None (löschen)"""
+    root = Path(root)
+    files = {}
+    for rel in paths:
+        p = root / rel
+        if p.is_file():
+            mode = "100755" if os.access(p, os.X_OK) and os.name != "nt" else "100644"
+            files[Path(rel).as_posix()] = (p.read_bytes(), mode)
+        elif not p.exists():
+            files[Path(rel).as_posix()] = None
+    return files
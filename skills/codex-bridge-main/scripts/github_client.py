@@ -0,0 +1,220 @@
+"""github_client.py
+
+Gemeinsamer GitHub-REST-Client für alle Bridge-Skripte (bridge_main.py,
+codex_bridge_v2.py, ...).
+
+- Eine requests.Session pro Token mit Keep-Alive-Pool: TLS-Handshake einmal,
+  danach laufen alle Calls (auch parallele Blob-Uploads) über offene Verbindungen.
+- Retry mit Backoff + Jitter bei 5xx/Verbindungsfehlern (nur idempotente Methoden),
+  bei Rate-Limits (429 / 403 mit Retry-After bzw. X-RateLimit-Remaining: 0) für alle
+  Methoden - der Request wurde dann nachweislich nicht ausgeführt.
+- Ist X-RateLimit-Remaining aufgebraucht, wartet der nächste Request bis zum Reset.
+- Bedingte GETs: ETag wird gemerkt und als If-None-Match mitgeschickt; 304 liefert
+  die gemerkten Daten. 304-Antworten zählen nicht gegen das Rate-Limit, Polling
+  ohne Änderung ist damit gratis.
+
+Rückgabe wie das alte gh_api: (status, data); status 0 = Netzwerkfehler.
+
+    from github_client import client
+    st, data = client(token).request("GET", f"/repos/{repo}/pulls")
+"""
+
+import os
+import time
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = (os.environ.get("GITHUB_API_URL") or "https://api.github.com").rstrip("/")
+USER_AGENT = "openclaw-codex-bridge"
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0          # Sekunden; Wartezeit = uniform(0, BACKOFF_BASE * 2^versuch)
+BACKOFF_MAX = 30.0
+RATE_LIMIT_MAX_WAIT = 900   # länger wird nicht auf einen Rate-Limit-Reset gewartet
+POOL_SIZE = 16
+TIMEOUT = 30
+
+IDEMPOTENT = {"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}
+RETRY_STATUS = {500, 502, 503, 504}
+
+
+class MemoryEtags:
+    """ETag-Cache im Speicher: url -> (etag, data). Eigene Stores brauchen get/set."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            return self._data.get(url)
+
+    def set(self, url, etag, data):
+        with self._lock:
+            self._data[url] = (etag, data)
+
+
+def _parse(resp):
+    if not resp.content:
+        return {}
+    try:
+        return resp.json()
+    except ValueError:
+        return {"message": resp.text[:500]}
+
+
+class GitHubClient:
+    def __init__(self, token: str, base_url: str = API_URL, etags=None, max_retries: int = MAX_RETRIES,
+                 pool_size: int = POOL_SIZE, timeout: int = TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.etags = etags if etags is not None else MemoryEtags()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "User-Agent": USER_AGENT,
+        })
+        if token:
+            self.session.headers["Authorization"] = f"token {token}"
+        self._rate_lock = threading.Lock()
+        self.rate_remaining = None
+        self.rate_reset = 0
+        self.stats = {"requests": 0, "not_modified": 0, "retries": 0}
+        self.last_error = ""
+
+    # ---------- Rate-Limit ----------
+
+    def _note_rate(self, resp):
+        rem = resp.headers.get("X-RateLimit-Remaining")
+        with self._rate_lock:
+            if rem is not None and rem.isdigit():
+                self.rate_remaining = int(rem)
+            reset = resp.headers.get("X-RateLimit-Reset")
+            if reset and reset.isdigit():
+                self.rate_reset = int(reset)
+
+    def _wait_for_quota(self):
+        with self._rate_lock:
+            if self.rate_remaining != 0:
+                return
+            wait = self.rate_reset - time.time() + 1
+        if wait > 0:
+            time.sleep(min(wait, RATE_LIMIT_MAX_WAIT))
+        with self._rate_lock:
+            self.rate_remaining = None
+
+    def _rate_limit_wait(self, resp):
+        """Wartezeit bei Rate-Limit-Antwort, sonst None"""
+        if resp.status_code not in (403, 429):
+            return None
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), RATE_LIMIT_MAX_WAIT)
+        if resp.headers.get("X-RateLimit-Remaining") == "0":
+            reset = resp.headers.get("X-RateLimit-Reset", "")
+            return min(max(int(reset) - time.time() + 1, 1) if reset.isdigit() else 60, RATE_LIMIT_MAX_WAIT)
+        return None
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    # ---------- Requests ----------
+
+    def url(self, path: str) -> str:
+        return path if path.startswith("http") else self.base_url + path
+
+    def send(self, method: str, path: str, body=None, headers=None, stream: bool = False, idempotent=None):
+        """Roh-Response mit Retry/Rate-Limit (ohne ETag-Cache); None nach Netzwerkfehlern"""
+        method = method.upper()
+        url = self.url(path)
+        safe = method in IDEMPOTENT if idempotent is None else idempotent
+        last_exc = None
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_quota()
+            try:
+                resp = self.session.request(method, url, json=body, headers=headers,
+                                            timeout=self.timeout, stream=stream)
+            except requests.ConnectionError as e:
+                # Verbindung kam nicht zustande -> auch POST ist sicher wiederholbar;
+                # abgebrochene Verbindung -> Request evtl. schon ausgeführt
+                last_exc = e
+                retry = safe or "Connection aborted" not in str(e)
+            except requests.RequestException as e:
+                last_exc = e
+                retry = safe
+            else:
+                self.stats["requests"] += 1
+                self._note_rate(resp)
+                wait = self._rate_limit_wait(resp)
+                if wait is None and (resp.status_code == 429 or
+                                     (resp.status_code in RETRY_STATUS and safe)):
+                    wait = self._backoff(attempt)
+                if wait is None or attempt == self.max_retries:
+                    return resp
+                resp.close()
+                self.stats["retries"] += 1
+                time.sleep(wait)
+                continue
+            if not retry or attempt == self.max_retries:
+                break
+            self.stats["retries"] += 1
+            time.sleep(self._backoff(attempt))
+        self.last_error = str(last_exc)
+        return None
+
+    def request(self, method: str, path: str, body=None, headers=None, conditional: bool = True):
+        """(status, data); GETs laufen über den ETag-Cache (304 -> gemerkte Daten, status 200)"""
+        method = method.upper()
+        headers = dict(headers or {})
+        cached = None
+        if method == "GET" and conditional:
+            cached = self.etags.get(self.url(path))
+            if cached:
+                headers["If-None-Match"] = cached[0]
+        resp = self.send(method, path, body, headers)
+        if resp is None:
+            return 0, {"message": self.last_error}
+        if resp.status_code == 304 and cached:
+            self.stats["not_modified"] += 1
+            return 200, cached[1]
+        data = _parse(resp)
+        if method == "GET" and conditional and resp.status_code == 200 and resp.headers.get("ETag"):
+            self.etags.set(self.url(path), resp.headers["ETag"], data)
+        return resp.status_code, data
+
+    def graphql(self, query: str, variables: dict = None):
+        """(data, errors) einer GraphQL-Abfrage; Abfragen sind lesend -> wie GET wiederholbar"""
+        url = self.base_url[:-3] + "graphql" if self.base_url.endswith("/v3") else self.base_url + "/graphql"
+        resp = self.send("POST", url, {"query": query, "variables": variables or {}}, idempotent=True)
+        if resp is None:
+            return None, [{"message": self.last_error}]
+        payload = _parse(resp)
+        if resp.status_code != 200:
+            return None, [{"message": f"{resp.status_code} {payload.get('message', '')}"}]
+        return payload.get("data"), payload.get("errors") or []
+
+
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def client(token: str, **kwargs) -> GitHubClient:
+    """Geteilter Client pro Token (eine Session/ein Verbindungspool pro Prozess)"""
+    with _CLIENTS_LOCK:
+        c = _CLIENTS.get(token)
+        if c is None:
+            c = _CLIENTS[token] = GitHubClient(token, **kwargs)
+        return c
+
+
+def gh_api(method, path, token, body=None):
+    """Drop-in für das alte gh_api(method, path, token, body) -> (status, data)"""
+    return client(token).request(method, path, body)
@@ -0,0 +1,85 @@
+"""github_graphql.py
+
+Offene PRs für status/sync per GraphQL statt 1 + N REST-Calls
+(PR-Liste, dann pro PR commits, comments, ...).
+
+Eine Abfrage pro 50 PRs liefert alles auf einmal: Labels, Anzahl Commits,
+Check-Status des letzten Commits, Mergeability, geänderte Dateien und die
+letzten Kommentare. Ergebnis im Format der REST-PR-Liste (number, title, head.ref, labels, ...)
+plus commit_count, checks_state, files und comments - bestehender Code (is_codex_pr,
+Patch-Suche) funktioniert unverändert damit.
+"""
+
+PAGE_SIZE = 50
+COMMENTS = 20   # so viele letzte Kommentare pro PR (Patch-Suche)
+FILES = 100     # geänderte Dateien pro PR (Merge-Queue: was invalidiert ein Merge?)
+
+OPEN_PRS_QUERY = """
+query($owner: String!, $name: String!, $base: String!, $cursor: String, $comments: Int!, $files: Int!, $page: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: OPEN, baseRefName: $base, first: $page, after: $cursor,
+                 orderBy: {field: CREATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title body url isDraft createdAt updatedAt
+        headRefName headRefOid
+        mergeable mergeStateStatus
+        labels(first: 20) { nodes { name } }
+        commits { totalCount }
+        lastCommit: commits(last: 1) { nodes { commit { statusCheckRollup { state } } } }
+        comments(last: $comments) { nodes { author { login } body createdAt } }
+        files(first: $files) { totalCount nodes { path } }
+      }
+    }
+  }
+}
+"""
+
+# GraphQL mergeable -> REST mergeable (None = wird noch berechnet)
+_MERGEABLE = {"MERGEABLE": True, "CONFLICTING": False}
+
+
+def _as_rest(node: dict) -> dict:
+    last = (node.get("lastCommit") or {}).get("nodes") or []
+    rollup = ((last[0].get("commit") or {}).get("statusCheckRollup") or {}) if last else {}
+    files = node.get("files") or {}
+    return {
+        "number": node["number"],
+        "title": node.get("title") or "",
+        "body": node.get("body") or "",
+        "html_url": node.get("url") or "",
+        "draft": bool(node.get("isDraft")),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "head": {"ref": node.get("headRefName") or "", "sha": node.get("headRefOid") or ""},
+        "labels": [{"name": l["name"]} for l in (node.get("labels") or {}).get("nodes") or []],
+        "mergeable": _MERGEABLE.get(node.get("mergeable")),
+        "mergeable_state": (node.get("mergeStateStatus") or "unknown").lower(),
+        "commit_count": (node.get("commits") or {}).get("totalCount"),
+        # SUCCESS / FAILURE / PENDING / ERROR / EXPECTED, None = keine Checks
+        "checks_state": rollup.get("state"),
+        # None = unbekannt (mehr als FILES Dateien)
+        "files": ([f["path"] for f in files.get("nodes") or []]
+                  if files.get("totalCount", 0) <= len(files.get("nodes") or []) else None),
+        "comments": [
+            {"user": {"login": (c.get("author") or {}).get("login") or ""}, "body": c.get("body") or "",
+             "created_at": c.get("createdAt")}
+            for c in (node.get("comments") or {}).get("nodes") or []
+        ],
+    }
+
+
+def open_prs(gh, repo: str, base: str, comments: int = COMMENTS, files: int = FILES) -> list:
+    """Alle offenen PRs gegen `base` (älteste zuerst); RuntimeError bei GraphQL-Fehlern"""
+    owner, name = repo.split("/", 1)
+    prs, cursor = [], None
+    while True:
+        data, errors = gh.graphql(OPEN_PRS_QUERY, {"owner": owner, "name": name, "base": base, "cursor": cursor,
+                                                   "comments": comments, "files": files, "page": PAGE_SIZE})
+        if errors or not data or not data.get("repository"):
+            raise RuntimeError(f"graphql failed: {(errors or [{}])[0].get('message', 'no data')}")
+        page = data["repository"]["pullRequests"]
+        prs.extend(_as_rest(n) for n in page["nodes"])
+        if not page["pageInfo"]["hasNextPage"]:
+            return prs
+        cursor = page["pageInfo"]["endCursor"]
@@ -0,0 +1,160 @@
+"""merge_queue.py
+
+Merge-Queue für Codex-PRs statt PR für PR blind `PUT /merge`.
+
+    1. Vorauswahl aus den Bulk-Daten (GraphQL, github_graphql.open_prs):
+       Draft, zu wenige Commits, Checks rot/laufend, Konflikt -> gar nicht erst versuchen
+    2. Reihenfolge: Abhängigkeiten zuerst ("Depends on #12" / "Abhängig von #12"
+       im PR-Text), sonst älteste zuerst
+    3. Merge-Schleife: gemergt wird mit der bekannten Head-SHA (hat sich der
+       Branch inzwischen bewegt, lehnt GitHub ab statt Ungeprüftes zu mergen).
+       Nach jedem Merge werden nur PRs neu geprüft, die dieselben Dateien
+       ändern (bzw. deren Dateiliste unbekannt ist) - die übrigen bleiben mergebar.
+
+Der Aufrufer pullt danach einmal (nicht nach jedem Merge).
+"""
+
+import re
+import time
+
+MERGE_METHOD = "squash"
+RECHECK_TRIES = 4       # GitHub berechnet mergeable asynchron
+RECHECK_DELAY = 1.5     # Sekunden, wächst linear pro Versuch
+
+DEPENDS_RE = re.compile(r"(?:depends\s+on|abhängig\s+von|requires|benötigt):?((?:\s*(?:,|and|und)?\s*#\d+)+)",
+                        re.IGNORECASE)
+# checks_state aus GraphQL; None = keine Checks konfiguriert,
+# CHECKS_UNKNOWN = nicht gelesen (REST-Fallback) oder neuer Head ohne Check-Ergebnis (gepatcht)
+CHECKS_UNKNOWN = "UNKNOWN"
+CHECKS_OK = {None, "SUCCESS"}
+CHECKS_WAIT = {"PENDING", "EXPECTED"}
+
+
+def dependencies(pr: dict) -> set:
+    """PR-Nummern, von denen dieser PR laut Beschreibung abhängt"""
+    deps = set()
+    for m in DEPENDS_RE.finditer(pr.get("body") or ""):
+        deps.update(int(n) for n in re.findall(r"#(\d+)", m.group(1)))
+    deps.discard(pr.get("number"))
+    return deps
+
+
+def order(prs: list) -> list:
+    """Abhängigkeiten vor abhängigen PRs, sonst nach Alter (created_at, Nummer); Zyklen nach Alter"""
+    by_no = {pr["number"]: pr for pr in prs}
+    age = lambda pr: (pr.get("created_at") or "", pr["number"])
+    pending = {no: dependencies(pr) & by_no.keys() for no, pr in by_no.items()}
+    result = []
+    while pending:
+        ready = [by_no[no] for no, deps in pending.items() if not deps] or [by_no[no] for no in pending]
+        nxt = min(ready, key=age)
+        result.append(nxt)
+        del pending[nxt["number"]]
+        for deps in pending.values():
+            deps.discard(nxt["number"])
+    return result
+
+
+def blocked(pr: dict, min_commits: int = 1):
+    """Grund, warum der PR jetzt nicht in die Queue darf, oder None"""
+    if pr.get("draft"):
+        return "draft"
+    cc = pr.get("commit_count")
+    if cc is not None and cc < min_commits:
+        return f"commit_count={cc} < min_commits={min_commits}"
+    checks = pr.get("checks_state")
+    if checks == CHECKS_UNKNOWN:
+        return "checks unknown"
+    if checks in CHECKS_WAIT:
+        return "checks pending"
+    if checks not in CHECKS_OK:
+        return f"checks {str(checks).lower()}"
+    if pr.get("mergeable") is False:
+        return "merge conflict"
+    return None
+
+
+class MergeQueue:
+    """
+    api(method, path, body=None) -> (status, data), z.B. lambda über gh_api.
+    run() -> {"merged": [nr], "skipped": {nr: grund}, "failed": {nr: grund}}
+    """
+
+    def __init__(self, api, repo: str, prs: list, min_commits: int = 1, method: str = MERGE_METHOD,
+                 sleep=time.sleep, log=None):
+        self.api, self.repo, self.method = api, repo, method
+        self.prs, self.min_commits = prs, min_commits
+        self.sleep = sleep
+        self.log = log or (lambda msg: None)
+        self.rechecks = 0
+
+    def _refresh(self, pr: dict) -> bool:
+        """
+        mergeable + aktuelle Head-SHA (pr["head_now"]) per REST neu holen; False wenn GitHub es
+        nicht rechtzeitig berechnet. pr["head"]["sha"] bleibt die SHA, deren Checks bekannt sind.
+        """
+        for attempt in range(1, RECHECK_TRIES + 1):
+            self.rechecks += 1
+            st, data = self.api("GET", f"/repos/{self.repo}/pulls/{pr['number']}")
+            if st != 200:
+                return False
+            pr["head_now"] = (data.get("head") or {}).get("sha") or ""
+            pr["mergeable"] = data.get("mergeable")
+            pr["mergeable_state"] = data.get("mergeable_state")
+            if data.get("state") not in (None, "open"):
+                pr["mergeable"] = False
+                return True
+            if pr["mergeable"] is not None:
+                return True
+            if attempt < RECHECK_TRIES:
+                self.sleep(RECHECK_DELAY * attempt)
+        return False
+
+    def run(self) -> dict:
+        result = {"merged": [], "skipped": {}, "failed": {}}
+        queue = []
+        for pr in self.prs:
+            reason = blocked(pr, self.min_commits)
+            if reason:
+                result["skipped"][pr["number"]] = reason
+            else:
+                queue.append(pr)
+        queue = order(queue)
+        open_numbers = {pr["number"] for pr in self.prs}
+        # ohne Mergeability (REST-Liste, frisch gepatcht) -> vor dem Merge einmal prüfen
+        stale = {pr["number"] for pr in queue if pr.get("mergeable") is None}
+        self.log(f"merge queue: {len(queue)} ready, {len(result['skipped'])} skipped")
+
+        for i, pr in enumerate(queue):
+            no = pr["number"]
+            waiting = sorted((dependencies(pr) & open_numbers) - set(result["merged"]))
+            if waiting:
+                result["skipped"][no] = "waits for " + ", ".join(f"#{d}" for d in waiting)
+                continue
+            if no in stale:
+                if not self._refresh(pr):
+                    result["skipped"][no] = "mergeable unknown"
+                    continue
+                known = (pr.get("head") or {}).get("sha")
+                if known and pr["head_now"] and pr["head_now"] != known:
+                    result["skipped"][no] = "head moved, checks not verified"
+                    continue
+                if not pr["mergeable"]:
+                    result["failed"][no] = f"merge conflict ({pr.get('mergeable_state') or 'dirty'})"
+                    continue
+            body = {"merge_method": self.method}
+            if (pr.get("head") or {}).get("sha"):
+                body["sha"] = pr["head"]["sha"]
+            st, data = self.api("PUT", f"/repos/{self.repo}/pulls/{no}/merge", body)
+            if st not in (200, 201):
+                result["failed"][no] = f"{st} {(data or {}).get('message', '')}".strip()
+                continue
+            result["merged"].append(no)
+            self.log(f"merged PR #{no}")
+            # Nur PRs mit überlappenden (oder unbekannten) Dateien müssen neu geprüft werden
+            files = set(pr["files"]) if pr.get("files") is not None else None
+            for other in queue[i + 1:]:
+                theirs = other.get("files")
+                if files is None or theirs is None or files & set(theirs):
+                    stale.add(other["number"])
+        return result
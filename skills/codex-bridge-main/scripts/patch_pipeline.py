@@ -0,0 +1,190 @@
+"""patch_pipeline.py
+
+Codex-Patches aus PR-Kommentaren für viele PRs in einem Durchgang anwenden,
+statt PR für PR im Haupt-Checkout (checkout, apply, commit, push, nächster PR).
+
+    1. EIN fetch: Base + alle betroffenen PR-Branches in den Mirror (workspace.py)
+    2. jeder Patch einzeln `git apply --check` gegen seinen PR-Branch (Base +
+       Seed, der Patch ändert meist die geseedeten Dateien) - parallel, jeder
+       Check mit eigenem temporären Index (isoliert, kein Auschecken)
+    3. die einzeln passenden PRs der Reihe nach (älteste zuerst) auf einen
+       gemeinsamen Index ab origin/<base>, je PR Seed + Patch: wer dort nicht mehr
+       passt, kollidiert mit einem vorher angenommenen PR und wird gemeldet
+    4. die verträglichen Patches jeweils als Commit auf den PR-Branch
+       (commit-tree, ohne Worktree) und alle Branches mit EINEM git push
+
+Patches kommen als Text (aus patch_from_comments); alle git-Aufrufe laufen im
+Bare-Mirror, fehlende Blobs lädt git bei Bedarf nach.
+"""
+
+import os
+import shutil
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 8
+APPLY_OPTS = ["--whitespace=fix"]
+GIT_TIMEOUT = 300
+
+
+def _git(args, cwd, env=None, index=None, stdin=None) -> subprocess.CompletedProcess:
+    if index:
+        env = dict(env or os.environ, GIT_INDEX_FILE=index)
+    return subprocess.run(["git"] + args, cwd=cwd, env=env, input=stdin, capture_output=True, text=True,
+                          timeout=GIT_TIMEOUT)
+
+
+class _TempIndex:
+    """Eigene Index-Datei mit dem Baum von `ref` (pro Check isoliert)"""
+
+    def __init__(self, mirror, ref, env=None):
+        self.mirror, self.ref, self.env = mirror, ref, env
+
+    def __enter__(self):
+        fd, self.path = tempfile.mkstemp(prefix="codex-index-")
+        os.close(fd)
+        os.remove(self.path)
+        p = _git(["read-tree", self.ref], self.mirror, self.env, index=self.path)
+        if p.returncode != 0:
+            raise RuntimeError(f"read-tree {self.ref} failed: {(p.stderr or '').strip()[:300]}")
+        return self.path
+
+    def __exit__(self, *exc):
+        for suffix in ("", ".lock"):
+            try:
+                os.remove(self.path + suffix)
+            except OSError:
+                pass
+
+
+def _apply(mirror, index, patch, env=None, check=False):
+    """(ok, meldung): Patch auf den Index anwenden bzw. nur prüfen"""
+    args = ["apply", "--cached"] + APPLY_OPTS + (["--check"] if check else [])
+    p = _git(args, mirror, env, index=index, stdin=patch)
+    return p.returncode == 0, (p.stderr or p.stdout or "").strip()[:500]
+
+
+def touched_files(mirror, patch, env=None) -> set:
+    """Pfade, die der Patch ändert (git apply --numstat, nichts wird angewendet)"""
+    p = _git(["apply", "--numstat"], mirror, env, stdin=patch)
+    return {line.split("\t", 2)[2] for line in p.stdout.splitlines() if line.count("\t") >= 2}
+
+
+def fetch(mirror, base, heads, env=None):
+    """Base + PR-Branches mit einem fetch; fehlt ein Branch, alle Branches holen"""
+    refspecs = [f"+refs/heads/{b}:refs/remotes/origin/{b}" for b in dict.fromkeys([base] + list(heads))]
+    p = _git(["fetch", "--no-tags", "origin"] + refspecs, mirror, env)
+    if p.returncode != 0:
+        p = _git(["fetch", "--no-tags", "--prune", "origin"], mirror, env)
+        if p.returncode != 0:
+            raise RuntimeError(f"fetch failed: {(p.stderr or '').strip()[:500]}")
+
+
+def check(mirror, refs: dict, patches: dict, env=None, max_workers: int = MAX_WORKERS) -> dict:
+    """{pr: (ok, meldung)}: jeder Patch einzeln gegen seinen eigenen Stand refs[pr] (PR-Head), parallel"""
+
+    def _one(item):
+        pr, patch = item
+        try:
+            with _TempIndex(mirror, refs[pr], env) as index:
+                return pr, _apply(mirror, index, patch, env, check=True)
+        except RuntimeError as e:   # PR-Branch existiert nicht (mehr)
+            return pr, (False, str(e))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(patches)))) as ex:
+        return dict(ex.map(_one, patches.items()))
+
+
+def seed_diff(mirror, base_ref, head_ref, env=None) -> str:
+    """Was der PR-Branch bisher gegenüber der Base ändert (Seed-Commit)"""
+    p = _git(["diff", "--binary", f"{base_ref}...{head_ref}"], mirror, env)
+    if p.returncode != 0:
+        raise RuntimeError(f"diff {head_ref} failed: {(p.stderr or '').strip()[:300]}")
+    return p.stdout
+
+
+def combine(mirror, base_ref, refs: dict, patches: dict, order, env=None):
+    """
+    PRs in `order` nacheinander auf einen gemeinsamen Index ab base_ref - je PR erst
+    sein Seed (base...head), dann der Patch; so wie die PRs später in die Base kommen.
+    Gibt (angenommen, konflikte) zurück; konflikte = {pr: [PRs, mit denen er kollidiert]}
+    """
+    accepted, conflicts, files = [], {}, {}
+    with _TempIndex(mirror, base_ref, env) as index:
+        for pr in order:
+            seed = seed_diff(mirror, base_ref, refs[pr], env)
+            files[pr] = touched_files(mirror, seed, env) | touched_files(mirror, patches[pr], env)
+            vorher = index + ".vorher"
+            shutil.copyfile(index, vorher)
+            ok = all(_apply(mirror, index, diff, env)[0] for diff in (seed, patches[pr]) if diff.strip())
+            if ok:
+                accepted.append(pr)
+            else:
+                shutil.copyfile(vorher, index)   # halb angewendeten PR zurücknehmen
+                conflicts[pr] = [other for other in accepted if files[other] & files[pr]] or accepted[:]
+            os.remove(vorher)
+    return accepted, conflicts
+
+
+def commit_onto(mirror, head_ref, patch, message, env=None):
+    """Patch als Commit auf head_ref (ohne Worktree); gibt (sha, fehler) zurück"""
+    with _TempIndex(mirror, head_ref, env) as index:
+        ok, msg = _apply(mirror, index, patch, env)
+        if not ok:
+            return None, msg
+        tree = _git(["write-tree"], mirror, env, index=index)
+        if tree.returncode != 0:
+            return None, (tree.stderr or "").strip()[:300]
+    parent = _git(["rev-parse", head_ref], mirror, env).stdout.strip()
+    if tree.stdout.strip() == _git(["rev-parse", f"{head_ref}^{{tree}}"], mirror, env).stdout.strip():
+        return None, "patch changes nothing"
+    p = _git(["commit-tree", tree.stdout.strip(), "-p", parent, "-m", message], mirror, env)
+    if p.returncode != 0:
+        return None, (p.stderr or "").strip()[:300]
+    return p.stdout.strip(), ""
+
+
+def run(mirror, base: str, candidates: list, env=None, message: str = "[codex] apply patch for PR #{pr}",
+        max_workers: int = MAX_WORKERS) -> dict:
+    """
+    candidates: [{"pr": 12, "head": "codex-...", "patch": "diff --git ..."}], älteste zuerst.
+    Ergebnis: {"applied": {pr: sha}, "failed": {pr: grund}, "conflicts": {pr: [prs]}, "push_error": str|None}
+    """
+    result = {"applied": {}, "failed": {}, "conflicts": {}, "push_error": None}
+    if not candidates:
+        return result
+    heads = {c["pr"]: c["head"] for c in candidates}
+    patches = {c["pr"]: c["patch"] for c in candidates}
+    fetch(mirror, base, heads.values(), env)
+    base_ref = f"refs/remotes/origin/{base}"
+    refs = {pr: f"refs/remotes/origin/{head}" for pr, head in heads.items()}
+
+    for pr, (ok, msg) in check(mirror, refs, patches, env, max_workers).items():
+        if not ok:
+            result["failed"][pr] = f"does not apply to {heads[pr]}: {msg}"
+    order = [c["pr"] for c in candidates if c["pr"] not in result["failed"]]
+    accepted, result["conflicts"] = combine(mirror, base_ref, refs, patches, order, env)
+
+    def _commit(pr):
+        try:
+            return pr, commit_onto(mirror, refs[pr], patches[pr], message.format(pr=pr), env)
+        except RuntimeError as e:   # PR-Branch existiert nicht (mehr)
+            return pr, (None, str(e))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(accepted) or 1))) as ex:
+        commits = dict(ex.map(_commit, accepted))
+    refspecs = []
+    for pr in accepted:
+        sha, err = commits[pr]
+        if sha:
+            refspecs.append(f"{sha}:refs/heads/{heads[pr]}")
+            result["applied"][pr] = sha
+        else:
+            result["failed"][pr] = f"does not apply to {heads[pr]}: {err}"
+    if refspecs:
+        p = _git(["push", "origin"] + refspecs, mirror, env)
+        if p.returncode != 0:
+            result["push_error"] = (p.stderr or p.stdout or "").strip()[:500]
+            result["applied"] = {}
+    return result
@@ -0,0 +1,134 @@
+"""repo_archive.py
+
+Branch-Inhalt auf die Platte holen, ohne /contents rekursiv abzulaufen
+(ein Request pro Ordner + einer pro Datei, alles base64 im Speicher).
+
+    download_tree(...)   EIN Request: /tarball/<ref>, wird beim Lesen entpackt
+                         (tarfile im Stream-Modus, Datei für Datei auf die Platte)
+    download_files(...)  nur bestimmte Pfade (z.B. aus dem Compare-Diff), parallel
+                         als Raw-Download (Accept: application/vnd.github.raw)
+
+Der Speicherbedarf bleibt konstant, egal wie groß das Repo ist. Zurück kommt ein
+FileIndex: Pfade sind sofort bekannt, Inhalte werden erst beim Zugriff gelesen.
+"""
+
+import shutil
+import tarfile
+from pathlib import Path, PurePosixPath
+from collections.abc import Mapping
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+MAX_WORKERS = 8
+CHUNK = 1024 * 64
+# Abbruch mitten im Download/Entpacken (Verbindung, kaputtes Archiv, Platte) -> RuntimeError
+STREAM_ERRORS = (tarfile.TarError, OSError, requests.RequestException, Urllib3Error)
+
+
+class FileIndex(Mapping):
+    """{pfad: text} über einem entpackten Ordner - Inhalt wird erst bei Zugriff gelesen"""
+
+    def __init__(self, root, paths):
+        self.root = Path(root)
+        self._paths = sorted(paths)
+
+    def __getitem__(self, path):
+        if path not in self._paths:
+            raise KeyError(path)
+        return (self.root / path).read_text(encoding="utf-8", errors="replace")
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def path(self, rel) -> Path:
+        return self.root / rel
+
+    def __repr__(self):
+        return f"FileIndex({self.root}, {len(self._paths)} Dateien)"
+
+
+def _safe_target(root: Path, rel: str):
+    """Zielpfad unterhalb von root, None bei absoluten Pfaden oder '..'"""
+    p = PurePosixPath(rel)
+    if not rel or p.is_absolute() or ".." in p.parts:
+        return None
+    return root.joinpath(*p.parts)
+
+
+def _reset_dir(dest) -> Path:
+    dest = Path(dest)
+    if dest.exists():
+        shutil.rmtree(dest)
+    dest.mkdir(parents=True)
+    return dest
+
+
+def download_tree(gh, repo: str, ref: str, dest, only=None) -> FileIndex:
+    """
+    Tarball von `ref` nach `dest` entpacken (dest wird geleert).
+    gh: GitHubClient; only: optionale Menge von Pfaden, alles andere wird übersprungen.
+    """
+    resp = gh.send("GET", f"/repos/{repo}/tarball/{quote(ref, safe='')}", stream=True)
+    if resp is None:
+        raise RuntimeError(f"tarball download failed: {gh.last_error}")
+    if resp.status_code != 200:
+        raise RuntimeError(f"tarball download failed: {resp.status_code} {resp.text[:200]}")
+    try:
+        dest = _reset_dir(dest)
+        paths = []
+        resp.raw.decode_content = True
+        with resp, tarfile.open(fileobj=resp.raw, mode="r|gz") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                # Oberster Ordner ist "<owner>-<repo>-<sha>/"
+                rel = member.name.split("/", 1)[1] if "/" in member.name else ""
+                if only is not None and rel not in only:
+                    continue
+                target = _safe_target(dest, rel)
+                if target is None:
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with tar.extractfile(member) as src, open(target, "wb") as out:
+                    shutil.copyfileobj(src, out, CHUNK)
+                paths.append(rel)
+    except STREAM_ERRORS as e:
+        raise RuntimeError(f"tarball download failed: {type(e).__name__}: {e}") from e
+    return FileIndex(dest, paths)
+
+
+def _download_raw(gh, repo: str, ref: str, rel: str, dest: Path) -> bool:
+    target = _safe_target(dest, rel)
+    if target is None:
+        return False
+    resp = gh.send("GET", f"/repos/{repo}/contents/{quote(rel)}?ref={quote(ref, safe='')}",
+                   headers={"Accept": "application/vnd.github.raw"}, stream=True)
+    if resp is None or resp.status_code != 200:
+        return False
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with resp, open(target, "wb") as out:
+            for chunk in resp.iter_content(CHUNK):
+                out.write(chunk)
+    except STREAM_ERRORS:
+        target.unlink(missing_ok=True)   # halbe Datei nicht als geladen melden
+        return False
+    return True
+
+
+def download_files(gh, repo: str, ref: str, paths, dest, max_workers: int = MAX_WORKERS) -> FileIndex:
+    """Nur `paths` (z.B. geänderte Dateien laut Compare) parallel nach `dest` laden"""
+    try:
+        dest = _reset_dir(dest)
+    except OSError as e:
+        raise RuntimeError(f"cannot prepare {dest}: {e}") from e
+    paths = sorted(set(paths))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths) or 1))) as ex:
+        ok = list(ex.map(lambda rel: _download_raw(gh, repo, ref, rel, dest), paths))
+    return FileIndex(dest, [p for p, good in zip(paths, ok) if good])
@@ -0,0 +1,219 @@
+"""task_store.py
+
+Bridge-Status in SQLite statt JSON-Datei (letzte 50 Tasks, bei jedem Dispatch
+komplett neu geschrieben) bzw. Status-Datei auf dem Desktop.
+
+    tasks    ein Eintrag pro (Repo, Branch): Base, Task, PR/Issue, aktueller Status
+    events   jeder Statuswechsel mit Zeitstempel (Dauer dispatch -> merged usw.)
+    etags    ETag-Cache des GitHub-Clients (bedingte GETs auch über Läufe hinweg)
+
+WAL-Modus: parallele Bridge-Läufe (Cron-Sync + Dispatch) lesen und schreiben
+gleichzeitig, ohne sich gegenseitig Einträge zu überschreiben. Kein Limit
+für die Historie; status/sync/history sind Abfragen über Indizes.
+
+Pfad: ~/.openclaw/codex_bridge.db (oder CODEX_BRIDGE_DB)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+DB_PATH = Path(os.environ.get("CODEX_BRIDGE_DB") or Path.home() / ".openclaw" / "codex_bridge.db")
+LEGACY_STATE_PATH = Path.home() / ".openclaw" / "codex_bridge_state.json"
+
+TASKS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id          INTEGER PRIMARY KEY,
+    repo        TEXT NOT NULL,
+    base        TEXT,
+    branch      TEXT NOT NULL,
+    task        TEXT,
+    route       TEXT,
+    source      TEXT,
+    -- dispatched -> working (Codex hat committet) -> merged; daneben patched, patch_conflict, merge_failed,
+    -- sent/completed/timeout (codex_bridge_v2)
+    status      TEXT NOT NULL,
+    pr_no       INTEGER,
+    pr_url      TEXT,
+    issue_no    INTEGER,
+    issue_url   TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    -- Branch-Namen (codex-<zeitstempel>) sind nur pro Repo eindeutig
+    UNIQUE (repo, branch)
+);
+"""
+
+SCHEMA = TASKS_TABLE.format(name="tasks") + """
+CREATE INDEX IF NOT EXISTS tasks_repo_status ON tasks(repo, status);
+CREATE INDEX IF NOT EXISTS tasks_repo_pr ON tasks(repo, pr_no);
+CREATE INDEX IF NOT EXISTS tasks_created ON tasks(created_at);
+
+CREATE TABLE IF NOT EXISTS events (
+    id       INTEGER PRIMARY KEY,
+    task_id  INTEGER NOT NULL REFERENCES tasks(id),
+    status   TEXT NOT NULL,
+    at       REAL NOT NULL,
+    detail   TEXT
+);
+CREATE INDEX IF NOT EXISTS events_task ON events(task_id, at);
+
+CREATE TABLE IF NOT EXISTS etags (
+    url         TEXT PRIMARY KEY,
+    etag        TEXT NOT NULL,
+    data        TEXT NOT NULL,
+    updated_at  REAL NOT NULL
+);
+"""
+
+TASK_FIELDS = ("pr_no", "pr_url", "issue_no", "issue_url", "route", "base", "task")
+
+
+class TaskStore:
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._db() as db:
+            self._migrate(db)
+            db.executescript(SCHEMA)
+        self._import_legacy()
+
+    @staticmethod
+    def _migrate(db):
+        """Ältere DBs: branch allein UNIQUE -> Tabelle mit UNIQUE(repo, branch) neu aufbauen (ids bleiben)"""
+        for idx in db.execute("PRAGMA index_list(tasks)").fetchall():
+            if idx["unique"] and [c["name"] for c in db.execute(f"PRAGMA index_info({idx['name']})")] == ["branch"]:
+                break
+        else:
+            return
+        db.executescript("BEGIN IMMEDIATE;" + TASKS_TABLE.format(name="tasks_neu") +
+                         "INSERT INTO tasks_neu SELECT * FROM tasks; DROP TABLE tasks;"
+                         "ALTER TABLE tasks_neu RENAME TO tasks; COMMIT;")
+
+    def _db(self) -> sqlite3.Connection:
+        """Eine Verbindung pro Thread (Batch-Dispatch schreibt aus mehreren Threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _import_legacy(self):
+        """Alte codex_bridge_state.json einmalig übernehmen"""
+        if not LEGACY_STATE_PATH.exists():
+            return
+        db = self._db()
+        if db.execute("SELECT 1 FROM tasks LIMIT 1").fetchone():
+            return
+        try:
+            tasks = json.loads(LEGACY_STATE_PATH.read_text(encoding="utf-8")).get("tasks", [])
+        except (OSError, ValueError):
+            return
+        for t in reversed(tasks):
+            if t.get("repo") and t.get("branch"):
+                self.add_task(t["repo"], t.get("base"), t["branch"], t.get("task"), source="json",
+                              at=t.get("ts"), **{k: t.get(k) for k in ("pr_no", "pr_url", "issue_no", "issue_url")})
+
+    # ---------- Schreiben ----------
+
+    def add_task(self, repo: str, base: str, branch: str, task: str, status: str = "dispatched",
+                 source: str = "bridge_main", at: float = None, **fields) -> int:
+        at = float(at or time.time())
+        cols = {k: v for k, v in fields.items() if k in TASK_FIELDS}
+        with self._db() as db:
+            db.execute(
+                f"INSERT INTO tasks (repo, base, branch, task, source, status, created_at, updated_at"
+                f"{''.join(', ' + k for k in cols)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?{', ?' * len(cols)}) "
+                f"ON CONFLICT(repo, branch) DO UPDATE SET status=excluded.status, updated_at=excluded.updated_at"
+                f"{''.join(f', {k}=excluded.{k}' for k in cols)}",
+                (repo, base, branch, task, source, status, at, at, *cols.values()))
+            task_id = db.execute("SELECT id FROM tasks WHERE repo=? AND branch=?", (repo, branch)).fetchone()[0]
+            db.execute("INSERT INTO events (task_id, status, at) VALUES (?, ?, ?)", (task_id, status, at))
+        return task_id
+
+    def set_status(self, repo: str, branch: str, status: str, detail: str = None, **fields) -> bool:
+        """Statuswechsel (+ Event); gleicher Status ohne detail wird nicht erneut protokolliert"""
+        now = time.time()
+        cols = {k: v for k, v in fields.items() if k in TASK_FIELDS}
+        with self._db() as db:
+            row = db.execute("SELECT id, status FROM tasks WHERE repo=? AND branch=?", (repo, branch)).fetchone()
+            if row is None:
+                return False
+            if row["status"] == status and detail is None and not cols:
+                return True
+            db.execute(f"UPDATE tasks SET status=?, updated_at=?{''.join(f', {k}=?' for k in cols)} WHERE id=?",
+                       (status, now, *cols.values(), row["id"]))
+            db.execute("INSERT INTO events (task_id, status, at, detail) VALUES (?, ?, ?, ?)",
+                       (row["id"], status, now, detail))
+        return True
+
+    # ---------- Lesen ----------
+
+    def by_branch(self, repo: str, branch: str):
+        row = self._db().execute("SELECT * FROM tasks WHERE repo=? AND branch=?", (repo, branch)).fetchone()
+        return dict(row) if row else None
+
+    def by_pr(self, repo: str, pr_no: int):
+        row = self._db().execute("SELECT * FROM tasks WHERE repo=? AND pr_no=?", (repo, pr_no)).fetchone()
+        return dict(row) if row else None
+
+    def latest(self, repo: str = None):
+        rows = self.history(repo=repo, limit=1)
+        return rows[0] if rows else None
+
+    def history(self, repo: str = None, status: str = None, limit: int = None) -> list:
+        """Tasks (neueste zuerst) inkl. done_at = erster Wechsel auf merged/completed"""
+        where, params = [], []
+        if repo:
+            where.append("t.repo = ?")
+            params.append(repo)
+        if status:
+            where.append("t.status = ?")
+            params.append(status)
+        sql = ("SELECT t.*, (SELECT MIN(e.at) FROM events e WHERE e.task_id = t.id "
+               "AND e.status IN ('merged', 'completed')) AS done_at FROM tasks t")
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t.created_at DESC, t.id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [dict(r) for r in self._db().execute(sql, params)]
+
+    def events(self, repo: str, branch: str) -> list:
+        return [dict(r) for r in self._db().execute(
+            "SELECT e.status, e.at, e.detail FROM events e JOIN tasks t ON t.id = e.task_id "
+            "WHERE t.repo = ? AND t.branch = ? ORDER BY e.at, e.id", (repo, branch))]
+
+    # ---------- ETags (github_client) ----------
+
+    def get(self, url):
+        row = self._db().execute("SELECT etag, data FROM etags WHERE url=?", (url,)).fetchone()
+        return (row["etag"], json.loads(row["data"])) if row else None
+
+    def set(self, url, etag, data):
+        with self._db() as db:
+            db.execute("INSERT INTO etags (url, etag, data, updated_at) VALUES (?, ?, ?, ?) "
+                       "ON CONFLICT(url) DO UPDATE SET etag=excluded.etag, data=excluded.data, "
+                       "updated_at=excluded.updated_at", (url, etag, json.dumps(data), time.time()))
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def store(path=DB_PATH) -> TaskStore:
+    """Geteilter Store pro Datei"""
+    with _STORES_LOCK:
+        key = str(path)
+        if key not in _STORES:
+            _STORES[key] = TaskStore(path)
+        return _STORES[key]
@@ -0,0 +1,156 @@
+import base64
+import hashlib
+import json
+
+import pytest
+
+import git_data
+
+
+class FakeGitHub:
+    """Kleiner Stand-in für die Git Data API im Speicher; api(method, path, body) wie gh_api"""
+
+    def __init__(self, repo="o/r"):
+        self.prefix = f"/repos/{repo}/git/"
+        self.objects = {}
+        self.refs = {}
+        self.calls = []
+        self.before_ref_write = None    # Hook: simuliert einen parallelen Push
+        root = self._store({"tree": []})
+        self.refs["main"] = self._store({"tree": root, "parents": [], "message": "init"})
+
+    def _store(self, obj):
+        sha = hashlib.sha1(json.dumps(obj, sort_keys=True).encode()).hexdigest()
+        self.objects[sha] = obj
+        return sha
+
+    def files(self, branch):
+        tree = self.objects[self.objects[self.refs[branch]]["tree"]]["tree"]
+        return {e["path"]: base64.b64decode(self.objects[e["sha"]]["content"]) for e in tree}
+
+    def push(self, branch, message="fremder Commit"):
+        """Commit eines anderen Schreibers auf `branch` (gleicher Tree, neuer Kopf)"""
+        head = self.refs[branch]
+        self.refs[branch] = self._store({"tree": self.objects[head]["tree"], "parents": [head], "message": message})
+
+    def __call__(self, method, path, body=None):
+        assert path.startswith(self.prefix), path
+        rest = path[len(self.prefix):]
+        self.calls.append((method, rest.split("/")[0]))
+        if method == "GET" and rest.startswith("ref/heads/"):
+            sha = self.refs.get(rest[len("ref/heads/"):])
+            return (200, {"object": {"sha": sha}}) if sha else (404, {"message": "Not Found"})
+        if method == "GET" and rest.startswith("commits/"):
+            return 200, {"tree": {"sha": self.objects[rest[len("commits/"):]]["tree"]}}
+        if method == "POST" and rest == "blobs":
+            assert body["encoding"] == "base64"
+            return 201, {"sha": self._store({"content": body["content"]})}
+        if method == "POST" and rest == "trees":
+            entries = {e["path"]: e for e in self.objects[body["base_tree"]]["tree"]}
+            for e in body["tree"]:
+                if e["sha"] is None:
+                    entries.pop(e["path"], None)
+                else:
+                    assert e["sha"] in self.objects
+                    entries[e["path"]] = e
+            return 201, {"sha": self._store({"tree": sorted(entries.values(), key=lambda e: e["path"])})}
+        if method == "POST" and rest == "commits":
+            return 201, {"sha": self._store(dict(body))}
+        if rest == "refs" or rest.startswith("refs/heads/"):
+            if self.before_ref_write:
+                hook, self.before_ref_write = self.before_ref_write, None
+                hook()
+            if method == "POST":
+                branch = body["ref"][len("refs/heads/"):]
+                if branch in self.refs:
+                    return 422, {"message": "Reference already exists"}
+                self.refs[branch] = body["sha"]
+                return 201, {"object": {"sha": body["sha"]}}
+            branch = rest[len("refs/heads/"):]
+            if self.objects[body["sha"]]["parents"] != [self.refs[branch]] and not body.get("force"):
+                return 422, {"message": "Update is not a fast forward"}
+            self.refs[branch] = body["sha"]
+            return 200, {"object": {"sha": body["sha"]}}
+        return 404, {"message": f"unexpected {method} {path}"}
+
+
+def test_push_tree_legt_blobs_tree_commit_und_ref_an():
+    gh = FakeGitHub()
+    gh.refs["feature"] = gh.refs["main"]
+    gh.calls.clear()
+
+    res = git_data.push_tree(gh, "o/r", "feature", {"a.txt": b"A", "sub\\b.sh": (b"B", "100755")}, "msg")
+
+    assert res["created"] is False and res["files"] == ["a.txt", "sub/b.sh"]
+    assert gh.refs["feature"] == res["commit"]
+    assert gh.files("feature") == {"a.txt": b"A", "sub/b.sh": b"B"}
+    assert gh.objects[res["commit"]]["parents"] == [gh.refs["main"]]
+    assert [c for c in gh.calls if c[1] != "blobs"] == [
+        ("GET", "ref"), ("GET", "commits"), ("POST", "trees"), ("POST", "commits"), ("PATCH", "refs")]
+    assert gh.calls.count(("POST", "blobs")) == 2
+
+
+def test_push_tree_loescht_dateien():
+    gh = FakeGitHub()
+    git_data.push_tree(gh, "o/r", "main", {"a.txt": b"A", "b.txt": b"B"}, "add")
+
+    git_data.push_tree(gh, "o/r", "main", {"a.txt": None}, "del")
+
+    assert gh.files("main") == {"b.txt": b"B"}
+
+
+def test_neuer_branch_wird_per_post_angelegt():
+    gh = FakeGitHub()
+    main = gh.refs["main"]
+
+    res = git_data.push_tree(gh, "o/r", "codex-1", {"x.py": b"x = 1\n"}, "seed")
+
+    assert res["created"] is True
+    assert ("POST", "refs") in gh.calls and ("PATCH", "refs") not in gh.calls
+    assert gh.refs["codex-1"] == res["commit"] and gh.refs["main"] == main
+    assert gh.objects[res["commit"]]["parents"] == [main]
+
+
+def test_parallel_angelegter_branch_wird_als_update_wiederholt():
+    gh = FakeGitHub()
+
+    def parallel_dispatch():
+        gh.refs["codex-1"] = gh.refs["main"]
+        gh.push("codex-1")
+
+    gh.before_ref_write = parallel_dispatch
+
+    res = git_data.push_tree(gh, "o/r", "codex-1", {"x.py": b"x"}, "seed")
+
+    assert res["created"] is False
+    assert gh.calls.count(("POST", "refs")) == 1 and gh.calls.count(("PATCH", "refs")) == 1
+    assert gh.calls.count(("POST", "blobs")) == 1     # Blobs werden beim zweiten Versuch nicht neu hochgeladen
+    parent = gh.objects[res["commit"]]["parents"][0]
+    assert gh.objects[parent]["message"] == "fremder Commit"
+    assert gh.files("codex-1") == {"x.py": b"x"}
+
+
+def test_ref_race_422_setzt_auf_den_neuen_kopf():
+    gh = FakeGitHub()
+    gh.before_ref_write = lambda: gh.push("main")
+
+    res = git_data.push_tree(gh, "o/r", "main", {"x.py": b"x"}, "update")
+
+    assert gh.calls.count(("PATCH", "refs")) == 2
+    assert gh.refs["main"] == res["commit"]
+    parent = gh.objects[res["commit"]]["parents"][0]
+    assert gh.objects[parent]["message"] == "fremder Commit"    # kein Force-Push, nichts überschrieben
+
+
+def test_ref_race_gibt_nach_max_versuchen_auf():
+    gh = FakeGitHub()
+    real = gh.__call__
+
+    def racy(method, path, body=None):
+        if method == "PATCH":
+            gh.push("main")
+        return real(method, path, body)
+
+    with pytest.raises(RuntimeError, match="update ref main failed: 422"):
+        git_data.push_tree(racy, "o/r", "main", {"x.py": b"x"}, "update")
+    assert gh.calls.count(("PATCH", "refs")) == git_data.MAX_REF_RETRIES
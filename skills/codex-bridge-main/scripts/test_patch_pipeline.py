@@ -0,0 +1,69 @@
+import subprocess
+
+import patch_pipeline
+import workspace
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t"] + list(args), cwd=cwd,
+                          check=True, capture_output=True, text=True).stdout
+
+
+def _commit(work, files, message):
+    for rel, text in files.items():
+        path = work / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    _git(work, "add", "-A")
+    _git(work, "commit", "-qm", message)
+
+
+def _patch(work, branch, rel, text):
+    """Diff, der `rel` auf `branch` durch `text` ersetzt (wie ein Codex-Kommentar)"""
+    _git(work, "checkout", "-q", branch)
+    (work / rel).write_text(text)
+    diff = _git(work, "diff")
+    _git(work, "checkout", "-q", "--", rel)
+    return diff
+
+
+def _origin(tmp_path):
+    origin = tmp_path / "origin.git"
+    work = tmp_path / "work"
+    _git(tmp_path, "init", "-q", "--bare", "-b", "main", str(origin))
+    _git(tmp_path, "clone", "-q", str(origin), str(work))
+    _git(work, "checkout", "-q", "-b", "main")
+    _commit(work, {"README.md": "repo\n"}, "init")
+    _git(work, "push", "-q", "origin", "main")
+    return origin, work
+
+
+def _seed(work, branch, route):
+    _git(work, "checkout", "-q", "-b", branch, "main")
+    _commit(work, {f"{route}/calculator.py": "def add(a, b): return a + b\n"}, "seed")
+    _git(work, "push", "-q", "origin", branch)
+
+
+def test_patch_fuer_geseedete_dateien_wird_gegen_den_pr_branch_geprueft(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "MIRRORS_PATH", tmp_path / "mirrors")
+    origin, work = _origin(tmp_path)
+    _seed(work, "codex-1", "codex_tasks/a")
+    _seed(work, "codex-2", "codex_tasks/b")
+    _seed(work, "codex-3", "codex_tasks/a")     # gleiche Route wie codex-1
+    candidates = [
+        {"pr": 1, "head": "codex-1", "patch": _patch(work, "codex-1", "codex_tasks/a/calculator.py", "A = 1\n")},
+        {"pr": 2, "head": "codex-2", "patch": _patch(work, "codex-2", "codex_tasks/b/calculator.py", "B = 2\n")},
+        {"pr": 3, "head": "codex-3", "patch": _patch(work, "codex-3", "codex_tasks/a/calculator.py", "C = 3\n")},
+    ]
+    mirror = workspace.ensure_mirror("o/r", url=str(origin))
+    _git(mirror, "config", "user.name", "t")
+    _git(mirror, "config", "user.email", "t@t")
+
+    res = patch_pipeline.run(mirror, "main", candidates)
+
+    assert res["failed"] == {}
+    assert sorted(res["applied"]) == [1, 2]
+    assert res["conflicts"] == {3: [1]}
+    assert res["push_error"] is None
+    assert _git(origin, "show", "codex-1:codex_tasks/a/calculator.py") == "A = 1\n"
+    assert _git(origin, "show", "codex-3:codex_tasks/a/calculator.py") == "def add(a, b): return a + b\n"
@@ -0,0 +1,77 @@
+import io
+import tarfile
+
+import pytest
+import requests
+
+import repo_archive
+
+
+class FakeResponse:
+    def __init__(self, data=b"", status_code=200, chunks=None):
+        self.raw = io.BytesIO(data)
+        self.status_code = status_code
+        self.text = ""
+        self._chunks = chunks
+
+    def iter_content(self, size):
+        for chunk in self._chunks:
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.raw.close()
+
+
+class FakeClient:
+    """GitHubClient.send-Ersatz: liefert pro Pfad-Präfix eine vorbereitete Antwort"""
+
+    last_error = None
+
+    def __init__(self, responses):
+        self.responses = responses
+
+    def send(self, method, path, **kwargs):
+        return next(make() for prefix, make in self.responses.items() if prefix in path)
+
+
+def _tarball(files: dict) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for rel, data in files.items():
+            info = tarfile.TarInfo(f"o-r-abc123/{rel}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def test_download_tree_entpackt_den_tarball(tmp_path):
+    gh = FakeClient({"/tarball/": lambda: FakeResponse(_tarball({"a.txt": b"A", "sub/b.py": b"B"}))})
+
+    files = repo_archive.download_tree(gh, "o/r", "codex-1", tmp_path / "out")
+
+    assert dict(files) == {"a.txt": "A", "sub/b.py": "B"}
+
+
+def test_abgebrochener_tarball_wird_zu_runtimeerror(tmp_path):
+    data = _tarball({"a.txt": b"A" * 100000})
+    gh = FakeClient({"/tarball/": lambda: FakeResponse(data[:len(data) // 2])})
+
+    with pytest.raises(RuntimeError, match="tarball download failed"):
+        repo_archive.download_tree(gh, "o/r", "codex-1", tmp_path / "out")
+
+
+def test_abgebrochener_raw_download_fehlt_im_index(tmp_path):
+    gh = FakeClient({
+        "/contents/ok.txt": lambda: FakeResponse(chunks=[b"ok"]),
+        "/contents/kaputt.txt": lambda: FakeResponse(chunks=[b"halb", requests.ConnectionError("reset")]),
+    })
+
+    files = repo_archive.download_files(gh, "o/r", "codex-1", ["ok.txt", "kaputt.txt"], tmp_path / "out")
+
+    assert dict(files) == {"ok.txt": "ok"}
+    assert not (tmp_path / "out" / "kaputt.txt").exists()
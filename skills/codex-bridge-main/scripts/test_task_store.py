@@ -0,0 +1,45 @@
+import sqlite3
+
+import task_store
+from task_store import TaskStore
+
+ALTES_SCHEMA = """
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY, repo TEXT NOT NULL, base TEXT, branch TEXT NOT NULL UNIQUE, task TEXT, route TEXT,
+    source TEXT, status TEXT NOT NULL, pr_no INTEGER, pr_url TEXT, issue_no INTEGER, issue_url TEXT,
+    created_at REAL NOT NULL, updated_at REAL NOT NULL
+);
+CREATE TABLE events (id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL REFERENCES tasks(id), status TEXT NOT NULL,
+                     at REAL NOT NULL, detail TEXT);
+INSERT INTO tasks (id, repo, branch, task, status, created_at, updated_at) VALUES (7, 'o/a', 'codex-1', 't', 'working', 1, 2);
+INSERT INTO events (task_id, status, at) VALUES (7, 'dispatched', 1), (7, 'working', 2);
+"""
+
+
+def test_gleicher_branch_in_zwei_repos(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_store, "LEGACY_STATE_PATH", tmp_path / "fehlt.json")
+    db = TaskStore(tmp_path / "bridge.db")
+    a = db.add_task("o/a", "main", "codex-1", "A")
+    b = db.add_task("o/b", "main", "codex-1", "B")
+
+    assert a != b
+    assert db.set_status("o/b", "codex-1", "merged")
+    assert db.by_branch("o/a", "codex-1")["status"] == "dispatched"
+    assert db.by_branch("o/b", "codex-1")["task"] == "B"
+    assert [e["status"] for e in db.events("o/b", "codex-1")] == ["dispatched", "merged"]
+    assert not db.set_status("o/c", "codex-1", "merged")
+
+
+def test_alte_db_wird_migriert(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_store, "LEGACY_STATE_PATH", tmp_path / "fehlt.json")
+    pfad = tmp_path / "bridge.db"
+    with sqlite3.connect(pfad) as conn:
+        conn.executescript(ALTES_SCHEMA)
+
+    db = TaskStore(pfad)
+    db.add_task("o/b", "main", "codex-1", "B")
+
+    assert db.by_branch("o/a", "codex-1")["id"] == 7
+    assert [e["status"] for e in db.events("o/a", "codex-1")] == ["dispatched", "working"]
+    assert db.by_branch("o/b", "codex-1")["status"] == "dispatched"
+    assert TaskStore(pfad).by_branch("o/a", "codex-1")["status"] == "working"   # zweites Öffnen: nichts zu tun
@@ -0,0 +1,88 @@
+"""workspace.py
+
+Lokale Arbeitskopien für dispatch ohne vollen Clone pro Checkout.
+
+    ~/.openclaw/mirrors/<owner>__<repo>.git   EIN geteilter Bare-Mirror pro Repo,
+                                              partiell geklont (--filter=blob:none):
+                                              Commits/Trees ja, Dateiinhalte erst bei Bedarf
+    ~/.openclaw/worktrees/<branch>            pro Task ein Worktree aus dem Mirror,
+                                              Sparse-Checkout nur auf die Route
+
+Update = ein `fetch` genau des Base-Branches. node_modules, Archive und die
+übrigen Seed-Ordner werden nie ausgecheckt und ihre Blobs nie geladen;
+Clone-/Update-Zeit und Platz wachsen nicht mit dem Repo.
+
+Alle Funktionen nehmen optional `env` (z.B. Token per GIT_CONFIG_*), weil der
+Mirror fehlende Blobs beim Auschecken nachlädt.
+"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+MIRRORS_PATH = Path.home() / ".openclaw" / "mirrors"
+WORKTREES_PATH = Path.home() / ".openclaw" / "worktrees"
+REMOTE_URL = "https://github.com/{repo}.git"
+FILTER = "blob:none"
+GIT_TIMEOUT = 600
+
+
+def _git(args, cwd=None, env=None) -> str:
+    p = subprocess.run(["git"] + args, cwd=cwd, env=env, capture_output=True, text=True, timeout=GIT_TIMEOUT)
+    if p.returncode != 0:
+        raise RuntimeError((p.stderr or p.stdout or "git failed")[:800])
+    return p.stdout.strip()
+
+
+def mirror_path(repo: str) -> Path:
+    return MIRRORS_PATH / (repo.replace("/", "__") + ".git")
+
+
+def ensure_mirror(repo: str, env=None, url: str = None) -> Path:
+    """Bare-Mirror anlegen falls nötig (partiell, ohne Blobs); gibt den Pfad zurück"""
+    path = mirror_path(repo)
+    if not (path / "HEAD").exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _git(["clone", "--bare", f"--filter={FILTER}", "--no-tags", url or REMOTE_URL.format(repo=repo), str(path)],
+             env=env)
+        # Bare-Clones haben keinen Fetch-Refspec; origin/<branch> wie in einem normalen Clone
+        _git(["config", "remote.origin.fetch", "+refs/heads/*:refs/remotes/origin/*"], cwd=path)
+    _git(["worktree", "prune"], cwd=path)
+    return path
+
+
+def update(mirror: Path, base: str, env=None) -> str:
+    """Nur den Base-Branch holen; gibt den Commit von origin/<base> zurück"""
+    _git(["fetch", "--no-tags", "origin", f"+refs/heads/{base}:refs/remotes/origin/{base}"], cwd=mirror, env=env)
+    return _git(["rev-parse", f"refs/remotes/origin/{base}"], cwd=mirror)
+
+
+def _sparse_paths(route) -> list:
+    routes = [route] if isinstance(route, str) else list(route or [])
+    return [r.replace("\\", "/").strip("/") for r in routes if r and r.strip("/\\")]
+
+
+def add_worktree(mirror: Path, branch: str, start: str, route=None, env=None, path: Path = None) -> Path:
+    """
+    Worktree für `branch` ab `start` (z.B. origin/main) anlegen.
+    route: Ordner (oder Liste) für den Sparse-Checkout; None = alles auschecken.
+    """
+    path = Path(path or WORKTREES_PATH / branch)
+    if path.exists():
+        remove_worktree(mirror, path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _git(["worktree", "add", "--no-checkout", "-f", "-B", branch, str(path), start], cwd=mirror, env=env)
+    sparse = _sparse_paths(route)
+    if sparse:
+        # Cone-Modus: Route + Dateien im Repo-Root; gilt nur für diesen Worktree (extensions.worktreeConfig)
+        _git(["sparse-checkout", "set", "--cone"] + sparse, cwd=path, env=env)
+    _git(["read-tree", "-mu", "HEAD"], cwd=path, env=env)
+    return path
+
+
+def remove_worktree(mirror: Path, path: Path, branch: str = None):
+    """Worktree entfernen (best-effort), optional den lokalen Branch im Mirror gleich mit"""
+    subprocess.run(["git", "worktree", "remove", "--force", str(path)], cwd=mirror, capture_output=True)
+    shutil.rmtree(path, ignore_errors=True)
+    if branch:
+        subprocess.run(["git", "branch", "-D", branch], cwd=mirror, capture_output=True)
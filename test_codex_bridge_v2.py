@@ -0,0 +1,73 @@
+import json
+import time
+
+import codex_bridge_v2 as v2
+from task_store import TaskStore
+
+BRANCH = "codex-1740012345"
+ISSUE = 12
+
+
+def _fake_github(monkeypatch, tmp_path, done_after):
+    """check_codex_status meldet ab dem done_after-ten Aufruf 'fertig'; kein echter GitHub-Zugriff"""
+    calls = []
+
+    def status(repo, branch, base_branch=None):
+        calls.append(time.time())
+        done = len(calls) >= done_after
+        return {"codex_done": done, "changes": {"total_commits": 2 if done else 1}, "pr": {"found": False}}
+
+    monkeypatch.setattr(v2, "check_codex_status", status)
+    monkeypatch.setattr(v2, "get_default_branch", lambda repo: "main")
+    monkeypatch.setattr(v2, "get_codex_result", lambda repo, branch: {"branch": branch})
+    monkeypatch.setattr(v2, "send_to_codex", lambda repo, task, folder=None: {
+        "status": "sent", "branch": BRANCH, "issue_number": ISSUE})
+    db = TaskStore(tmp_path / "bridge.db")
+    db.add_task("o/r", None, BRANCH, "t", status="sent", source="v2")
+    monkeypatch.setattr(v2, "store", lambda: db)
+    # Ohne Event würde erst nach poll_min (30 s) wieder geprüft - max_wait ist vorher um
+    monkeypatch.setitem(v2.CONFIG, "poll_min", 30)
+    monkeypatch.setitem(v2.CONFIG, "max_wait", 3)
+    return calls, db
+
+
+def _replay_file(tmp_path, *events):
+    path = tmp_path / "events.jsonl"
+    path.write_text("\n".join(events) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_replay_weckt_den_wartenden_workflow_ueber_den_branch(monkeypatch, tmp_path):
+    calls, db = _fake_github(monkeypatch, tmp_path, done_after=2)
+    replay = _replay_file(tmp_path, json.dumps({"event": "push", "payload": {"ref": "refs/heads/{branch}"}}))
+
+    result = v2.full_workflow("o/r", "t", replay_file=replay)
+
+    assert result["status"] == "completed"
+    assert len(calls) == 2 and calls[1] - calls[0] < 1
+    assert db.by_branch("o/r", BRANCH)["status"] == "completed"
+
+
+def test_replay_mit_issue_platzhalter(monkeypatch, tmp_path):
+    calls, _ = _fake_github(monkeypatch, tmp_path, done_after=2)
+    replay = _replay_file(
+        tmp_path,
+        '{"event": "push", "payload": {"ref": "refs/heads/anderer-branch"}}',
+        '{"event": "issue_comment", "payload": {"action": "created", "issue": {"number": {issue}}}}',
+    )
+
+    result = v2.full_workflow("o/r", "t", replay_file=replay)
+
+    assert result["status"] == "completed"
+    assert len(calls) == 2 and calls[1] - calls[0] < 1
+
+
+def test_fremde_events_wecken_nicht(monkeypatch, tmp_path):
+    calls, db = _fake_github(monkeypatch, tmp_path, done_after=2)
+    replay = _replay_file(tmp_path, '{"event": "push", "payload": {"ref": "refs/heads/codex-1"}}')
+
+    result = v2.full_workflow("o/r", "t", replay_file=replay)
+
+    assert result["status"] == "timeout"
+    assert len(calls) == 1
+    assert db.by_branch("o/r", BRANCH)["status"] == "timeout"